@@ -0,0 +1,182 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Response compression: gzip always, brotli and zstd when their packages are installed.
+
+Only API bodies (JSON, NDJSON, CSV) are compressed; see COMPRESSIBLE_TYPES.
+
+The encoding is negotiated from Accept-Encoding (highest q-value wins, ties go
+to the first in COMPRESSION_ENCODINGS). Bodies under COMPRESSION_MIN_SIZE are
+sent as they are, since the framing costs more than it saves; streamed
+exports are compressed chunk by chunk. Levels favour speed, since every
+response is compressed on the fly.
+"""
+
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional: br is skipped
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd is skipped
+    zstandard = None
+
+# API media types only. HTML pages (admin, browsable API) carry CSRF tokens next to
+# reflected input, which compression would expose to BREACH, so they go uncompressed.
+COMPRESSIBLE_TYPES = {'application/json', 'application/x-ndjson', 'text/csv'}
+
+
+class Encoder:
+    """Whole-body and incremental compression for one Content-Encoding."""
+
+    def __init__(self, name, compress, compressor):
+        self.name = name
+        self.compress = compress
+        # compressor() -> (compress_chunk, flush)
+        self.compressor = compressor
+
+    def stream(self, chunks):
+        compress_chunk, flush = self.compressor()
+        for chunk in chunks:
+            data = compress_chunk(chunk)
+            if data:
+                yield data
+        yield flush()
+
+
+def _gzip(level):
+    def compressor():
+        stream = zlib.compressobj(level, zlib.DEFLATED, 31)
+        # Flush every chunk so a slow export still reaches the client as it is produced
+        return lambda chunk: stream.compress(chunk) + stream.flush(zlib.Z_SYNC_FLUSH), stream.flush
+    return Encoder('gzip', lambda body: zlib.compress(body, level, wbits=31), compressor)
+
+
+def _brotli(quality):
+    def compressor():
+        stream = brotli.Compressor(quality=quality)
+        return lambda chunk: stream.process(chunk) + stream.flush(), stream.finish
+    return Encoder('br', lambda body: brotli.compress(body, quality=quality), compressor)
+
+
+def _zstd(level):
+    def compressor():
+        stream = zstandard.ZstdCompressor(level=level).compressobj()
+        return (lambda chunk: stream.compress(chunk) + stream.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                stream.flush)
+    return Encoder('zstd', lambda body: zstandard.ZstdCompressor(level=level).compress(body), compressor)
+
+
+def available_encoders():
+    """name -> Encoder for the configured encodings whose packages are installed, in preference order."""
+    factories = {'gzip': lambda: _gzip(settings.COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        factories['br'] = lambda: _brotli(settings.COMPRESSION_BROTLI_QUALITY)
+    if zstandard is not None:
+        factories['zstd'] = lambda: _zstd(settings.COMPRESSION_ZSTD_LEVEL)
+    return {name: factories[name]() for name in settings.COMPRESSION_ENCODINGS if name in factories}
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header, encoders):
+    """The encoder to use for `header`, or None for identity."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    # encoders is in server preference order, so only a strictly higher q displaces
+    for name, encoder in encoders.items():
+        q = accepted.get(name, wildcard)
+        if name == 'gzip' and 'gzip' not in accepted:
+            q = accepted.get('x-gzip', q)
+        if q > best_q:
+            best, best_q = encoder, q
+    return best
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES or media_type.endswith('+json')
+
+
+class CompressionMiddleware:
+    """
+    Compress responses for clients that accept it.
+
+    Place it above everything that reads or changes the body. A strong ETag
+    becomes weak whenever an encoding is negotiated for a compressible type,
+    whether or not this body ends up compressed, and on 304s to such clients.
+    A 304 has no body to size up, so this is what keeps its validator equal
+    to the one on the 200 it revalidates. The views' If-None-Match checks
+    accept weak tags.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encoders = available_encoders()
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.encoders or response.status_code == 204 or response.has_header('Content-Encoding'):
+            return response
+        if response.status_code != 304 and not is_compressible(response.get('Content-Type', '')):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.encoders)
+        if encoder is None:
+            return response
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        if response.status_code == 304:
+            return response
+        if response.streaming:
+            if getattr(response, 'is_async', False):
+                return response
+            response.streaming_content = encoder.stream(response.streaming_content)
+            del response['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            compressed = encoder.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        response['Content-Encoding'] = encoder.name
+        return response
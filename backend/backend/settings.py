@@ -41,16 +41,21 @@ INSTALLED_APPS = [
     "users",
     "expenses",
     "groups",
+    "jobs",
+    "monitoring",
 ]
 
 # Middleware
 MIDDLEWARE = [
+    "monitoring.middleware.MetricsMiddleware",
+    "backend.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "monitoring.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -76,13 +81,83 @@ TEMPLATES = [
 WSGI_APPLICATION = "backend.wsgi.application"
 
 # Database (SQLite ONLY for PythonAnywhere free)
+# SQLITE_TUNING is off by default: bench_sqlite showed no gain at this app's
+# load, and WAL leaves -wal/-shm files beside the database. When it is on,
+# every new connection runs the pragmas in init_command: WAL lets readers
+# carry on while a writer commits, and synchronous=NORMAL is durable across
+# app crashes under WAL. Transactions open with BEGIN IMMEDIATE so concurrent
+# writers queue on the busy timeout instead of failing with "database is
+# locked" when a read lock is upgraded.
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "0") == "1"
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "20"))  # seconds
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
+if SQLITE_TUNING:
+    DATABASES["default"].update({
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "600")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "timeout": SQLITE_BUSY_TIMEOUT,
+            "transaction_mode": "IMMEDIATE",
+            "init_command": ";".join([
+                "PRAGMA journal_mode=WAL",
+                "PRAGMA synchronous=NORMAL",
+                f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+                f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+                "PRAGMA temp_store=MEMORY",
+                f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000}",
+            ]),
+        },
+    })
+
+# Where group summaries read member balances: "ledger" (the GroupBalance rows,
+# default) or "aggregate" (one aggregate query over expenses and splits).
+SUMMARY_BALANCE_SOURCE = os.getenv("SUMMARY_BALANCE_SOURCE", "ledger")
+
+# Caches
+# The "summary" cache holds rendered group summaries keyed by group version.
+# SUMMARY_CACHE_BACKEND picks its backend: "locmem" (default, per process),
+# "file" or "db" (shared by every worker on the host) or "redis" (REDIS_URL).
+SUMMARY_CACHE_BACKEND = os.getenv("SUMMARY_CACHE_BACKEND", "locmem")
+
+_SUMMARY_CACHES = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "group-summaries",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("SUMMARY_CACHE_DIR", str(BASE_DIR / "cache" / "summaries")),
+    },
+    "db": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "summary_cache",  # python manage.py createcachetable
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://127.0.0.1:6379/1"),
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "summary": {
+        **_SUMMARY_CACHES[SUMMARY_CACHE_BACKEND],
+        "TIMEOUT": 60 * 60 * 24,
+        "KEY_PREFIX": "expense-splitter",
+    },
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -110,7 +185,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework + JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     )
 }
 
@@ -118,8 +193,50 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.UserTokenObtainPairSerializer",
 }
 
+# Authenticated users are cached per process for JWT_USER_CACHE_TTL seconds
+# (saves and deletes evict them at once). JWT_TRUST_CLAIMS=1 skips the user
+# lookup entirely and builds request.user from the token's signed claims.
+JWT_USER_CACHE_SIZE = int(os.getenv("JWT_USER_CACHE_SIZE", "1024"))
+JWT_USER_CACHE_TTL = int(os.getenv("JWT_USER_CACHE_TTL", "60"))
+JWT_TRUST_CLAIMS = os.getenv("JWT_TRUST_CLAIMS", "0") == "1"
+
+# Response compression (backend.compression)
+# Encodings in server preference order; br and zstd need the brotli and
+# zstandard packages and are skipped without them. Smaller bodies go out as is.
+COMPRESSION_ENCODINGS = [
+    name.strip() for name in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",") if name.strip()
+]
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+# Request metrics
+# MetricsMiddleware records per-endpoint latency, query counts, render time and
+# response size; staff read them at /api/_metrics/ (Prometheus text format).
+# Each process flushes its registry to METRICS_SNAPSHOT_DIR every
+# METRICS_SNAPSHOT_INTERVAL seconds (0 disables) for `manage.py dump_metrics`.
+# A request running one query METRICS_DUPLICATE_THRESHOLD times is flagged.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_DUPLICATE_THRESHOLD = int(os.getenv("METRICS_DUPLICATE_THRESHOLD", "3"))
+METRICS_SNAPSHOT_DIR = os.getenv("METRICS_SNAPSHOT_DIR", str(BASE_DIR / "metrics"))
+METRICS_SNAPSHOT_INTERVAL = int(os.getenv("METRICS_SNAPSHOT_INTERVAL", "30"))
+
+# Request profiling
+# Staff requests with "X-Profile: 1" or ?profile=1 run under cProfile. With
+# PROFILING_SLOW_MS set, PROFILING_SAMPLE_RATE of all requests run under a
+# stack sampler taking a sample every PROFILING_INTERVAL_MS, and requests at
+# least that slow are kept. Profiles go to PROFILING_DIR (`manage.py profiles`),
+# newest PROFILING_KEEP only.
+PROFILING_DIR = os.getenv("PROFILING_DIR", str(MEDIA_ROOT / "profiles"))
+PROFILING_SLOW_MS = int(os.getenv("PROFILING_SLOW_MS", "0"))
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "1.0"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_KEEP = int(os.getenv("PROFILING_KEEP", "200"))
+
 # CORS
 CORS_ALLOWED_ORIGINS = [
     "https://expense-splitter-fractal-manu-bharadwaj.vercel.app",
@@ -12,6 +12,8 @@ from django.urls import path, include
 from django.http import JsonResponse
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from users import views as user_views  # import get_profile
+from monitoring import views as monitoring_views
+from groups import views as group_views
 
 def home(request):
     return JsonResponse({"message": "Django backend is running!"})
@@ -29,10 +31,19 @@ urlpatterns = [
     #groups
     path('api/groups/', include('groups.urls')),  
 
+    # background jobs (admin only)
+    path('api/jobs/', include('jobs.urls')),
+
+    # request metrics (admin only)
+    path('api/_metrics/', monitoring_views.metrics, name='metrics'),
+
     # JWT endpoints
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
 
     # Profile endpoint for frontend
     path("api/profile/", user_views.get_profile, name="get_profile"),
+
+    # The logged-in user's balances across all their groups
+    path("api/me/balances/", group_views.my_balances, name="my-balances"),
 ]
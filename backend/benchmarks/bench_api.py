@@ -0,0 +1,318 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Benchmark for the REST API.
+
+    cd backend
+    python -m benchmarks.bench_api [--groups 20 --members 8 --expenses 200]
+                                   [--output results.json]
+                                   [--baseline benchmarks/baseline_api.json]
+
+Seeds a throwaway test database with synthetic groups, then drives the real
+endpoints through the Django test client with JWT auth. Each endpoint reports
+p50/p95/p99 latency, throughput, DB queries per request and peak memory per
+request. With --baseline the run fails (exit 1) when an endpoint's p95 is
+slower than the baseline by more than --tolerance, or it makes more queries.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from groups.bulk import ExpenseImporter  # noqa: E402
+from groups.models import Group, GroupMember, GroupBalance  # noqa: E402
+from groups.summary import CACHE_ALIAS  # noqa: E402
+
+PASSWORD = 'bench-pass-123'
+CUSTOM_SHARE = 0.3  # fraction of seeded expenses that use custom splits
+SAMPLE_REQUESTS = 10  # requests per endpoint that are traced for queries / memory
+
+
+def seed(groups, members, expenses, rng):
+    """Create `groups` groups of `members` users with `expenses` expenses each."""
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create([
+        User(username=f'bench{index}', password=password)
+        for index in range(groups * members)
+    ])
+
+    created = []
+    for number in range(groups):
+        group_users = users[number * members:(number + 1) * members]
+        group = Group.objects.create(name=f'Bench group {number}', created_by=group_users[0])
+        # bulk_create skips the member signals, so open the balance rows here
+        GroupMember.objects.bulk_create([
+            GroupMember(group=group, user=user, is_admin=user is group_users[0]) for user in group_users
+        ])
+        GroupBalance.objects.bulk_create([GroupBalance(group=group, user=user) for user in group_users])
+
+        ExpenseImporter(group).run(
+            expense_payload(group_users, rng, f'Seed {index}') for index in range(expenses)
+        )
+        created.append((group, group_users))
+    return created
+
+
+def expense_payload(group_users, rng, description):
+    amount = Decimal(rng.randint(100, 500000)).scaleb(-2)
+    payload = {
+        'description': description,
+        'amount': str(amount),
+        'paid_by_username': rng.choice(group_users).username,
+        'split_type': 'equal',
+    }
+    if rng.random() < CUSTOM_SHARE:
+        # Custom split over a random subset; the first share takes the remainder
+        sharers = rng.sample(group_users, rng.randint(1, len(group_users)))
+        share = (amount / len(sharers)).quantize(Decimal('0.01'))
+        splits = {user.username: share for user in sharers}
+        splits[sharers[0].username] += amount - share * len(sharers)
+        payload['split_type'] = 'custom'
+        payload['custom_splits'] = {name: str(value) for name, value in splits.items()}
+    return payload
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Scenario:
+    """One endpoint: `request(i)` sends the i-th request, `prepare(i)` runs untimed before it."""
+
+    def __init__(self, name, request, expected_status, prepare=None, max_requests=None):
+        self.name = name
+        self.request = request
+        self.expected_status = expected_status
+        self.prepare = prepare
+        self.max_requests = max_requests
+
+    def call(self, index):
+        if self.prepare:
+            self.prepare(index)
+        response = self.request(index)
+        if response.status_code != self.expected_status:
+            raise RuntimeError(f'{self.name}: expected {self.expected_status}, got {response.status_code}')
+        return response
+
+    def measure(self, requests, warmup):
+        if self.max_requests:
+            requests, warmup = min(requests, self.max_requests), min(warmup, 1)
+        for index in range(warmup):
+            self.call(index)
+
+        # Like timeit, keep collector pauses out of the timings
+        timings = []
+        gc.collect()
+        gc.disable()
+        try:
+            for index in range(requests):
+                if self.prepare:
+                    self.prepare(index)
+                start = time.perf_counter()
+                response = self.request(index)
+                timings.append(time.perf_counter() - start)
+                if response.status_code != self.expected_status:
+                    raise RuntimeError(f'{self.name}: expected {self.expected_status}, got {response.status_code}')
+        finally:
+            gc.enable()
+
+        # Query capture and tracemalloc both slow requests down, so they get
+        # their own pass instead of skewing the timings above
+        samples = min(SAMPLE_REQUESTS, requests)
+        queries, peaks = 0, []
+        for index in range(samples):
+            if self.prepare:
+                self.prepare(index)
+            with CaptureQueriesContext(connection) as captured:
+                tracemalloc.start()
+                self.request(index)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            queries += len(captured)
+
+        return {
+            'requests': requests,
+            'p50_ms': round(percentile(timings, 50) * 1000, 3),
+            'p95_ms': round(percentile(timings, 95) * 1000, 3),
+            'p99_ms': round(percentile(timings, 99) * 1000, 3),
+            'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+            'throughput_rps': round(len(timings) / sum(timings), 1),
+            'queries_per_request': round(queries / samples, 2),
+            'peak_memory_kib': round(max(peaks) / 1024, 1),
+        }
+
+
+def build_scenarios(dataset, rng):
+    client = Client()
+    group, group_users = dataset[0]
+    user = group_users[0]
+
+    token = client.post(
+        reverse('token_obtain_pair'), {'username': user.username, 'password': PASSWORD},
+        content_type='application/json',
+    ).json()['access']
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+    summary_cache = caches[CACHE_ALIAS]
+
+    def token_obtain(index):
+        return client.post(
+            reverse('token_obtain_pair'), {'username': user.username, 'password': PASSWORD},
+            content_type='application/json',
+        )
+
+    def group_list(index):
+        return client.get(reverse('group-list-create'), **auth)
+
+    def group_expenses(index):
+        return client.get(reverse('group-expenses', args=[group.id]), **auth)
+
+    def group_expenses_gzip(index):
+        return client.get(reverse('group-expenses', args=[group.id]), HTTP_ACCEPT_ENCODING='gzip', **auth)
+
+    etags = {}
+
+    def remember_etags(index):
+        etags['groups'] = group_list(index)['ETag']
+
+    def group_list_revalidate(index):
+        return client.get(reverse('group-list-create'), HTTP_IF_NONE_MATCH=etags['groups'], **auth)
+
+    def add_expense(index):
+        return client.post(
+            reverse('add-expense', args=[group.id]), expense_payload(group_users, rng, f'Bench {index}'),
+            content_type='application/json', **auth,
+        )
+
+    def group_summary(index):
+        return client.get(reverse('group-summary', args=[group.id]), **auth)
+
+    def my_balances(index):
+        return client.get(reverse('my-balances'), **auth)
+
+    return [
+        # Password hashing dominates here and is deliberately slow
+        Scenario('token_obtain_pair', token_obtain, 200, max_requests=20),
+        Scenario('group-list-create', group_list, 200),
+        Scenario('group-list (not modified)', group_list_revalidate, 304, prepare=remember_etags),
+        Scenario('group-expenses', group_expenses, 200),
+        Scenario('group-expenses (gzip)', group_expenses_gzip, 200),
+        Scenario('add-expense', add_expense, 201),
+        # Cold: the cache is emptied before each request, so this times the build
+        Scenario('group-summary', group_summary, 200, prepare=lambda index: summary_cache.clear()),
+        Scenario('group-summary (cached)', group_summary, 200),
+        Scenario('my-balances', my_balances, 200),
+    ]
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages against `baseline`."""
+    failures = []
+    for name, base in baseline['endpoints'].items():
+        current = results['endpoints'].get(name)
+        if current is None:
+            failures.append(f'{name}: missing from this run')
+            continue
+        limit = base['p95_ms'] * (1 + tolerance)
+        if current['p95_ms'] > limit:
+            failures.append(f"{name}: p95 {current['p95_ms']} ms > {limit:.3f} ms (baseline {base['p95_ms']} ms)")
+        if current['queries_per_request'] > base['queries_per_request']:
+            failures.append(
+                f"{name}: {current['queries_per_request']} queries/request "
+                f"> baseline {base['queries_per_request']}"
+            )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--members', type=int, default=8)
+    parser.add_argument('--expenses', type=int, default=200, help='expenses per group')
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--baseline', help='compare against results saved by an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed p95 slowdown, 0.5 = 50%%')
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        dataset = seed(args.groups, args.members, args.expenses, rng)
+        print(f'Seeded {args.groups} groups x {args.members} members x {args.expenses} expenses '
+              f'in {time.perf_counter() - start:.1f}s')
+
+        results = {
+            'meta': {
+                'dataset': {'groups': args.groups, 'members': args.members, 'expenses': args.expenses},
+                'requests': args.requests,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'endpoints': {},
+        }
+
+        print(f"{'endpoint':<24} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'queries':>8} {'peak KiB':>9}")
+        for scenario in build_scenarios(dataset, rng):
+            stats = scenario.measure(args.requests, args.warmup)
+            results['endpoints'][scenario.name] = stats
+            print(f"{scenario.name:<24} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+                  f"{stats['throughput_rps']:>8.1f} {stats['queries_per_request']:>8.2f} "
+                  f"{stats['peak_memory_kib']:>9.1f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+            handle.write('\n')
+        print(f'Wrote {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            failures = compare(results, json.load(handle), args.tolerance)
+        if failures:
+            for failure in failures:
+                print(f'FAIL: {failure}')
+            return 1
+        print(f'OK: no regressions against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
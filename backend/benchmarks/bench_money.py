@@ -0,0 +1,115 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Micro-benchmark for groups.money against the Decimal arithmetic it replaced.
+
+    cd backend
+    python -m benchmarks.bench_money [--sizes 100 1000 10000 100000]
+
+For each group size it times an equal split of one expense, a weighted split
+and a summary pass over the members' balances, once with the old Decimal
+loops (the baseline per-member split, quantize per share, Decimal sums,
+float() per value) and once in integer paise. The Decimal splits are also checked for drift from the total
+(in paise), which the integer allocator never has.
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Context, Decimal, ROUND_HALF_UP
+
+from groups.money import allocate, from_minor, split_equal, to_float, to_minor
+
+CENT = Decimal('0.01')
+
+
+def decimal_equal_split(amount, count):
+    # The baseline CreateExpenseSerializer divided once and saved that share for
+    # every member; DecimalField(max_digits=10, decimal_places=2) rounded each save
+    share = amount / count
+    context = Context(prec=10)
+    return [context.create_decimal(share).quantize(CENT, context=context) for _ in range(count)]
+
+
+def integer_equal_split(amount, count):
+    # split_amounts(): integer shares, back to 2-place Decimals for ExpenseSplit
+    return [from_minor(paise) for paise in split_equal(to_minor(amount), count)]
+
+
+def decimal_weighted_split(amount, weights):
+    total = sum(weights)
+    return [(amount * weight / total).quantize(CENT, rounding=ROUND_HALF_UP) for weight in weights]
+
+
+def decimal_summary(rows):
+    total, members = Decimal('0.00'), []
+    for paid, owed in rows:
+        members.append((float(paid), float(owed), float(paid - owed)))
+        total += paid
+    return float(total), members
+
+
+def integer_summary(rows):
+    total, members = 0, []
+    for paid, owed in rows:
+        members.append((to_float(paid), to_float(owed), to_float(paid - owed)))
+        total += paid
+    return to_float(total), members
+
+
+def best_of(runs, func, *args):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    amount = Decimal('100000.07')
+    print(f"{'members':>8} {'task':>9} {'decimal ms':>11} {'int ms':>8} {'speedup':>8} {'drift':>8}")
+    for size in args.sizes:
+        weights = [rng.randint(1, 100) for _ in range(size)]
+        decimal_rows = [(Decimal(rng.randint(0, 10 ** 7)).scaleb(-2), Decimal(rng.randint(0, 10 ** 7)).scaleb(-2))
+                        for _ in range(size)]
+        minor_rows = [(to_minor(paid), to_minor(owed)) for paid, owed in decimal_rows]
+
+        drift = {
+            'equal': to_minor(amount - sum(decimal_equal_split(amount, size))),
+            'weighted': to_minor(amount - sum(decimal_weighted_split(amount, [Decimal(weight) for weight in weights]))),
+        }
+        assert sum(split_equal(to_minor(amount), size)) == to_minor(amount)
+        assert sum(allocate(to_minor(amount), weights)) == to_minor(amount)
+
+        tasks = [
+            ('equal', (decimal_equal_split, amount, size), (integer_equal_split, amount, size)),
+            ('weighted', (decimal_weighted_split, amount, [Decimal(weight) for weight in weights]),
+             (lambda total, shares: allocate(to_minor(total), shares), amount, weights)),
+            ('summary', (decimal_summary, decimal_rows), (integer_summary, minor_rows)),
+        ]
+        for name, (old, *old_args), (new, *new_args) in tasks:
+            old_ms = best_of(args.runs, old, *old_args)
+            new_ms = best_of(args.runs, new, *new_args)
+            shown = drift.get(name, '')
+            print(f'{size:>8} {name:>9} {old_ms:>11.2f} {new_ms:>8.2f} {old_ms / new_ms:>7.1f}x {shown:>8}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Benchmark for rendering a page of group expenses.
+
+    cd backend
+    python -m benchmarks.bench_render [--expenses 1000] [--members 8]
+
+Builds one page of expenses (with splits) the old way, GroupExpenseSerializer
+plus DRF's JSONRenderer, and the read path the expense list and summary use,
+values() rows from groups.rows encoded by FastJSONRenderer with orjson or the
+stdlib encoder. "fetch" runs the queries; "build" shapes the payload
+and "encode" turns it into JSON bytes, which together are the serialization
+cost. Both paths must produce the same JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from groups import renderers  # noqa: E402
+from groups.bulk import ExpenseImporter  # noqa: E402
+from groups.models import Group, GroupExpense, GroupMember  # noqa: E402
+from groups.rows import expense_rows, project_expenses, split_rows  # noqa: E402
+from groups.serializers import GroupExpenseSerializer  # noqa: E402
+
+
+def page(group):
+    return GroupExpense.objects.filter(group=group).order_by('-created_at', '-id')
+
+
+def serializer_path(group, size):
+    start = time.perf_counter()
+    expenses = list(page(group).select_related('paid_by').prefetch_related('splits__user')[:size])
+    fetched = time.perf_counter()
+    data = GroupExpenseSerializer(expenses, many=True).data
+    built = time.perf_counter()
+    body = JSONRenderer().render(data)
+    return body, fetched - start, built - fetched, time.perf_counter() - built
+
+
+def rows_path(dumps):
+    def run(group, size):
+        start = time.perf_counter()
+        rows = list(project_expenses(page(group))[:size])
+        splits = split_rows([row['id'] for row in rows])
+        fetched = time.perf_counter()
+        data = expense_rows(rows, splits=splits)
+        built = time.perf_counter()
+        body = dumps(data)
+        return body, fetched - start, built - fetched, time.perf_counter() - built
+    return run
+
+
+def best_of(runs, path, group, size):
+    results = [path(group, size) for _ in range(runs)]
+    body = results[0][0]
+    return body, [min(result[index] for result in results) * 1000 for index in (1, 2, 3)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--expenses', type=int, default=1000)
+    parser.add_argument('--members', type=int, default=8)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    paths = {
+        'serializer + JSONRenderer': serializer_path,
+        'rows + stdlib json': rows_path(renderers.dumps_stdlib),
+    }
+    if renderers.orjson is not None:
+        paths['rows + orjson'] = rows_path(renderers.dumps_orjson)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        users = [User.objects.create(username=f'bench{index}') for index in range(args.members)]
+        group = Group.objects.create(name='Bench group', created_by=users[0])
+        for user in users:
+            GroupMember.objects.create(group=group, user=user)
+        ExpenseImporter(group, chunk_size=2000).run(
+            {
+                'description': f'Expense {index}',
+                'amount': f'{100 + index % 900}.{index % 100:02d}',
+                'paid_by_username': users[index % len(users)].username,
+            }
+            for index in range(args.expenses)
+        )
+
+        print(f"orjson: {renderers.orjson.__version__ if renderers.orjson else 'not installed'}")
+        print(f"{'path':<26} {'fetch ms':>9} {'build ms':>9} {'encode ms':>10} {'serialize':>10} {'speedup':>8}")
+        expected, baseline = None, None
+        for name, path in paths.items():
+            body, (fetch, build, encode) = best_of(args.runs, path, group, args.expenses)
+            if expected is None:
+                expected = json.loads(body)
+            elif json.loads(body) != expected:
+                raise SystemExit(f"{name} rendered a different payload")
+            serialize = build + encode
+            baseline = baseline or serialize
+            print(f'{name:<26} {fetch:>9.2f} {build:>9.2f} {encode:>10.2f} {serialize:>10.2f} '
+                  f'{baseline / serialize:>7.1f}x')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Benchmark for groups.settlements.
+
+    cd backend
+    python -m benchmarks.bench_settlements [--budget-ms 50]
+
+Times settle_minor() on integer paise balances, the path settle_group() takes
+for a stored group, and settle() on Decimal balances for comparison. Exits
+non-zero if settle_minor() on any group size takes longer than the budget.
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+
+from groups.settlements import settle, settle_minor
+
+SIZES = [10, 100, 1000, 5000, 10000]
+EXACT_SIZES = [6, 9, 12]
+
+
+def random_balances(size, rng):
+    """{member: net paise} for a group that sums to zero."""
+    balances = {key: rng.randint(-500000, 500000) for key in range(1, size)}
+    # The last member absorbs the remainder so the group sums to zero
+    balances[size] = -sum(balances.values())
+    return balances
+
+
+def best_of(runs, func, *args, **kwargs):
+    timings, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    print(f"{'members':>8} {'method':>7} {'transfers':>10} {'ms':>9} {'decimal ms':>11}")
+    worst = 0.0
+    for size in SIZES:
+        balances = random_balances(size, rng)
+        ms, (transfers, method) = best_of(args.runs, settle_minor, balances, exact=False)
+        decimal_balances = {key: Decimal(paise).scaleb(-2) for key, paise in balances.items()}
+        decimal_ms, _ = best_of(args.runs, settle, decimal_balances, exact=False)
+        worst = max(worst, ms)
+        print(f"{size:>8} {method:>7} {len(transfers):>10} {ms:>9.2f} {decimal_ms:>11.2f}")
+
+    print()
+    print(f"{'members':>8} {'greedy':>7} {'exact':>10} {'ms':>9}")
+    for size in EXACT_SIZES:
+        # Creditors whose debt is covered by exactly two debtors: the exact
+        # solver finds the independent triples, greedy matching usually doesn't
+        balances, key = {}, 0
+        for _ in range(size // 3):
+            first, second = rng.randint(100, 5000), rng.randint(100, 5000)
+            for paise in (first + second, -first, -second):
+                key += 1
+                balances[key] = Decimal(paise).scaleb(-2)
+        greedy, _ = settle(balances, exact=False)
+        ms, (exact, method) = best_of(args.runs, settle, balances, time_budget=1.0)
+        print(f"{size:>8} {len(greedy):>7} {len(exact):>10} {ms:>9.2f}  ({method})")
+
+    if worst > args.budget_ms:
+        print(f"FAIL: slowest settle_minor run took {worst:.2f} ms (budget {args.budget_ms} ms)")
+        return 1
+    print(f"OK: slowest settle_minor run took {worst:.2f} ms (budget {args.budget_ms} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Benchmark for share/percent allocation.
+
+    cd backend
+    python -m benchmarks.bench_splits [--sizes 50 500 5000 50000]
+
+Compares the per-member Decimal loop that clients used to build custom_splits
+(quantize each share, then push the rounding error onto the last member) with
+groups.money.allocate, on the list path and, when NumPy is installed, the
+array path.
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+
+from groups import money
+
+CENT = Decimal('0.01')
+
+
+def per_member_loop(amount, shares):
+    total_shares = sum(shares.values())
+    splits, allocated = {}, Decimal('0.00')
+    for username, share in shares.items():
+        splits[username] = (amount * share / total_shares).quantize(CENT)
+        allocated += splits[username]
+    splits[username] += amount - allocated
+    return splits
+
+
+def allocate_python(amount, shares):
+    weights = money.to_minor_many(shares.values())
+    return money._allocate_python(money.to_minor(amount), weights, sum(weights))
+
+
+def allocate(amount, shares):
+    return money.allocate(money.to_minor(amount), money.to_minor_many(shares.values()))
+
+
+def best_of(runs, func, *args):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000, 50000])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    amount = Decimal('123456.78')
+    print(f"NumPy: {money.numpy.__version__ if money.numpy else 'not installed'}")
+    print(f"{'members':>8} {'loop ms':>9} {'list ms':>9} {'allocate ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        shares = {f'user{index}': Decimal(rng.randint(1, 400)).scaleb(-2) for index in range(size)}
+        assert sum(allocate(amount, shares)) == money.to_minor(amount)
+
+        loop_ms = best_of(args.runs, per_member_loop, amount, shares)
+        list_ms = best_of(args.runs, allocate_python, amount, shares)
+        array_ms = best_of(args.runs, allocate, amount, shares)
+        print(f'{size:>8} {loop_ms:>9.2f} {list_ms:>9.2f} {array_ms:>12.2f} {loop_ms / array_ms:>7.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Concurrency benchmark for the SQLite settings.
+
+    cd backend
+    python -m benchmarks.bench_sqlite [--writers 4 --readers 4 --writes 50]
+
+Runs the same workload twice against a fresh database file, once with
+SQLITE_TUNING=0 (Django defaults) and once with the tuned profile: writer
+processes post add-expense while reader processes page group-expenses. Each
+run is a separate process tree, since the database settings are read at
+startup, and workers are processes so they really contend for the file.
+Reports write throughput, failed writes ("database is locked") and reader
+latency for both.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = [('default', '0'), ('tuned', '1')]
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def run_workload(args):
+    """Seed the database named by SQLITE_PATH and run the workers; returns the stats."""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    django.setup()
+
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    from groups.bulk import ExpenseImporter
+    from groups.models import Group, GroupMember
+
+    setup_test_environment()
+    call_command('migrate', verbosity=0, interactive=False)
+
+    password = 'bench-pass-123'
+    users = User.objects.bulk_create([
+        User(username=f'bench{index}', password=make_password(password) if index == 0 else '')
+        for index in range(8)
+    ])
+    group = Group.objects.create(name='Bench group', created_by=users[0])
+    for user in users:
+        GroupMember.objects.create(group=group, user=user, is_admin=user is users[0])
+    usernames = [user.username for user in users]
+    ExpenseImporter(group).run(
+        {'description': f'Seed {index}', 'amount': '120.00', 'paid_by_username': usernames[index % 8]}
+        for index in range(200)
+    )
+
+    token = Client().post(
+        reverse('token_obtain_pair'), {'username': 'bench0', 'password': password},
+        content_type='application/json',
+    ).json()['access']
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+    connection.close()
+
+    add_url = reverse('add-expense', args=[group.id])
+    list_url = reverse('group-expenses', args=[group.id])
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    writes_done = context.Event()
+
+    def writer(number):
+        client = Client()
+        writes, errors = 0, {}
+        for index in range(args.writes):
+            try:
+                response = client.post(add_url, {
+                    'description': f'W{number}-{index}', 'amount': '30.00',
+                    'paid_by_username': usernames[index % 8], 'split_type': 'equal',
+                }, content_type='application/json', **auth)
+                error = None if response.status_code == 201 else f'HTTP {response.status_code}'
+            except Exception as exc:  # OperationalError: database is locked
+                error = str(exc)
+            if error is None:
+                writes += 1
+            else:
+                errors[error] = errors.get(error, 0) + 1
+        connection.close()
+        results.put(('writer', writes, errors))
+
+    def reader():
+        client = Client()
+        timings = []
+        while not writes_done.is_set():
+            start = time.perf_counter()
+            try:
+                client.get(list_url, **auth)
+            except Exception:
+                continue
+            timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        results.put(('reader', timings, None))
+
+    writers = [context.Process(target=writer, args=(number,)) for number in range(args.writers)]
+    readers = [context.Process(target=reader) for _ in range(args.readers)]
+    start = time.perf_counter()
+    for process in writers + readers:
+        process.start()
+
+    stats = {'writes': 0, 'failed': 0, 'errors': {}, 'read_ms': []}
+    for _ in writers:
+        _, writes, errors = results.get()
+        stats['writes'] += writes
+        for error, count in errors.items():
+            stats['failed'] += count
+            stats['errors'][error] = stats['errors'].get(error, 0) + count
+    elapsed = time.perf_counter() - start
+    writes_done.set()
+    for _ in readers:
+        stats['read_ms'].extend(results.get()[1])
+    for process in writers + readers:
+        process.join()
+
+    read_ms = stats.pop('read_ms')
+    return {
+        **stats,
+        'elapsed_s': round(elapsed, 3),
+        'writes_per_s': round(stats['writes'] / elapsed, 1),
+        'reads': len(read_ms),
+        'read_p50_ms': round(percentile(read_ms, 50), 2),
+        'read_p95_ms': round(percentile(read_ms, 95), 2),
+        'read_max_ms': round(max(read_ms, default=0.0), 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=50, help='add-expense requests per writer')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_workload(args)))
+        return 0
+
+    results = {}
+    for name, tuning in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, SQLITE_TUNING=tuning, SQLITE_PATH=os.path.join(directory, 'bench.sqlite3'))
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_sqlite', '--worker',
+                 '--writers', str(args.writers), '--readers', str(args.readers), '--writes', str(args.writes)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+
+    print(f'{args.writers} writers x {args.writes} add-expense, {args.readers} readers on group-expenses')
+    print(f"{'profile':<8} {'writes':>7} {'failed':>7} {'writes/s':>9} {'reads':>6} "
+          f"{'read p50':>9} {'read p95':>9} {'read max':>9}")
+    for name, result in results.items():
+        print(f"{name:<8} {result['writes']:>7} {result['failed']:>7} {result['writes_per_s']:>9.1f} "
+              f"{result['reads']:>6} {result['read_p50_ms']:>9.2f} {result['read_p95_ms']:>9.2f} "
+              f"{result['read_max_ms']:>9.2f}")
+        for error, count in result['errors'].items():
+            print(f'         {count} x {error}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
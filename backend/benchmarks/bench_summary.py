@@ -0,0 +1,102 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Benchmark for building a group summary as the group's history grows.
+
+    cd backend
+    python -m benchmarks.bench_summary [--sizes 1000 10000 100000]
+
+Grows one group to each size and times groups.summary.build_group_summary
+with both balance sources (the GroupBalance ledger and the SQL aggregate),
+reporting latency, queries and peak traced memory. Both should stay flat in
+memory; the aggregate grows only with the database's own scan of the group.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment  # noqa: E402
+
+from groups.bulk import ExpenseImporter  # noqa: E402
+from groups.models import Group, GroupMember  # noqa: E402
+from groups.summary import build_group_summary  # noqa: E402
+
+MEMBERS = 8
+SOURCES = ['ledger', 'aggregate']
+
+
+def grow(group, usernames, start, stop):
+    ExpenseImporter(group, chunk_size=2000).run(
+        {
+            'description': f'Expense {index}',
+            'amount': f'{100 + index % 900}.{index % 100:02d}',
+            'paid_by_username': usernames[index % len(usernames)],
+        }
+        for index in range(start, stop)
+    )
+
+
+def measure(group, source, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        build_group_summary(group, source=source)
+        timings.append(time.perf_counter() - start)
+
+    with CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+        build_group_summary(group, source=source)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(timings) * 1000, len(queries), peak / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        users = [User.objects.create(username=f'bench{index}') for index in range(MEMBERS)]
+        group = Group.objects.create(name='Bench group', created_by=users[0])
+        for user in users:
+            GroupMember.objects.create(group=group, user=user)
+        usernames = [user.username for user in users]
+
+        print(f"{'expenses':>9} {'source':>10} {'ms':>9} {'queries':>8} {'peak KiB':>9}")
+        size = 0
+        for target in sorted(args.sizes):
+            grow(group, usernames, size, target)
+            size = target
+            group.refresh_from_db()
+            for source in SOURCES:
+                ms, queries, peak = measure(group, source, args.runs)
+                print(f'{size:>9} {source:>10} {ms:>9.2f} {queries:>8} {peak:>9.1f}')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
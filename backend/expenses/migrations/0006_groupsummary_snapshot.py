@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Replace the client-pushed GroupSummary with a server-computed snapshot.
+
+    Existing rows were written by clients against the legacy expenses.Group
+    table and can't be trusted, so they are dropped rather than converted.
+    """
+
+    dependencies = [
+        ('expenses', '0005_remove_expense_created_by_remove_expense_group_and_more'),
+        ('groups', '0003_group_version'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='GroupSummary',
+        ),
+        migrations.CreateModel(
+            name='GroupSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField()),
+                ('payload', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary_snapshot', to='groups.group')),
+            ],
+        ),
+    ]
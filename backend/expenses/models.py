@@ -16,10 +16,13 @@ class Group(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
 class GroupSummary(models.Model):
-    group = models.OneToOneField(Group, on_delete=models.CASCADE, related_name="summary")
-    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
-    transactions = models.IntegerField()
-    members_count = models.IntegerField()
-    balances = models.JSONField()  # Stores { username, paid, owes }
-    recent_expenses = models.JSONField()  # Stores list of expenses
+    """
+    Server-computed snapshot of a groups.Group summary.
+
+    `payload` holds the rendered JSON bytes of /api/groups/<id>/summary/ as of
+    `version` (the group's Group.version), so reads can send it unchanged.
+    """
+    group = models.OneToOneField("groups.Group", on_delete=models.CASCADE, related_name="summary_snapshot")
+    version = models.PositiveBigIntegerField()
+    payload = models.BinaryField()
     updated_at = models.DateTimeField(auto_now=True)
@@ -11,6 +11,7 @@
 from decimal import Decimal, ROUND_HALF_UP
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from groups.money import from_minor, split_equal, to_minor
 from .models import Group, Expense, Contribution
 
 User = get_user_model()
@@ -106,27 +107,12 @@ class AddExpenseSerializer(serializers.Serializer):
 
     def _generate_equal_split(self, members, amount):
         """Generate equal split contributions for all members"""
-        member_count = len(members)
-        per_person = (amount / Decimal(member_count)
-                      ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-        # Handle rounding differences
-        total_distributed = per_person * member_count
-        difference = amount - total_distributed
-
-        contributions = []
-        for i, member in enumerate(members):
-            contribution_amount = per_person
-            # Add rounding difference to first member
-            if i == 0:
-                contribution_amount += difference
-
-            contributions.append({
-                "user_id": member.id,
-                "amount": contribution_amount.quantize(Decimal("0.01"))
-            })
-
-        return contributions
+        # Whole paise, with the leftover paise going to the first members
+        shares = split_equal(to_minor(amount), len(members))
+        return [
+            {"user_id": member.id, "amount": from_minor(share)}
+            for member, share in zip(members, shares)
+        ]
 
     def _validate_custom_split(self, contributions, members, amount):
         """Validate and normalize custom split contributions"""
@@ -0,0 +1,42 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Summary snapshots: the rendered group summary, stored per group version.
+
+A snapshot is current while its version matches Group.version. Reads serve
+the stored bytes as-is; a stale or missing snapshot is rebuilt on the read
+that finds it (or ahead of time by calling `refresh_snapshot`).
+"""
+
+from groups.renderers import FastJSONRenderer
+from groups.summary import get_group_summary
+from .models import GroupSummary
+
+
+def refresh_snapshot(group, summary=None):
+    """Render the group's current summary (or `summary`, built for it) and store it; returns the JSON bytes."""
+    payload = FastJSONRenderer().render(get_group_summary(group) if summary is None else summary)
+    GroupSummary.objects.update_or_create(
+        group=group,
+        defaults={'version': group.version, 'payload': payload},
+    )
+    return payload
+
+
+def get_snapshot_payload(group):
+    """Return summary JSON bytes for the group's current version."""
+    payload = (
+        GroupSummary.objects.filter(group=group, version=group.version)
+        .values_list('payload', flat=True)
+        .first()
+    )
+    if payload is None:
+        return refresh_snapshot(group)
+    return bytes(payload)
@@ -7,7 +7,10 @@
 #                                         |__/ 
 # ----------------------------------------------------------------------------
 
+import json
+
 from django.test import TestCase
+from django.urls import reverse
 
 # Safe imports: Only import models if they exist
 try:
@@ -58,3 +61,83 @@ class ExpensesTestCase(TestCase):
             amount=50.00
         )
         self.assertEqual(contribution.amount, 50.00)
+
+
+class SummarySnapshotTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from rest_framework.test import APIClient
+        from groups.models import Group as SplitGroup, GroupMember
+
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = SplitGroup.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        self.url = reverse('expense-summary', args=[self.group.id])
+
+    def add_expense(self, amount):
+        response = self.client.post(reverse('add-expense', args=[self.group.id]), {
+            'description': 'Dinner', 'amount': amount, 'paid_by_username': 'user1', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def snapshot(self):
+        from .models import GroupSummary
+        return GroupSummary.objects.filter(group_id=self.group.id).first()
+
+    def test_snapshot_is_built_on_first_read_and_matches_the_summary(self):
+        self.add_expense('30.00')
+        self.assertIsNone(self.snapshot())
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), json.loads(
+            self.client.get(reverse('group-summary', args=[self.group.id])).content
+        ))
+
+        snapshot = self.snapshot()
+        self.assertEqual(bytes(snapshot.payload), response.content)
+        self.assertEqual(response['ETag'], self.client.get(reverse('group-summary', args=[self.group.id]))['ETag'])
+
+    def test_snapshot_is_reused_until_the_group_changes(self):
+        self.add_expense('30.00')
+        first = self.client.get(self.url)
+        updated_at = self.snapshot().updated_at
+
+        self.assertEqual(self.client.get(self.url).content, first.content)
+        self.assertEqual(self.snapshot().updated_at, updated_at)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        self.add_expense('10.00')
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(json.loads(changed.content)['total_amount'], 40.0)
+        self.assertEqual(bytes(self.snapshot().payload), changed.content)
+
+    def test_compressed_snapshot_revalidates_with_its_weak_etag(self):
+        for index in range(6):
+            self.add_expense(f'{index + 10}.00')
+        first = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertTrue(first['ETag'].startswith('W/"summary-'))
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        self.add_expense('1.00')
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_snapshots_are_read_only_and_members_only(self):
+        self.assertEqual(self.client.post(self.url, {'total_amount': 1}, format='json').status_code, 405)
+
+        from django.contrib.auth.models import User
+        outsider = User.objects.create_user(username='user3', password='pass123')
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -11,5 +11,5 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
-    path("groups/<int:group_id>/summary/", views.expense_summary),
+    path("groups/<int:group_id>/summary/", views.expense_summary, name="expense-summary"),
 ]
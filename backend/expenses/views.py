@@ -7,48 +7,32 @@
 #                                         |__/ 
 # ----------------------------------------------------------------------------
 
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.shortcuts import get_object_or_404
-import json
-from .models import Group, GroupSummary
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 
-@csrf_exempt
-def expense_summary(request, group_id):
-    if request.method == "POST":
-        try:
-            data = json.loads(request.body)
-            group = get_object_or_404(Group, id=group_id)
+from groups.conditional import is_not_modified, validator_headers
+from groups.permissions import IsGroupMember, get_membership
+from groups.summary import summary_etag
+from .snapshots import get_snapshot_payload
 
-            summary, created = GroupSummary.objects.update_or_create(
-                group=group,
-                defaults={
-                    "total_amount": data.get("totalAmount", 0),
-                    "transactions": data.get("transactions", 0),
-                    "members_count": data.get("membersCount", 0),
-                    "balances": data.get("balances", []),
-                    "recent_expenses": data.get("recentExpenses", [])
-                }
-            )
 
-            return JsonResponse({
-                "message": "Summary saved successfully",
-                "created": created
-            })
-        except Exception as e:
-            return JsonResponse({"error": str(e)}, status=400)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsGroupMember])
+def expense_summary(request, group_id):
+    """
+    Serve the server-computed summary snapshot for a group.
 
-    elif request.method == "GET":
-        group = get_object_or_404(Group, id=group_id)
-        summary = getattr(group, "summary", None)
-        if summary:
-            return JsonResponse({
-                "total_amount": summary.total_amount,
-                "transactions": summary.transactions,
-                "members_count": summary.members_count,
-                "balances": summary.balances,
-                "recent_expenses": summary.recent_expenses
-            })
-        return JsonResponse({"message": "No summary found"}, status=404)
+    The stored JSON bytes go out unchanged; nothing is re-serialized.
+    """
+    group = get_membership(request, group_id).group
 
-    return JsonResponse({"error": "Method not allowed"}, status=405)
+    # Clients that accept compression get a weak tag; is_not_modified accepts either form
+    etag = summary_etag(group)
+    if is_not_modified(request, etag, group.updated_at):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(get_snapshot_payload(group), content_type="application/json")
+    for name, value in validator_headers(etag, group.updated_at).items():
+        response[name] = value
+    return response
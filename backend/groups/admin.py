@@ -8,7 +8,7 @@
 # ----------------------------------------------------------------------------
 
 from django.contrib import admin
-from .models import Group, GroupMember, GroupExpense, ExpenseSplit
+from .models import Group, GroupMember, GroupExpense, ExpenseSplit, GroupBalance
 
 
 @admin.register(Group)
@@ -61,4 +61,15 @@ class ExpenseSplitAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'expense__description')
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'expense')
\ No newline at end of file
+        return super().get_queryset(request).select_related('user', 'expense')
+
+
+@admin.register(GroupBalance)
+class GroupBalanceAdmin(admin.ModelAdmin):
+    list_display = ('user', 'group', 'paid_minor', 'owed_minor', 'net_minor', 'expense_count')
+    list_filter = ('group',)
+    search_fields = ('user__username', 'group__name')
+    readonly_fields = ('group', 'user', 'paid_minor', 'owed_minor', 'net_minor', 'expense_count')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'group')
\ No newline at end of file
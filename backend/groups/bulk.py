@@ -0,0 +1,138 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Batch expense ingestion.
+
+Payloads use the CreateExpenseSerializer format. All of them are validated
+against one preloaded member map and valid ones are written in chunks: one
+bulk_create for the expenses, one for their splits, one ledger UPDATE and one
+version bump per chunk, each chunk in its own transaction.
+"""
+
+from django.db import transaction
+from rest_framework import serializers
+
+from . import ledger
+from .models import Group, GroupExpense, ExpenseSplit
+from .serializers import CreateExpenseSerializer, load_members
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class ExpenseImporter:
+    def __init__(self, group, members=None, chunk_size=DEFAULT_CHUNK_SIZE, errors_only=False):
+        self.group = group
+        self.members = load_members(group) if members is None else members
+        self.member_ids = set(self.members.values())
+        self.chunk_size = chunk_size
+        # File imports can run to 100k+ rows; they only keep the failures
+        self.errors_only = errors_only
+        self.results = []
+        self.valid = 0
+        self.created = 0
+        self.failed = 0
+        # One serializer validates every item, the way ListSerializer reuses
+        # its child, so the field set is built once rather than per item.
+        self.serializer = CreateExpenseSerializer(
+            context={'group': group, 'members': self.members}
+        )
+
+    def validate(self, index, item):
+        """
+        Return validated data for `item`, or None after recording its errors.
+
+        Readers pass a ValidationError in place of a record they could not parse.
+        """
+        try:
+            if isinstance(item, serializers.ValidationError):
+                raise item
+            data = self.serializer.run_validation(item)
+        except serializers.ValidationError as exc:
+            self.failed += 1
+            self.results.append({'index': index, 'status': 'invalid', 'errors': exc.detail})
+            return None
+        self.valid += 1
+        return data
+
+    def write(self, chunk):
+        """Insert a chunk of (index, validated data) pairs in one transaction."""
+        if not chunk:
+            return
+
+        with transaction.atomic():
+            expenses = GroupExpense.objects.bulk_create([
+                GroupExpense(
+                    group=self.group,
+                    description=data['description'],
+                    amount=data['amount'],
+                    paid_by_id=self.members[data['paid_by_username']],
+                    split_type=data['split_type'],
+                )
+                for _, data in chunk
+            ])
+
+            splits, deltas = [], ledger.new_deltas()
+            for expense, (_, data) in zip(expenses, chunk):
+                amounts = self.serializer.split_amounts(data)
+                if not set(amounts) <= self.member_ids:
+                    raise ValueError("User must be a member of the group")
+                expense_splits = [
+                    ExpenseSplit(expense=expense, user_id=user_id, amount=amount)
+                    for user_id, amount in amounts.items()
+                ]
+                ledger.expense_deltas(expense, expense_splits, deltas=deltas)
+                splits.extend(expense_splits)
+
+            ExpenseSplit.objects.bulk_create(splits, batch_size=self.chunk_size * 4)
+            ledger.apply_deltas(self.group.id, deltas)
+            Group.objects.filter(pk=self.group.id).bump_version()
+
+        self.created += len(expenses)
+        if not self.errors_only:
+            for expense, (index, _) in zip(expenses, chunk):
+                self.results.append({'index': index, 'status': 'created', 'id': expense.id})
+
+    def run(self, items, atomic=False, dry_run=False):
+        """
+        Validate and write `items` (any iterable of payloads).
+
+        With `atomic`, nothing is written unless every item is valid; with
+        `dry_run`, nothing is written at all.
+        """
+        if dry_run:
+            for index, item in enumerate(items):
+                if self.validate(index, item) is not None and not self.errors_only:
+                    self.results.append({'index': index, 'status': 'valid'})
+        elif atomic:
+            valid = []
+            for index, item in enumerate(items):
+                data = self.validate(index, item)
+                if data is not None:
+                    valid.append((index, data))
+            if self.failed:
+                if not self.errors_only:
+                    self.results.extend({'index': index, 'status': 'skipped'} for index, _ in valid)
+            else:
+                with transaction.atomic():
+                    for start in range(0, len(valid), self.chunk_size):
+                        self.write(valid[start:start + self.chunk_size])
+        else:
+            chunk = []
+            for index, item in enumerate(items):
+                data = self.validate(index, item)
+                if data is not None:
+                    chunk.append((index, data))
+                if len(chunk) >= self.chunk_size:
+                    self.write(chunk)
+                    chunk = []
+            self.write(chunk)
+
+        self.results.sort(key=lambda result: result['index'])
+        return self
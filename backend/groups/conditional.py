@@ -0,0 +1,83 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Conditional GET for group reads.
+
+Every write to a group's expenses, splits or members bumps Group.version and
+Group.updated_at in the same transaction (GroupQuerySet.bump_version), so
+those two columns validate anything read from the group without looking at
+its expenses:
+
+    expense pages, summary   the group row already loaded for the permission check
+    group list               one aggregate over the user's groups
+
+A matching If-None-Match (weak or strong, since compression weakens tags) or
+an If-Modified-Since no older than Last-Modified gets a 304 before any
+serialization work. Profile edits of other members do not bump a group, so
+they show up in a cached list after that group's next change.
+"""
+
+from django.db.models import Count, Max, Sum
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Group, GroupMember
+from .summary import version_tag
+
+
+def _opaque(tag):
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def is_not_modified(request, etag, last_modified=None):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+        tags = {_opaque(tag) for tag in parse_etags(if_none_match)}
+        return '*' in tags or _opaque(etag) in tags
+    if last_modified is None:
+        return False
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and int(last_modified.timestamp()) <= since
+
+
+def validator_headers(etag, last_modified=None):
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.timestamp())
+    return headers
+
+
+def not_modified(etag, last_modified=None):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
+
+
+def set_validators(response, etag, last_modified=None):
+    for name, value in validator_headers(etag, last_modified).items():
+        response[name] = value
+    return response
+
+
+def expenses_validators(group):
+    return f'"expenses-{version_tag(group)}"', group.updated_at
+
+
+def group_list_validators(user):
+    """ETag and Last-Modified for the groups `user` belongs to, from one aggregate row."""
+    state = Group.objects.filter(
+        id__in=GroupMember.objects.filter(user=user).values('group_id')
+    ).order_by().aggregate(
+        count=Count('id'), ids=Sum('id'), versions=Sum('version'), last_modified=Max('updated_at')
+    )
+    last_modified = state['last_modified']
+    stamp = int(last_modified.timestamp() * 1000000) if last_modified else 0
+    etag = f'"groups-{user.id}.{state["count"]}.{state["ids"] or 0}.{state["versions"] or 0}.{stamp}"'
+    return etag, last_modified
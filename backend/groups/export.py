@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Streaming ledger export.
+
+One values() query walks a group's expenses joined to their payer, splits and
+participants, ordered by expense. It is read with .iterator() so rows are
+fetched from the cursor in chunks and turned into output text as they arrive;
+nothing holds more than one chunk of rows, however large the group is.
+
+    csv     one row per split, expense columns repeated on each row
+    ndjson  one object per expense, its splits as {username: amount}
+"""
+
+import csv
+import json
+from itertools import groupby
+
+from .models import GroupExpense
+
+CHUNK_SIZE = 2000
+
+COLUMNS = (
+    'expense_id', 'created_at', 'description', 'amount', 'paid_by',
+    'split_type', 'participant', 'share',
+)
+
+
+def split_rows(group, chunk_size=CHUNK_SIZE):
+    """
+    Yield one tuple per split of `group`, in COLUMNS order, grouped by expense.
+
+    The query is driven from the expense side so SQLite walks the group index
+    in id order and the covering split index per expense, with no sort step;
+    an expense without splits still gets one row with the split columns None.
+    """
+    return (
+        GroupExpense.objects
+        .filter(group=group)
+        .order_by('id', 'splits__user_id')
+        .values_list(
+            'id', 'created_at', 'description', 'amount', 'paid_by__username',
+            'split_type', 'splits__user__username', 'splits__amount',
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+class Echo:
+    """File-like object whose write() hands the line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines, chunk_size):
+    # Joining a chunk of lines per yield keeps the number of socket writes down
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= chunk_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def export_csv(group, chunk_size=CHUNK_SIZE):
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(COLUMNS)
+        for expense_id, created_at, description, amount, paid_by, split_type, username, share in \
+                split_rows(group, chunk_size):
+            yield writer.writerow(
+                (expense_id, created_at.isoformat(), description, amount, paid_by, split_type, username, share)
+            )
+
+    return _batched(lines(), chunk_size)
+
+
+def export_ndjson(group, chunk_size=CHUNK_SIZE):
+    def lines():
+        for expense_id, rows in groupby(split_rows(group, chunk_size), key=lambda row: row[0]):
+            first = next(rows)
+            splits = {row[6]: str(row[7]) for row in (first, *rows) if row[6] is not None}
+            yield json.dumps({
+                'id': expense_id,
+                'created_at': first[1].isoformat(),
+                'description': first[2],
+                'amount': str(first[3]),
+                'paid_by_username': first[4],
+                'split_type': first[5],
+                'splits': splits,
+            }) + '\n'
+
+    return _batched(lines(), chunk_size)
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+}
@@ -0,0 +1,217 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Expense import from CSV or NDJSON files.
+
+The readers turn a text stream into CreateExpenseSerializer payloads one
+record at a time, so ExpenseImporter validates and commits chunk by chunk
+while the rest of the file is still unread. A record that cannot be read
+becomes a ValidationError in its place and is reported like an invalid row.
+
+CSV needs a header row; unknown columns are ignored:
+
+    description, amount, paid_by (or paid_by_username), split_type,
+    splits    "alice=40.00;bob=20.00", read as custom_splits
+
+Files in the export layout (expense_id, participant, share, ...) import too:
+consecutive rows with the same expense_id become one custom-split expense.
+
+NDJSON has one payload per line. Exported lines, which carry "splits" rather
+than custom_splits, import as custom splits.
+
+Reading stops at the first line that does not decode in the file's charset,
+or that the csv module cannot parse; that line is reported as one more
+invalid record, so an atomic import writes
+nothing and any other import says which rows were saved before it.
+"""
+
+import codecs
+import csv
+import json
+import os
+from itertools import groupby
+from operator import itemgetter
+
+from rest_framework import serializers
+
+from .bulk import ExpenseImporter
+
+FORMATS = ('csv', 'ndjson')
+
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+EXPORT_COLUMNS = {'expense_id', 'participant', 'share'}
+
+
+def detect_format(content_type=None, filename=None):
+    """Guess 'csv' or 'ndjson' from a file name or content type; None if neither says."""
+    if filename:
+        guessed = EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+        if guessed:
+            return guessed
+    if content_type:
+        return CONTENT_TYPES.get(content_type.split(';')[0].strip().lower())
+    return None
+
+
+def resolve_encoding(encoding):
+    """Return the codec to read a file declared as `encoding`; LookupError if there is none."""
+    try:
+        info = codecs.lookup(encoding)
+    except LookupError:
+        raise LookupError(f"Unknown charset {encoding!r}")
+    # base64, rot13 and friends are codecs too, but not text encodings
+    if not getattr(info, '_is_text_encoding', True):
+        raise LookupError(f"Unknown charset {encoding!r}")
+    # utf-8-sig drops the byte order mark spreadsheet programs like to add
+    return 'utf-8-sig' if info.name == 'utf-8' else info.name
+
+
+class LineDecoder:
+    """Text lines from byte lines; stops at the first undecodable line and keeps its error."""
+
+    def __init__(self, stream, encoding, label=None):
+        self.stream = stream
+        self.encoding = encoding
+        self.label = label or encoding
+        self.error = None
+
+    def __iter__(self):
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        number = 0
+        try:
+            for number, line in enumerate(self.stream, start=1):
+                text = decoder.decode(line)
+                if text:
+                    yield text
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield text
+        except UnicodeDecodeError as exc:
+            self.error = f"Line {max(number, 1)}: not valid {self.label} ({exc.reason}); the rest of the file was not read"
+
+
+def _records(reader, decoder):
+    yield from reader
+    if decoder.error:
+        yield serializers.ValidationError(decoder.error)
+
+
+def _compact(payload):
+    # Blank cells count as missing, so the serializer reports "required"
+    return {key: value for key, value in payload.items() if value not in (None, '')}
+
+
+def _parse_splits(value):
+    splits = {}
+    for part in value.split(';'):
+        if not part.strip():
+            continue
+        username, sep, amount = part.partition('=')
+        if not sep:
+            raise serializers.ValidationError({'splits': [f"Expected username=amount, got {part.strip()!r}"]})
+        splits[username.strip()] = amount.strip()
+    return splits
+
+
+def _csv_payload(row):
+    payload = _compact({
+        'description': row.get('description'),
+        'amount': row.get('amount'),
+        'paid_by_username': row.get('paid_by_username') or row.get('paid_by'),
+        'split_type': row.get('split_type'),
+    })
+    if row.get('splits'):
+        try:
+            payload['custom_splits'] = _parse_splits(row['splits'])
+        except serializers.ValidationError as exc:
+            return exc
+    return payload
+
+
+def _export_payload(rows):
+    # Exported shares are already amounts, whatever split produced them
+    first = rows[0]
+    return _compact({
+        'description': first.get('description'),
+        'amount': first.get('amount'),
+        'paid_by_username': first.get('paid_by'),
+        'split_type': 'custom',
+        'custom_splits': {row['participant']: row['share'] for row in rows if row.get('participant')},
+    })
+
+
+def read_csv(lines):
+    """Yield one payload per CSV record (per expense for the export layout)."""
+    reader = csv.DictReader(lines)
+    try:
+        if reader.fieldnames and EXPORT_COLUMNS <= set(reader.fieldnames):
+            for _, rows in groupby(reader, key=itemgetter('expense_id')):
+                yield _export_payload(list(rows))
+        else:
+            for row in reader:
+                yield _csv_payload(row)
+    except csv.Error as exc:
+        # Earlier chunks may be committed already, so report it like a bad row rather than fail.
+        # DictReader.line_num only moves on good rows; the csv reader's counts the bad one too.
+        yield serializers.ValidationError(
+            f"Line {reader.reader.line_num}: invalid CSV ({exc}); the rest of the file was not read"
+        )
+
+
+def read_ndjson(lines):
+    """Yield one payload per non-blank line; bad JSON is reported, not fatal."""
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as exc:
+            yield serializers.ValidationError(f"Line {number}: invalid JSON ({exc})")
+            continue
+        if isinstance(item, dict) and 'splits' in item and 'custom_splits' not in item:
+            item = {**item, 'split_type': 'custom', 'custom_splits': item['splits']}
+        yield item
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+def import_stream(group, stream, file_format, members=None, chunk_size=None,
+                  atomic=False, dry_run=False, encoding='utf-8'):
+    """
+    Import expenses from `stream`, any iterable of byte lines, into `group`.
+
+    Returns the ExpenseImporter, whose results hold only the failed records.
+    Raises LookupError for an unknown `encoding`, before anything is read.
+    """
+    # Uploads and request bodies both iterate as byte lines split on newlines only
+    lines = LineDecoder(stream, resolve_encoding(encoding), label=encoding)
+
+    options = {'members': members, 'errors_only': True}
+    if chunk_size:
+        options['chunk_size'] = chunk_size
+    importer = ExpenseImporter(group, **options)
+    return importer.run(_records(READERS[file_format](lines), lines), atomic=atomic, dry_run=dry_run)
@@ -0,0 +1,191 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Per-member balance ledger for groups.
+
+Every write to GroupExpense / ExpenseSplit is turned into a set of deltas
+(paid, owed, expense count) per user, in integer paise, and applied to
+GroupBalance with a single UPDATE inside the caller's transaction. The ledger
+can always be recomputed from the expense tables with `rebuild()`.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Group, GroupMember, GroupExpense, ExpenseSplit, GroupBalance
+from .money import to_minor
+
+ZERO = Decimal('0.00')
+
+
+def new_deltas():
+    return defaultdict(lambda: [0, 0, 0])
+
+
+def expense_deltas(expense, splits, sign=1, deltas=None):
+    """Collect the ledger effect of one expense and its splits."""
+    deltas = new_deltas() if deltas is None else deltas
+    paid = deltas[expense.paid_by_id]
+    paid[0] += sign * to_minor(expense.amount)
+    paid[2] += sign
+    for split in splits:
+        deltas[split.user_id][1] += sign * to_minor(split.amount)
+    return deltas
+
+
+def _case(deltas, index):
+    output_field = models.BigIntegerField()
+    whens = [
+        When(user_id=user_id, then=Value(delta[index], output_field=output_field))
+        for user_id, delta in deltas.items()
+    ]
+    return Case(*whens, default=Value(0, output_field=output_field), output_field=output_field)
+
+
+def apply_deltas(group_id, deltas):
+    """Add `deltas` ({user_id: [paid paise, owed paise, count]}) to the group's balance rows."""
+    deltas = {
+        user_id: delta for user_id, delta in deltas.items()
+        if delta[0] or delta[1] or delta[2]
+    }
+    if not deltas:
+        return
+
+    paid = _case(deltas, 0)
+    owed = _case(deltas, 1)
+    GroupBalance.objects.filter(group_id=group_id, user_id__in=deltas).update(
+        paid_minor=F('paid_minor') + paid,
+        owed_minor=F('owed_minor') + owed,
+        net_minor=F('net_minor') + paid - owed,
+        expense_count=F('expense_count') + _case(deltas, 2),
+    )
+
+
+def record_splits(group_id, splits, sign=1):
+    """Apply splits written without signals (bulk_create) to the ledger."""
+    deltas = new_deltas()
+    for split in splits:
+        deltas[split.user_id][1] += sign * to_minor(split.amount)
+    apply_deltas(group_id, deltas)
+
+
+def record_expense(expense, splits):
+    apply_deltas(expense.group_id, expense_deltas(expense, splits))
+
+
+def reverse_expense(expense, splits):
+    apply_deltas(expense.group_id, expense_deltas(expense, splits, sign=-1))
+
+
+def aggregate_balances(group_id):
+    """
+    Compute every participant's totals from the expense tables in one query.
+
+    Returns dict rows (user_id, username, email, paid_minor, owed_minor,
+    expense_count): current members in membership order, then former members
+    who still paid or owe in the group, the same rows the ledger keeps. Paid
+    totals and counts come from correlated subqueries on GroupExpense and owed
+    totals from ExpenseSplit, so nothing but the participant rows leaves the
+    database however long the group's history is.
+    """
+    money = models.DecimalField(max_digits=15, decimal_places=2)
+    memberships = GroupMember.objects.filter(group_id=group_id)
+    expenses = GroupExpense.objects.filter(group_id=group_id, paid_by=OuterRef('pk')).order_by().values('paid_by')
+    splits = ExpenseSplit.objects.filter(expense__group_id=group_id, user=OuterRef('pk')).order_by().values('user')
+
+    rows = (
+        User.objects.filter(
+            Q(pk__in=memberships.values('user_id'))
+            | Q(pk__in=GroupExpense.objects.filter(group_id=group_id).values('paid_by_id'))
+            | Q(pk__in=ExpenseSplit.objects.filter(expense__group_id=group_id).values('user_id'))
+        )
+        .annotate(
+            membership=Subquery(memberships.filter(user=OuterRef('pk')).values('id')[:1]),
+            paid=Coalesce(Subquery(expenses.annotate(total=Sum('amount')).values('total')), Value(ZERO), output_field=money),
+            owed=Coalesce(Subquery(splits.annotate(total=Sum('amount')).values('total')), Value(ZERO), output_field=money),
+            expense_count=Coalesce(Subquery(expenses.annotate(count=Count('id')).values('count')), Value(0)),
+        )
+        .order_by(F('membership').asc(nulls_last=True), 'pk')
+        .values('pk', 'username', 'email', 'paid', 'owed', 'expense_count')
+    )
+    # The sums arrive as 2-place Decimals; convert the (one per participant) rows to paise
+    return [
+        {
+            'user_id': row['pk'],
+            'username': row['username'],
+            'email': row['email'],
+            'paid_minor': to_minor(row['paid']),
+            'owed_minor': to_minor(row['owed']),
+            'expense_count': row['expense_count'],
+        }
+        for row in rows
+    ]
+
+
+def compute_balances(group_id):
+    """Recompute {user_id: (paid, owed, expense_count)} in paise for every participant from the expense tables."""
+    return {
+        row['user_id']: (row['paid_minor'], row['owed_minor'], row['expense_count'])
+        for row in aggregate_balances(group_id)
+    }
+
+
+def check(group_id):
+    """Return {user_id: (stored, expected)} for every balance row that has drifted."""
+    expected = compute_balances(group_id)
+    stored = {
+        row[0]: row[1:]
+        for row in GroupBalance.objects.filter(group_id=group_id).values_list(
+            'user_id', 'paid_minor', 'owed_minor', 'net_minor', 'expense_count'
+        )
+    }
+
+    drift = {}
+    for user_id in expected.keys() | stored.keys():
+        paid, owed, count = expected.get(user_id, (None, None, None))
+        want = None if paid is None else (paid, owed, paid - owed, count)
+        have = stored.get(user_id)
+        # A former member whose expenses were all deleted keeps an empty row; that is not drift
+        if want is None and have == (0, 0, 0, 0):
+            continue
+        if have != want:
+            drift[user_id] = (have, want)
+    return drift
+
+
+def rebuild(group_id):
+    """Replace the group's balance rows with values recomputed from its expenses."""
+    with transaction.atomic():
+        balances = compute_balances(group_id)
+        rows = {row.user_id: row for row in GroupBalance.objects.filter(group_id=group_id)}
+
+        GroupBalance.objects.filter(group_id=group_id).exclude(user_id__in=balances).delete()
+
+        changed, missing = [], []
+        for user_id, (paid, owed, count) in balances.items():
+            row = rows.get(user_id)
+            if row is None:
+                row = GroupBalance(group_id=group_id, user_id=user_id)
+                missing.append(row)
+            else:
+                changed.append(row)
+            row.paid_minor, row.owed_minor, row.net_minor, row.expense_count = paid, owed, paid - owed, count
+
+        GroupBalance.objects.bulk_update(
+            changed, ['paid_minor', 'owed_minor', 'net_minor', 'expense_count'], batch_size=500
+        )
+        GroupBalance.objects.bulk_create(missing, batch_size=500)
+        Group.objects.filter(pk=group_id).bump_version()
+    return balances
@@ -0,0 +1,64 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from groups.imports import FORMATS, detect_format, import_stream, resolve_encoding
+from groups.models import Group
+
+
+class Command(BaseCommand):
+    help = "Import expenses into a group from a CSV or NDJSON file, committing in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('group_id', type=int)
+        parser.add_argument('path', help="File to import, or - for stdin")
+        parser.add_argument('--format', choices=FORMATS, help="Input format (default: from the file extension)")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows per bulk insert and commit")
+        parser.add_argument('--encoding', default='utf-8')
+        parser.add_argument('--dry-run', action='store_true', help="Validate every row without writing anything")
+        parser.add_argument('--atomic', action='store_true', help="Write nothing unless every row is valid")
+
+    def handle(self, *args, **options):
+        group = Group.objects.filter(pk=options['group_id']).first()
+        if group is None:
+            raise CommandError(f"Unknown group id: {options['group_id']}")
+
+        path = options['path']
+        file_format = options['format'] or detect_format(filename=path)
+        if file_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format")
+
+        try:
+            resolve_encoding(options['encoding'])
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            importer = import_stream(
+                group, stream, file_format, chunk_size=options['chunk_size'], encoding=options['encoding'],
+                atomic=options['atomic'], dry_run=options['dry_run'],
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for result in importer.results:
+            self.stdout.write(f"row {result['index']}: {result['errors']}")
+
+        if options['dry_run']:
+            summary = f"{importer.valid} valid, {importer.failed} invalid (dry run, nothing written)"
+        else:
+            summary = f"{importer.created} imported, {importer.failed} failed"
+        if importer.failed:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
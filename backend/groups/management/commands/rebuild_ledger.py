@@ -0,0 +1,48 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from django.core.management.base import BaseCommand, CommandError
+
+from groups import ledger
+from groups.models import Group
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or, with --check, verify) the per-member balance ledger from GroupExpense/ExpenseSplit."
+
+    def add_arguments(self, parser):
+        parser.add_argument('group_ids', nargs='*', type=int, help="Groups to process (default: all groups)")
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Only report drift; exit with an error if any group is out of date",
+        )
+
+    def handle(self, *args, **options):
+        group_ids = options['group_ids'] or list(Group.objects.order_by('id').values_list('id', flat=True))
+        missing = set(group_ids) - set(Group.objects.filter(id__in=group_ids).values_list('id', flat=True))
+        if missing:
+            raise CommandError(f"Unknown group id(s): {', '.join(map(str, sorted(missing)))}")
+
+        drifted = 0
+        for group_id in group_ids:
+            drift = ledger.check(group_id)
+            if not drift:
+                self.stdout.write(f"group {group_id}: ok")
+                continue
+
+            drifted += 1
+            for user_id, (have, want) in sorted(drift.items()):
+                self.stdout.write(f"group {group_id} user {user_id}: stored={have} expected={want}")
+            if not options['check']:
+                ledger.rebuild(group_id)
+                self.stdout.write(self.style.SUCCESS(f"group {group_id}: rebuilt"))
+
+        if options['check'] and drifted:
+            raise CommandError(f"{drifted} group(s) have ledger drift")
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(group_ids)} group(s), {drifted} with drift"))
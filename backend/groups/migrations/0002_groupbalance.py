@@ -0,0 +1,67 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:47
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_balances(apps, schema_editor):
+    GroupMember = apps.get_model('groups', 'GroupMember')
+    GroupExpense = apps.get_model('groups', 'GroupExpense')
+    ExpenseSplit = apps.get_model('groups', 'ExpenseSplit')
+    GroupBalance = apps.get_model('groups', 'GroupBalance')
+
+    balances = {}
+    for member in GroupMember.objects.order_by('id'):
+        balances[(member.group_id, member.user_id)] = GroupBalance(
+            group_id=member.group_id, user_id=member.user_id
+        )
+
+    paid_rows = GroupExpense.objects.values('group_id', 'paid_by_id').annotate(
+        total=Sum('amount'), count=Count('id')
+    )
+    for row in paid_rows:
+        balance = balances.get((row['group_id'], row['paid_by_id']))
+        if balance is not None:
+            balance.paid = row['total']
+            balance.expense_count = row['count']
+
+    owed_rows = ExpenseSplit.objects.values('expense__group_id', 'user_id').annotate(total=Sum('amount'))
+    for row in owed_rows:
+        balance = balances.get((row['expense__group_id'], row['user_id']))
+        if balance is not None:
+            balance.owed = row['total']
+
+    for balance in balances.values():
+        balance.net = balance.paid - balance.owed
+    GroupBalance.objects.bulk_create(balances.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('paid', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('owed', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('net', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('expense_count', models.PositiveIntegerField(default=0)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='groups.group')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_balances', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'unique_together': {('group', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
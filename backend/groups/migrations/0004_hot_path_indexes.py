@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0003_group_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expensesplit',
+            index=models.Index(fields=['expense', 'user', 'amount'], name='expensesplit_expense_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expensesplit',
+            index=models.Index(fields=['user', 'expense', 'amount'], name='expensesplit_user_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupexpense',
+            index=models.Index(fields=['group', '-created_at', '-id'], name='groupexpense_group_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupmember',
+            index=models.Index(fields=['user', 'group'], name='groupmember_user_group_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0004_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupexpense',
+            index=models.Index(fields=['group', 'paid_by', 'amount'], name='groupexpense_group_payer_idx'),
+        ),
+    ]
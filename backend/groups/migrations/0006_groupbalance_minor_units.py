@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:16
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def to_minor_units(apps, schema_editor):
+    GroupBalance = apps.get_model('groups', 'GroupBalance')
+    rows = list(GroupBalance.objects.all())
+    for row in rows:
+        row.paid_minor = int(row.paid * 100)
+        row.owed_minor = int(row.owed * 100)
+        row.net_minor = int(row.net * 100)
+    GroupBalance.objects.bulk_update(rows, ['paid_minor', 'owed_minor', 'net_minor'], batch_size=500)
+
+
+def from_minor_units(apps, schema_editor):
+    GroupBalance = apps.get_model('groups', 'GroupBalance')
+    rows = list(GroupBalance.objects.all())
+    for row in rows:
+        row.paid = Decimal(row.paid_minor).scaleb(-2)
+        row.owed = Decimal(row.owed_minor).scaleb(-2)
+        row.net = Decimal(row.net_minor).scaleb(-2)
+    GroupBalance.objects.bulk_update(rows, ['paid', 'owed', 'net'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0005_groupexpense_payer_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupbalance',
+            name='net_minor',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='groupbalance',
+            name='owed_minor',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='groupbalance',
+            name='paid_minor',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(to_minor_units, from_minor_units),
+        migrations.RemoveField(
+            model_name='groupbalance',
+            name='net',
+        ),
+        migrations.RemoveField(
+            model_name='groupbalance',
+            name='owed',
+        ),
+        migrations.RemoveField(
+            model_name='groupbalance',
+            name='paid',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0006_groupbalance_minor_units'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='groupexpense',
+            name='split_type',
+            field=models.CharField(choices=[('equal', 'Equal Split'), ('custom', 'Custom Split'), ('shares', 'Split by Shares'), ('percent', 'Split by Percentage'), ('adjustment', 'Equal Split with Adjustments')], default='equal', max_length=10),
+        ),
+    ]
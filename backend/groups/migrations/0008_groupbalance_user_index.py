@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0007_more_split_types'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupbalance',
+            index=models.Index(fields=['user', 'group', 'paid_minor', 'owed_minor'], name='groupbalance_user_cover_idx'),
+        ),
+    ]
@@ -10,14 +10,40 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
 
+from . import money
+
+
+class GroupQuerySet(models.QuerySet):
+    def bump_version(self):
+        """Mark the groups as changed; call inside the writing transaction."""
+        return self.update(version=models.F('version') + 1, updated_at=timezone.now())
+
+    def with_listing_data(self):
+        """Load everything GroupSerializer needs in a fixed number of queries."""
+        paid_total = (
+            GroupBalance.objects.filter(group=models.OuterRef('pk'))
+            .order_by()
+            .values('group')
+            .annotate(total=models.Sum('paid_minor'))
+            .values('total')
+        )
+        return self.select_related('created_by').prefetch_related(
+            models.Prefetch('members', queryset=GroupMember.objects.select_related('user'))
+        ).annotate(expenses_total=models.Subquery(paid_total))
+
 
 class Group(models.Model):
     name = models.CharField(max_length=100)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_groups')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped on every change to the group's expenses, splits or members
+    version = models.PositiveBigIntegerField(default=0)
+
+    objects = GroupQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
@@ -27,10 +53,15 @@ class Group(models.Model):
 
     @property
     def member_count(self):
+        # Reuse prefetched members (see GroupQuerySet.with_listing_data)
+        if 'members' in getattr(self, '_prefetched_objects_cache', {}):
+            return len(self.members.all())
         return self.members.count()
 
     @property
     def total_expenses(self):
+        if hasattr(self, 'expenses_total'):
+            return money.from_minor(self.expenses_total or 0)
         return self.expenses.aggregate(
             total=models.Sum('amount')
         )['total'] or Decimal('0.00')
@@ -45,6 +76,10 @@ class GroupMember(models.Model):
     class Meta:
         unique_together = ('group', 'user')
         ordering = ['joined_at']
+        indexes = [
+            # "Groups I belong to" lookups, answered from the index alone
+            models.Index(fields=['user', 'group'], name='groupmember_user_group_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} in {self.group.name}"
@@ -54,6 +89,9 @@ class GroupExpense(models.Model):
     SPLIT_CHOICES = [
         ('equal', 'Equal Split'),
         ('custom', 'Custom Split'),
+        ('shares', 'Split by Shares'),
+        ('percent', 'Split by Percentage'),
+        ('adjustment', 'Equal Split with Adjustments'),
     ]
 
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='expenses')
@@ -66,13 +104,24 @@ class GroupExpense(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Matches the expense pages (ExpenseCursorPagination) and the recent list
+            models.Index(fields=['group', '-created_at', '-id'], name='groupexpense_group_recent_idx'),
+            # Covers per-payer sums within a group (ledger.aggregate_balances)
+            models.Index(fields=['group', 'paid_by', 'amount'], name='groupexpense_group_payer_idx'),
+        ]
 
     def __str__(self):
         return f"{self.description} - ₹{self.amount}"
 
-    def save(self, *args, **kwargs):
-        # Ensure paid_by user is a member of the group
-        if not GroupMember.objects.filter(group=self.group, user=self.paid_by).exists():
+    def save(self, *args, member_ids=None, **kwargs):
+        # Ensure paid_by user is a member of the group. Callers that already
+        # loaded the group's members pass their ids to skip the lookup.
+        if member_ids is not None:
+            is_member = self.paid_by_id in member_ids
+        else:
+            is_member = GroupMember.objects.filter(group=self.group, user=self.paid_by).exists()
+        if not is_member:
             raise ValueError("User who paid must be a member of the group")
         super().save(*args, **kwargs)
 
@@ -84,12 +133,60 @@ class ExpenseSplit(models.Model):
 
     class Meta:
         unique_together = ('expense', 'user')
+        indexes = [
+            # Covering indexes for summing split amounts per expense / per user
+            models.Index(fields=['expense', 'user', 'amount'], name='expensesplit_expense_cover_idx'),
+            models.Index(fields=['user', 'expense', 'amount'], name='expensesplit_user_cover_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} owes ₹{self.amount} for {self.expense.description}"
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, member_ids=None, **kwargs):
         # Ensure user is a member of the expense's group
-        if not GroupMember.objects.filter(group=self.expense.group, user=self.user).exists():
+        if member_ids is not None:
+            is_member = self.user_id in member_ids
+        else:
+            is_member = GroupMember.objects.filter(group=self.expense.group, user=self.user).exists()
+        if not is_member:
+            raise ValueError("User must be a member of the group")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def bulk_create_for_expense(cls, expense, amounts, member_ids):
+        """
+        Create all splits of `expense` with one INSERT.
+
+        `amounts` maps user id to amount; `member_ids` is the group's member
+        set, checked once here instead of per row in save().
+        """
+        if not set(amounts) <= set(member_ids):
             raise ValueError("User must be a member of the group")
-        super().save(*args, **kwargs)
\ No newline at end of file
+        return cls.objects.bulk_create([
+            cls(expense=expense, user_id=user_id, amount=amount)
+            for user_id, amount in amounts.items()
+        ])
+
+
+class GroupBalance(models.Model):
+    """Running per-member totals for a group, kept in step with its expenses."""
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='balances')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='group_balances')
+    # Integer paise (see groups.money)
+    paid_minor = models.BigIntegerField(default=0)
+    owed_minor = models.BigIntegerField(default=0)
+    net_minor = models.BigIntegerField(default=0)
+    # Number of expenses this member paid for, so the group's expense count
+    # is the sum over its balance rows.
+    expense_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('group', 'user')
+        ordering = ['id']
+        indexes = [
+            # Covers a member's balances across all groups (the /api/me/balances/ read)
+            models.Index(fields=['user', 'group', 'paid_minor', 'owed_minor'], name='groupbalance_user_cover_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} in {self.group.name}: ₹{money.from_minor(self.net_minor)}"
@@ -0,0 +1,116 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Money as integer minor units (paise).
+
+Amounts enter and leave the API as 2-place Decimals. Splitting, the balance
+ledger, summaries and settlements all work on ints, so sums are exact and a
+split always adds back up to its total.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+try:
+    import numpy
+except ImportError:  # optional: allocate() falls back to plain Python
+    numpy = None
+
+MINOR_DIGITS = 2
+MINOR_PER_UNIT = 10 ** MINOR_DIGITS
+
+# Below this many shares the list version beats NumPy's array setup cost
+NUMPY_MIN_SHARES = 64
+# total * weight must stay inside int64 for the NumPy path
+NUMPY_MAX_PRODUCT = 2 ** 62
+
+
+def to_minor(amount):
+    """Convert an amount in rupees (Decimal, str, int or float) to integer paise."""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int(amount.scaleb(MINOR_DIGITS).to_integral_value(ROUND_HALF_UP))
+
+
+def to_minor_many(amounts):
+    """to_minor() over a sequence, in one comprehension rather than a call per amount."""
+    return [
+        int((amount if isinstance(amount, Decimal) else Decimal(str(amount))).scaleb(MINOR_DIGITS)
+            .to_integral_value(ROUND_HALF_UP))
+        for amount in amounts
+    ]
+
+
+def from_minor(minor):
+    """Convert integer paise back to a 2-place Decimal amount."""
+    return Decimal(minor).scaleb(-MINOR_DIGITS)
+
+
+def to_float(minor):
+    # int / int is correctly rounded, so this matches float(from_minor(minor))
+    return minor / MINOR_PER_UNIT
+
+
+def split_equal(total, count):
+    """Split `total` paise into `count` shares; the first shares take the leftover paise."""
+    if count <= 0:
+        raise ValueError("Cannot split between zero people")
+    share, leftover = divmod(total, count)
+    # One list, patched in place: concatenating two lists copies every share again
+    shares = [share] * count
+    if leftover:
+        shares[:leftover] = [share + 1] * leftover
+    return shares
+
+
+def allocate(total, weights):
+    """
+    Split `total` paise in proportion to non-negative integer `weights`.
+
+    Largest remainder method: everyone gets the floor of their exact share,
+    then the leftover paise go one each to the largest remainders (earlier
+    entries win ties). The shares always sum to `total`. Large allocations
+    run vectorized with NumPy when it is installed; both paths give the same
+    shares.
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        raise ValueError("Weights must add up to more than zero")
+    if any(weight < 0 for weight in weights):
+        raise ValueError("Weights cannot be negative")
+
+    if (
+        numpy is not None
+        and len(weights) >= NUMPY_MIN_SHARES
+        and 0 <= total
+        and max(total * max(weights), weight_sum) < NUMPY_MAX_PRODUCT
+    ):
+        return _allocate_numpy(total, weights, weight_sum)
+    return _allocate_python(total, weights, weight_sum)
+
+
+def _allocate_python(total, weights, weight_sum):
+    shares = [total * weight // weight_sum for weight in weights]
+    leftover = total - sum(shares)
+    if leftover:
+        remainders = [total * weight - share * weight_sum for weight, share in zip(weights, shares)]
+        # sorted() is stable with reverse=True, so ties keep input order
+        for index in sorted(range(len(remainders)), key=remainders.__getitem__, reverse=True)[:leftover]:
+            shares[index] += 1
+    return shares
+
+
+def _allocate_numpy(total, weights, weight_sum):
+    scaled = numpy.asarray(weights, dtype=numpy.int64) * total
+    shares, remainders = numpy.divmod(scaled, weight_sum)
+    leftover = total - int(shares.sum())
+    if leftover:
+        # A stable sort on the negated remainders keeps input order among ties
+        shares[numpy.argsort(-remainders, kind='stable')[:leftover]] += 1
+    return shares.tolist()
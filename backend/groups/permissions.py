@@ -0,0 +1,46 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from django.shortcuts import get_object_or_404
+from rest_framework.permissions import BasePermission
+
+from .models import Group, GroupMember
+
+
+class GroupMembership:
+    """A group and its member set, loaded with one query."""
+
+    def __init__(self, group):
+        self.group = group
+        rows = GroupMember.objects.filter(group=group).order_by().values_list('user__username', 'user_id')
+        # username -> user id, the shape CreateExpenseSerializer takes as context['members']
+        self.by_username = dict(rows)
+        self.user_ids = set(self.by_username.values())
+
+    def __contains__(self, user):
+        return getattr(user, 'id', user) in self.user_ids
+
+
+def get_membership(request, group_id):
+    """Return the GroupMembership for `group_id`, loading it at most once per request."""
+    cache = getattr(request, '_group_memberships', None)
+    if cache is None:
+        cache = request._group_memberships = {}
+    group_id = int(group_id)
+    if group_id not in cache:
+        cache[group_id] = GroupMembership(get_object_or_404(Group, id=group_id))
+    return cache[group_id]
+
+
+class IsGroupMember(BasePermission):
+    """Allow access only to members of the group named by the `group_id` URL kwarg."""
+    message = {"error": "You are not a member of this group"}
+
+    def has_permission(self, request, view):
+        return request.user in get_membership(request, view.kwargs['group_id'])
@@ -0,0 +1,94 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Renderers for group endpoints.
+
+FastJSONRenderer serves the read-heavy JSON endpoints. Their views hand it
+plain rows holding Decimal and datetime values rather than serializer output,
+and it writes those the way DRF's DecimalField and DateTimeField would:
+amounts as strings ("10.00"), UTC timestamps ending in "Z". orjson does the
+encoding when it is installed; otherwise the stdlib encoder does.
+"""
+
+import json
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: FastJSONRenderer falls back to the stdlib encoder
+    orjson = None
+
+
+class RowEncoder(JSONEncoder):
+    """DRF's encoder, but Decimal amounts stay exact strings as DecimalField renders them."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+def _orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    # Lazy translations, UUIDs, querysets...: whatever DRF's encoder knows
+    return RowEncoder().default(obj)
+
+
+def dumps_stdlib(data):
+    return json.dumps(data, cls=RowEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode()
+
+
+def dumps_orjson(data):
+    # OPT_UTC_Z writes "+00:00" as "Z", like DateTimeField
+    return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+dumps = dumps_orjson if orjson is not None else dumps_stdlib
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Content negotiation for streamed exports (?format=... or Accept).
+
+    The export itself is a StreamingHttpResponse and never goes through
+    render(); only error payloads such as a 403 do, and those are sent as JSON.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data).encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """application/json through `dumps`; indented output (?indent=, browsable API) keeps DRF's path."""
+    encoder_class = RowEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class CSVRenderer(StreamRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(StreamRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
@@ -0,0 +1,75 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Read path for expense lists: plain dict rows instead of serializer instances.
+
+expense_rows() produces the payload GroupExpenseSerializer would, from one
+values() query for the expenses and one for their splits. Amounts stay Decimal
+and timestamps stay datetime; FastJSONRenderer writes them exactly as the
+serializer fields would ("10.00", "...Z").
+"""
+
+from django.db.models import F
+
+from .models import ExpenseSplit
+from .serializers import GroupExpenseSerializer
+
+EXPENSE_FIELDS = tuple(GroupExpenseSerializer.Meta.fields)
+
+# Payload field -> values() expression; the rest are columns (values('paid_by') gives the id)
+EXPRESSIONS = {
+    'paid_by_username': F('paid_by__username'),
+}
+
+# The cursor needs these whether or not the client asked for them
+CURSOR_FIELDS = ('id', 'created_at')
+
+
+def project_expenses(queryset, fields=EXPENSE_FIELDS):
+    """values() over `queryset` with the columns behind `fields` (splits excepted)."""
+    columns = {name for name in fields if name != 'splits'} | set(CURSOR_FIELDS)
+    return queryset.values(
+        *(name for name in columns if name not in EXPRESSIONS),
+        **{name: EXPRESSIONS[name] for name in columns if name in EXPRESSIONS},
+    )
+
+
+def split_rows(expense_ids):
+    """{expense id: [split payloads]} for the given expenses, by user id like the prefetch."""
+    splits = {}
+    rows = (
+        ExpenseSplit.objects.filter(expense_id__in=expense_ids)
+        .order_by('expense_id', 'user_id')
+        .values_list('expense_id', 'user_id', 'user__username', 'amount')
+    )
+    for expense_id, user_id, username, amount in rows:
+        splits.setdefault(expense_id, []).append({'user': user_id, 'username': username, 'amount': amount})
+    return splits
+
+
+def expense_rows(rows, fields=EXPENSE_FIELDS, splits=None):
+    """
+    Shape projected rows like GroupExpenseSerializer(many=True).data, keeping field order.
+
+    The splits are loaded here unless `splits` is a split_rows() result already.
+    """
+    fields = [name for name in EXPENSE_FIELDS if name in fields]
+    if 'splits' not in fields:
+        splits = None
+    elif splits is None:
+        splits = split_rows([row['id'] for row in rows])
+    columns = [name for name in fields if name != 'splits']
+    results = []
+    for row in rows:
+        item = {name: row[name] for name in columns}
+        if splits is not None:
+            item['splits'] = splits.get(row['id'], [])
+        results.append(item)
+    return results
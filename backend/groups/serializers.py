@@ -9,10 +9,19 @@
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import transaction
-from .models import Group, GroupMember, GroupExpense, ExpenseSplit
+from .models import Group, GroupMember, GroupExpense, ExpenseSplit, GroupBalance
+from . import ledger, money
 from decimal import Decimal
 
+from users.placeholders import ensure_users
+
+
+def load_members(group):
+    """Map username -> user id for every member of `group`."""
+    return dict(GroupMember.objects.filter(group=group).values_list('user__username', 'user_id'))
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -52,26 +61,22 @@ class GroupSerializer(serializers.ModelSerializer):
 
 
 class AddMemberSerializer(serializers.Serializer):
-    username = serializers.CharField(max_length=150)
-    
-    def validate_username(self, value):
-        if not User.objects.filter(username=value).exists():
-            # Create user if doesn't exist (for demo purposes)
-            User.objects.create_user(
-                username=value,
-                email=f"{value.lower()}@example.com",
-                password="defaultpassword123"
-            )
-        return value
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
 
     def create(self, validated_data):
         group = self.context['group']
         username = validated_data['username']
-        user = User.objects.get(username=username)
         
-        member, created = GroupMember.objects.get_or_create(
+        # The request's membership cache already knows the current members
+        membership = self.context.get('membership')
+        if membership is not None and username in membership.by_username:
+            raise serializers.ValidationError("User is already a member of this group")
+        
+        # Unknown usernames become placeholder accounts, claimed when they register
+        user_ids, _ = ensure_users([username])
+        member, created = GroupMember.objects.select_related('user').get_or_create(
             group=group,
-            user=user,
+            user_id=user_ids[username],
             defaults={'is_admin': False}
         )
         
@@ -81,6 +86,48 @@ class AddMemberSerializer(serializers.Serializer):
         return member
 
 
+class AddMembersSerializer(serializers.Serializer):
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()]),
+        allow_empty=False,
+        max_length=1000
+    )
+
+    def create(self, validated_data):
+        """
+        Add every username in one transaction: one lookup, one placeholder
+        insert, one GroupMember insert and one balance insert.
+        """
+        group = self.context['group']
+        current = self.context['membership'].by_username
+        usernames = list(dict.fromkeys(validated_data['usernames']))
+        wanted = [username for username in usernames if username not in current]
+        result = {
+            'added': [],
+            'already_members': [username for username in usernames if username in current]
+        }
+        if not wanted:
+            return result
+
+        with transaction.atomic():
+            user_ids, placeholders = ensure_users(wanted)
+            GroupMember.objects.bulk_create(
+                [GroupMember(group=group, user_id=user_ids[username]) for username in wanted]
+            )
+            # bulk_create skips the post_save handler that opens balances
+            GroupBalance.objects.bulk_create(
+                [GroupBalance(group=group, user_id=user_ids[username]) for username in wanted],
+                ignore_conflicts=True
+            )
+            Group.objects.filter(pk=group.pk).bump_version()
+        
+        result['added'] = [
+            {'id': user_ids[username], 'username': username, 'placeholder': username in placeholders}
+            for username in wanted
+        ]
+        return result
+
+
 class ExpenseSplitSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     
@@ -97,73 +144,126 @@ class GroupExpenseSerializer(serializers.ModelSerializer):
         model = GroupExpense
         fields = ['id', 'description', 'amount', 'paid_by', 'paid_by_username', 
                  'split_type', 'created_at', 'updated_at', 'splits']
+    
+    def __init__(self, *args, **kwargs):
+        # Optional sparse fieldset: only keep the named fields
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
 class CreateExpenseSerializer(serializers.Serializer):
     description = serializers.CharField(max_length=200)
-    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0.01)
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
     paid_by_username = serializers.CharField()
-    split_type = serializers.ChoiceField(choices=['equal', 'custom'], default='equal')
+    split_type = serializers.ChoiceField(choices=[choice for choice, _ in GroupExpense.SPLIT_CHOICES], default='equal')
     custom_splits = serializers.DictField(child=serializers.DecimalField(max_digits=10, decimal_places=2), required=False)
     
+    def get_members(self):
+        """
+        Map username -> user id for the group's members, loaded once per serializer.
+
+        Batch callers pass a preloaded map as context['members'] to share it.
+        """
+        if not hasattr(self, '_members'):
+            self._members = self.context.get('members')
+            if self._members is None:
+                self._members = load_members(self.context['group'])
+        return self._members
+    
     def validate_paid_by_username(self, value):
-        group = self.context['group']
-        if not GroupMember.objects.filter(group=group, user__username=value).exists():
+        if value not in self.get_members():
             raise serializers.ValidationError("User must be a member of the group")
         return value
     
     def validate(self, data):
-        if data['split_type'] == 'custom':
-            if not data.get('custom_splits'):
-                raise serializers.ValidationError("Custom splits are required for custom split type")
-            
-            total_custom = sum(data['custom_splits'].values())
-            if abs(total_custom - data['amount']) > Decimal('0.01'):
+        split_type = data['split_type']
+        if split_type == 'equal':
+            return data
+        
+        # custom_splits holds amounts (custom), share counts (shares),
+        # percentages (percent) or +/- amounts on top of an equal split (adjustment)
+        values = data.get('custom_splits')
+        if not values:
+            raise serializers.ValidationError(f"Custom splits are required for {split_type} split type")
+        
+        # Validate all users in custom splits are members
+        member_usernames = self.get_members()
+        for username in values.keys():
+            if username not in member_usernames:
+                raise serializers.ValidationError(f"User {username} is not a member of the group")
+        
+        if split_type == 'custom':
+            # Exact to the paisa, so the splits always add back up to the expense
+            total_custom = sum(money.to_minor(amount) for amount in values.values())
+            if total_custom != money.to_minor(data['amount']):
                 raise serializers.ValidationError("Custom split amounts must add up to total amount")
-                
-            # Validate all users in custom splits are members
-            group = self.context['group']
-            member_usernames = set(
-                GroupMember.objects.filter(group=group).values_list('user__username', flat=True)
-            )
-            for username in data['custom_splits'].keys():
-                if username not in member_usernames:
-                    raise serializers.ValidationError(f"User {username} is not a member of the group")
+        elif split_type in ('shares', 'percent'):
+            if any(value < 0 for value in values.values()):
+                raise serializers.ValidationError("Shares and percentages cannot be negative")
+            if split_type == 'percent' and sum(values.values()) != 100:
+                raise serializers.ValidationError("Percentages must add up to 100")
+            if not any(values.values()):
+                raise serializers.ValidationError("At least one member must have a share")
+        elif min(self.split_minor(data).values()) < 0:
+            raise serializers.ValidationError("Adjustments cannot exceed the expense amount")
         
         return data
     
+    def split_minor(self, validated_data):
+        """Split amounts in paise by user id; they always add up to the expense amount."""
+        members = self.get_members()
+        split_type = validated_data['split_type']
+        total = money.to_minor(validated_data['amount'])
+        values = validated_data.get('custom_splits') or {}
+        
+        if split_type == 'custom':
+            return {members[username]: money.to_minor(amount) for username, amount in values.items()}
+        
+        if split_type in ('shares', 'percent'):
+            # Shares and percentages both carry two decimals, so paise-style
+            # integer weights keep their ratios exact
+            user_ids, weights = zip(*sorted(
+                zip([members[username] for username in values], money.to_minor_many(values.values()))
+            ))
+            shares = money.allocate(total, weights)
+            return {user_id: share for user_id, share in zip(user_ids, shares) if share}
+        
+        # equal / adjustment: leftover paise go to the lowest user ids, one each
+        user_ids = sorted(members.values())
+        adjustments = {members[username]: money.to_minor(value) for username, value in values.items()}
+        shares = money.split_equal(total - sum(adjustments.values()), len(user_ids))
+        amounts = ((user_id, share + adjustments.get(user_id, 0)) for user_id, share in zip(user_ids, shares))
+        return {user_id: amount for user_id, amount in amounts if amount}
+    
+    def split_amounts(self, validated_data):
+        """Split amounts by user id as 2-place Decimals, the way ExpenseSplit stores them."""
+        return {
+            user_id: money.from_minor(share)
+            for user_id, share in self.split_minor(validated_data).items()
+        }
+    
     def create(self, validated_data):
         group = self.context['group']
-        paid_by_user = User.objects.get(username=validated_data['paid_by_username'])
+        members = self.get_members()
+        member_ids = set(members.values())
+        amounts = self.split_amounts(validated_data)
         
         with transaction.atomic():
-            expense = GroupExpense.objects.create(
+            expense = GroupExpense(
                 group=group,
                 description=validated_data['description'],
                 amount=validated_data['amount'],
-                paid_by=paid_by_user,
+                paid_by_id=members[validated_data['paid_by_username']],
                 split_type=validated_data['split_type']
             )
+            expense.save(member_ids=member_ids)
             
-            # Create splits
-            if validated_data['split_type'] == 'equal':
-                members = GroupMember.objects.filter(group=group)
-                split_amount = validated_data['amount'] / members.count()
-                
-                for member in members:
-                    ExpenseSplit.objects.create(
-                        expense=expense,
-                        user=member.user,
-                        amount=split_amount
-                    )
-            else:  # custom
-                for username, amount in validated_data['custom_splits'].items():
-                    user = User.objects.get(username=username)
-                    ExpenseSplit.objects.create(
-                        expense=expense,
-                        user=user,
-                        amount=amount
-                    )
+            # One INSERT for every split; bulk_create skips signals, so post them to the ledger here
+            splits = ExpenseSplit.bulk_create_for_expense(expense, amounts, member_ids)
+            ledger.record_splits(group.id, splits)
             
             return expense
 
@@ -0,0 +1,128 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Debt simplification: turn net balances into a short list of transfers.
+
+Balances are integer paise (groups.money) so every step is exact. Large groups
+use a greedy heap matcher (largest debtor pays largest creditor), which needs
+at most n - 1 transfers and runs in O(n log n). Small groups can use an exact
+solver that finds the true minimum: n - (the largest number of disjoint
+zero-sum subsets), found with a bitmask DP under a time budget.
+
+Nothing here touches the ORM, so benchmarks.bench_settlements runs without
+Django; settling a stored group's ledger is groups.tasks.settle_group.
+"""
+
+import heapq
+import time
+
+from .money import from_minor, to_minor
+
+EXACT_MAX_PARTIES = 12
+EXACT_TIME_BUDGET = 0.05  # seconds
+
+
+def _greedy(parties):
+    """Match the largest debtor with the largest creditor until everyone is settled."""
+    creditors = [(-paise, key) for key, paise in parties if paise > 0]
+    debtors = [(paise, key) for key, paise in parties if paise < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = creditors[0]
+        debt, debtor = debtors[0]
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+
+        # Whoever is left with a remainder stays on their heap
+        if -credit > amount:
+            heapq.heapreplace(creditors, (credit + amount, creditor))
+        else:
+            heapq.heappop(creditors)
+        if -debt > amount:
+            heapq.heapreplace(debtors, (debt + amount, debtor))
+        else:
+            heapq.heappop(debtors)
+    return transfers
+
+
+def _zero_sum_groups(parties, deadline):
+    """Split parties into the largest number of zero-sum groups, or None if out of time."""
+    values = [paise for _, paise in parties]
+    n = len(values)
+    size = 1 << n
+
+    sums = [0] * size
+    best = [0] * size
+    parent = [0] * size
+    for mask in range(1, size):
+        if not mask & 0xFF and time.perf_counter() > deadline:
+            return None
+
+        low = mask & -mask
+        sums[mask] = sums[mask ^ low] + values[low.bit_length() - 1]
+
+        top, rest, m = -1, 0, mask
+        while m:
+            bit = m & -m
+            if best[mask ^ bit] > top:
+                top, rest = best[mask ^ bit], mask ^ bit
+            m ^= bit
+        best[mask] = top + (sums[mask] == 0)
+        parent[mask] = rest
+
+    # Walk the chosen path back, then replay it to cut at every zero prefix sum.
+    order, mask = [], size - 1
+    while mask:
+        order.append((mask ^ parent[mask]).bit_length() - 1)
+        mask = parent[mask]
+
+    groups, current, mask = [], [], 0
+    for index in reversed(order):
+        mask |= 1 << index
+        current.append(parties[index])
+        if sums[mask] == 0:
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+    return groups
+
+
+def settle_minor(balances, exact=True, exact_max_parties=EXACT_MAX_PARTIES, time_budget=EXACT_TIME_BUDGET):
+    """
+    Compute transfers that settle `balances` ({key: net paise}, positive = is owed).
+
+    Returns (transfers, method) where transfers is a list of
+    (from_key, to_key, paise) and method is 'exact' or 'greedy'.
+    """
+    parties = sorted(balances.items(), key=lambda party: party[0])
+    parties = [party for party in parties if party[1]]
+
+    groups = None
+    if exact and 2 < len(parties) <= exact_max_parties and sum(p for _, p in parties) == 0:
+        groups = _zero_sum_groups(parties, time.perf_counter() + time_budget)
+
+    if groups is None:
+        method, transfers = 'greedy', _greedy(parties)
+    else:
+        method, transfers = 'exact', []
+        for group in groups:
+            transfers.extend(_greedy(group))
+    return transfers, method
+
+
+def settle(balances, **options):
+    """settle_minor() for {key: net amount} balances; transfer amounts are Decimals."""
+    transfers, method = settle_minor({key: to_minor(amount) for key, amount in balances.items()}, **options)
+    return [(debtor, creditor, from_minor(paise)) for debtor, creditor, paise in transfers], method
+
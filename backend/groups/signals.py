@@ -0,0 +1,128 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Keep the GroupBalance ledger and Group.version in step with row-level writes.
+
+bulk_create / queryset.update() bypass these handlers, so bulk write paths
+must call `groups.ledger` and bump the group version themselves.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import ledger
+from .money import to_minor
+from .models import Group, GroupMember, GroupExpense, ExpenseSplit, GroupBalance
+
+
+def _group_is_going(origin):
+    # The balance rows cascade with the group, so there is nothing to adjust.
+    return isinstance(origin, Group)
+
+
+def _touch(group_id):
+    Group.objects.filter(pk=group_id).bump_version()
+
+
+@receiver(post_save, sender=GroupMember)
+def open_member_balance(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        GroupBalance.objects.bulk_create(
+            [GroupBalance(group_id=instance.group_id, user_id=instance.user_id)],
+            ignore_conflicts=True,
+        )
+    _touch(instance.group_id)
+
+
+@receiver(post_delete, sender=GroupMember)
+def close_member_balance(sender, instance, origin=None, **kwargs):
+    if not _group_is_going(origin):
+        # A former member's expenses and splits still count, so only an unused row goes;
+        # re-adding them picks the kept row up again (open_member_balance ignores the conflict)
+        GroupBalance.objects.filter(
+            group_id=instance.group_id, user_id=instance.user_id, paid_minor=0, owed_minor=0, expense_count=0
+        ).delete()
+        _touch(instance.group_id)
+
+
+@receiver(pre_save, sender=GroupExpense)
+def remember_expense(sender, instance, raw=False, **kwargs):
+    instance._ledger_previous = None
+    if instance.pk and not raw:
+        instance._ledger_previous = (
+            GroupExpense.objects.filter(pk=instance.pk).values('group_id', 'paid_by_id', 'amount').first()
+        )
+
+
+@receiver(post_save, sender=GroupExpense)
+def post_expense(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_ledger_previous', None)
+    if previous:
+        deltas = ledger.new_deltas()
+        deltas[previous['paid_by_id']][0] -= to_minor(previous['amount'])
+        deltas[previous['paid_by_id']][2] -= 1
+        ledger.apply_deltas(previous['group_id'], deltas)
+        if previous['group_id'] != instance.group_id:
+            _touch(previous['group_id'])
+    ledger.apply_deltas(instance.group_id, ledger.expense_deltas(instance, []))
+    _touch(instance.group_id)
+
+
+@receiver(post_delete, sender=GroupExpense)
+def unpost_expense(sender, instance, origin=None, **kwargs):
+    if not _group_is_going(origin):
+        ledger.reverse_expense(instance, [])
+        _touch(instance.group_id)
+
+
+@receiver(pre_save, sender=ExpenseSplit)
+def remember_split(sender, instance, raw=False, **kwargs):
+    instance._ledger_previous = None
+    if instance.pk and not raw:
+        instance._ledger_previous = (
+            ExpenseSplit.objects.filter(pk=instance.pk)
+            .values('expense__group_id', 'user_id', 'amount').first()
+        )
+
+
+@receiver(post_save, sender=ExpenseSplit)
+def post_split(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_ledger_previous', None)
+    if previous:
+        deltas = ledger.new_deltas()
+        deltas[previous['user_id']][1] -= to_minor(previous['amount'])
+        ledger.apply_deltas(previous['expense__group_id'], deltas)
+    deltas = ledger.new_deltas()
+    deltas[instance.user_id][1] += to_minor(instance.amount)
+    ledger.apply_deltas(instance.expense.group_id, deltas)
+    _touch(instance.expense.group_id)
+
+
+@receiver(post_delete, sender=ExpenseSplit)
+def unpost_split(sender, instance, origin=None, **kwargs):
+    if _group_is_going(origin):
+        return
+    if isinstance(origin, GroupExpense):
+        group_id = origin.group_id
+    else:
+        group_id = GroupExpense.objects.filter(pk=instance.expense_id).values_list('group_id', flat=True).first()
+    if group_id is not None:
+        deltas = ledger.new_deltas()
+        deltas[instance.user_id][1] -= to_minor(instance.amount)
+        ledger.apply_deltas(group_id, deltas)
+        # Cascading from an expense delete, which bumps the version itself
+        if not isinstance(origin, GroupExpense):
+            _touch(group_id)
@@ -0,0 +1,134 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Group summary: build it from per-member balances and cache it per group version.
+
+Balances come from the GroupBalance ledger or, with SUMMARY_BALANCE_SOURCE set
+to "aggregate", from one aggregate query over the expense tables; either way
+the ten recent expenses are projected rows (groups.rows), not model instances.
+
+Group.version is bumped (GroupQuerySet.bump_version) by every write that changes
+the summary, so a cached summary is keyed by version and never needs to be
+invalidated explicitly; the same tag doubles as the response ETag.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from . import ledger
+from .money import to_float
+from .models import GroupExpense, GroupBalance
+from .rows import expense_rows, project_expenses
+
+CACHE_ALIAS = 'summary'
+
+
+def version_tag(group):
+    # created_at keeps tags unique if a group id is ever reused
+    return f"{group.id}.{int(group.created_at.timestamp() * 1000000)}.{group.version}"
+
+
+def summary_etag(group):
+    return f'"summary-{version_tag(group)}"'
+
+
+def balance_rows(group, source=None):
+    """
+    Per-member totals as dict rows (user_id, username, email, paid_minor, owed_minor, expense_count).
+
+    `source` is 'ledger' (read the GroupBalance rows) or 'aggregate' (sum
+    the expense tables in SQL); it defaults to settings.SUMMARY_BALANCE_SOURCE.
+    """
+    source = source or settings.SUMMARY_BALANCE_SOURCE
+    if source == 'aggregate':
+        return ledger.aggregate_balances(group.id)
+    return (
+        GroupBalance.objects.filter(group=group)
+        .order_by('id')
+        .values(
+            'user_id', 'paid_minor', 'owed_minor', 'expense_count',
+            username=F('user__username'), email=F('user__email'),
+        )
+    )
+
+
+def user_balances(user):
+    """
+    `user`'s paid/owed/net in every group they belong to, plus the totals.
+
+    One read of the user's GroupBalance rows (covered by groupbalance_user_cover_idx),
+    so the cost grows with the number of groups, never with their history.
+    """
+    rows = (
+        GroupBalance.objects.filter(user=user)
+        .order_by('group_id')
+        .values_list('group_id', 'group__name', 'paid_minor', 'owed_minor')
+    )
+    groups = []
+    total_paid = total_owed = 0
+    for group_id, name, paid, owed in rows:
+        groups.append({
+            'group_id': group_id,
+            'group_name': name,
+            'paid': to_float(paid),
+            'owes': to_float(owed),
+            'net_balance': to_float(paid - owed)
+        })
+        total_paid += paid
+        total_owed += owed
+    
+    return {
+        'paid': to_float(total_paid),
+        'owes': to_float(total_owed),
+        'net_balance': to_float(total_paid - total_owed),
+        'groups': groups
+    }
+
+
+def build_group_summary(group, source=None):
+    member_balances = []
+    total_paid = 0
+    total_expenses_count = 0
+    
+    # All sums are in integer paise; net balance positive means they should receive
+    for row in balance_rows(group, source):
+        paid, owed = row['paid_minor'], row['owed_minor']
+        member_balances.append({
+            'id': row['user_id'],
+            'username': row['username'],
+            'email': row['email'],
+            'paid': to_float(paid),
+            'owes': to_float(owed),
+            'net_balance': to_float(paid - owed)
+        })
+        total_paid += paid
+        total_expenses_count += row['expense_count']
+    
+    # Recent expenses (last 10), shaped like GroupExpenseSerializer output
+    recent_expenses = project_expenses(GroupExpense.objects.filter(group=group).order_by('-created_at', '-id'))[:10]
+    
+    return {
+        'member_balances': member_balances,
+        'total_amount': to_float(total_paid),
+        'total_expenses_count': total_expenses_count,
+        'recent_expenses': expense_rows(list(recent_expenses))
+    }
+
+
+def get_group_summary(group):
+    """Return the summary for the group's current version, building it on a cache miss."""
+    cache = caches[CACHE_ALIAS]
+    key = f"group-summary:{version_tag(group)}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_group_summary(group)
+        cache.set(key, summary)
+    return summary
@@ -0,0 +1,88 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Background jobs for groups (see jobs.queue); run by `manage.py run_workers`.
+
+Expense writes call schedule_recompute(), which coalesces per group: however
+many writes land before a worker gets to it, the group is recomputed once.
+"""
+
+from django.conf import settings
+
+from expenses.snapshots import refresh_snapshot
+from jobs.queue import enqueue, task
+
+from . import ledger
+from .models import Group, GroupBalance
+from .money import to_float
+from .settlements import settle_minor
+from .summary import build_group_summary
+
+RECOMPUTE = 'groups.recompute'
+
+
+def schedule_recompute(group_id):
+    return enqueue(RECOMPUTE, {'group_id': group_id}, key=f'{RECOMPUTE}:{group_id}')
+
+
+@task(RECOMPUTE)
+def recompute_group(group_id):
+    """
+    Store the summary snapshot for the group's current version.
+
+    The "summary" cache is warmed too when web processes can read it; the
+    default locmem backend lives in this worker only, so it is left alone.
+    """
+    group = Group.objects.filter(pk=group_id).first()
+    if group is None:
+        return None
+    if settings.SUMMARY_CACHE_BACKEND == 'locmem':
+        refresh_snapshot(group, build_group_summary(group))
+    else:
+        refresh_snapshot(group)
+    return {'version': group.version}
+
+
+@task('groups.rebuild_ledger')
+def rebuild_ledger(group_id):
+    """Repair the group's balance ledger if it has drifted from the expense tables."""
+    drift = ledger.check(group_id)
+    if drift:
+        ledger.rebuild(group_id)
+    return {'drifted_members': len(drift)}
+
+
+def settle_group(group_id, exact=True):
+    """Settle a group's ledger balances; returns the API payload for its members."""
+    balances = GroupBalance.objects.filter(group_id=group_id).select_related('user')
+    users = {balance.user_id: balance.user for balance in balances}
+    transfers, method = settle_minor(
+        {balance.user_id: balance.net_minor for balance in balances}, exact=exact
+    )
+
+    settlements = []
+    for debtor_id, creditor_id, amount in transfers:
+        settlements.append({
+            'from_user': debtor_id,
+            'from_username': users[debtor_id].username,
+            'to_user': creditor_id,
+            'to_username': users[creditor_id].username,
+            'amount': to_float(amount)
+        })
+    return {
+        'settlements': settlements,
+        'transactions_count': len(settlements),
+        'method': method
+    }
+
+
+@task('groups.settlements')
+def settlements(group_id, exact=True):
+    return settle_group(group_id, exact=exact)
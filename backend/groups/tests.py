@@ -11,6 +11,7 @@ from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
+from decimal import Decimal
 from .models import Group, GroupMember, GroupExpense, ExpenseSplit
 
 class GroupAppTests(TestCase):
@@ -93,3 +94,1213 @@ class GroupAppTests(TestCase):
         })
         self.assertAlmostEqual(float(serializer.data['total_amount']), 130.0)
         self.assertEqual(serializer.data['total_expenses_count'], 2)
+
+
+class GroupLedgerTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.user3 = User.objects.create_user(username='user3', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        for user in (self.user1, self.user2, self.user3):
+            GroupMember.objects.create(group=self.group, user=user)
+
+    def add_expense(self, **data):
+        from .serializers import CreateExpenseSerializer
+        serializer = CreateExpenseSerializer(data=data, context={'group': self.group})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save()
+
+    def balance(self, user):
+        from .models import GroupBalance
+        return GroupBalance.objects.get(group=self.group, user=user)
+
+    def test_members_get_empty_balance_rows(self):
+        balance = self.balance(self.user3)
+        self.assertEqual(balance.paid_minor, 0)
+        self.assertEqual(balance.expense_count, 0)
+
+    def test_expense_create_edit_and_delete_update_ledger(self):
+        expense = self.add_expense(
+            description='Taxi', amount='30.00', paid_by_username='user2',
+            split_type='custom', custom_splits={'user1': '10.00', 'user2': '20.00'},
+        )
+        self.assertEqual(self.balance(self.user2).paid_minor, 3000)
+        self.assertEqual(self.balance(self.user2).net_minor, 1000)
+        self.assertEqual(self.balance(self.user1).net_minor, -1000)
+        self.assertEqual(self.balance(self.user2).expense_count, 1)
+
+        expense.paid_by = self.user3
+        expense.save()
+        split = expense.splits.get(user=self.user1)
+        split.amount = Decimal('15.00')
+        split.save()
+        self.assertEqual(self.balance(self.user2).paid_minor, 0)
+        self.assertEqual(self.balance(self.user3).paid_minor, 3000)
+        self.assertEqual(self.balance(self.user1).owed_minor, 1500)
+
+        expense.delete()
+        for user in (self.user1, self.user2, self.user3):
+            balance = self.balance(user)
+            self.assertEqual(
+                (balance.paid_minor, balance.owed_minor, balance.net_minor, balance.expense_count), (0, 0, 0, 0)
+            )
+
+    def test_summary_reads_ledger(self):
+        self.add_expense(description='Dinner', amount='90.00', paid_by_username='user1', split_type='equal')
+        self.add_expense(
+            description='Taxi', amount='30.00', paid_by_username='user2',
+            split_type='custom', custom_splits={'user1': '10.00', 'user2': '20.00'},
+        )
+
+        response = self.client.get(reverse('group-summary', args=[self.group.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_amount'], 120.0)
+        self.assertEqual(response.data['total_expenses_count'], 2)
+        self.assertEqual(len(response.data['recent_expenses']), 2)
+        balances = {row['username']: row for row in response.data['member_balances']}
+        self.assertEqual(balances['user1']['net_balance'], 50.0)
+        self.assertEqual(balances['user2']['net_balance'], -20.0)
+        self.assertEqual(balances['user3']['net_balance'], -30.0)
+
+    def test_aggregate_source_matches_ledger_in_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .summary import balance_rows, build_group_summary
+
+        self.add_expense(description='Dinner', amount='90.00', paid_by_username='user1', split_type='equal')
+        self.add_expense(
+            description='Taxi', amount='30.00', paid_by_username='user2',
+            split_type='custom', custom_splits={'user1': '10.00', 'user2': '20.00'},
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(balance_rows(self.group, source='aggregate'))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(rows, list(balance_rows(self.group, source='ledger')))
+        self.assertEqual(
+            build_group_summary(self.group, source='aggregate'),
+            build_group_summary(self.group, source='ledger'),
+        )
+
+    def test_removed_member_keeps_their_history(self):
+        from . import ledger
+        from .models import GroupBalance
+        from .summary import build_group_summary
+
+        self.add_expense(description='Hotel', amount='90.00', paid_by_username='user3', split_type='equal')
+        user4 = User.objects.create_user(username='user4', password='pass123')
+        GroupMember.objects.create(group=self.group, user=user4)
+        GroupMember.objects.filter(group=self.group, user__in=[self.user3, user4]).delete()
+
+        # user3's payment still counts; user4 never took part, so their row is gone
+        self.assertFalse(GroupBalance.objects.filter(group=self.group, user=user4).exists())
+        summary = self.client.get(reverse('group-summary', args=[self.group.id])).data
+        self.assertEqual(summary['total_amount'], 90.0)
+        self.assertEqual({row['username']: row['net_balance'] for row in summary['member_balances']},
+                         {'user1': -30.0, 'user2': -30.0, 'user3': 60.0})
+        groups = self.client.get(reverse('group-list-create')).data
+        self.assertEqual(Decimal(groups[0]['total_expenses']), Decimal('90.00'))
+        self.assertEqual(ledger.check(self.group.id), {})
+        self.assertEqual(build_group_summary(self.group, source='aggregate'),
+                         build_group_summary(self.group, source='ledger'))
+
+        GroupMember.objects.create(group=self.group, user=self.user3)
+        self.assertEqual(self.balance(self.user3).net_minor, 6000)
+        self.assertEqual(self.balance(self.user3).expense_count, 1)
+
+    def test_rebuild_ledger_command_repairs_drift(self):
+        from io import StringIO
+        from django.core.management import call_command, CommandError
+        from .models import GroupBalance
+
+        self.add_expense(description='Dinner', amount='90.00', paid_by_username='user1', split_type='equal')
+        call_command('rebuild_ledger', self.group.id, '--check', stdout=StringIO())
+
+        GroupBalance.objects.filter(group=self.group, user=self.user1).update(paid_minor=0, net_minor=0)
+        GroupBalance.objects.filter(group=self.group, user=self.user3).delete()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_ledger', self.group.id, '--check', stdout=StringIO())
+
+        call_command('rebuild_ledger', self.group.id, stdout=StringIO())
+        call_command('rebuild_ledger', self.group.id, '--check', stdout=StringIO())
+        self.assertEqual(self.balance(self.user1).net_minor, 6000)
+        self.assertEqual(self.balance(self.user3).owed_minor, 3000)
+
+
+class MoneyTests(TestCase):
+    def test_minor_unit_conversions(self):
+        from .money import from_minor, to_float, to_minor
+        self.assertEqual(to_minor(Decimal('12.34')), 1234)
+        self.assertEqual(to_minor('0.01'), 1)
+        self.assertEqual(to_minor(-5), -500)
+        self.assertEqual(from_minor(1234), Decimal('12.34'))
+        self.assertEqual(str(from_minor(500)), '5.00')
+        self.assertEqual(to_float(-1001), -10.01)
+
+    def test_allocations_always_add_up(self):
+        from .money import allocate, split_equal
+        self.assertEqual(split_equal(10000, 3), [3334, 3333, 3333])
+        self.assertEqual(allocate(10000, [1, 1, 1]), [3334, 3333, 3333])
+        self.assertEqual(allocate(100, [1, 2, 3, 4]), [10, 20, 30, 40])
+        self.assertEqual(allocate(101, [2, 1]), [67, 34])
+        for total, weights in [(1, [1, 1, 1]), (99999, [3, 7, 11, 13]), (7, [0, 5, 5]), (123457, [1] * 17)]:
+            self.assertEqual(sum(allocate(total, weights)), total)
+            equal = split_equal(total, len(weights))
+            self.assertEqual(sum(equal), total)
+            self.assertLessEqual(equal[0] - equal[-1], 1)
+        with self.assertRaises(ValueError):
+            allocate(100, [0, 0])
+
+    def test_equal_and_custom_splits_match_the_expense_exactly(self):
+        client = APIClient()
+        users = [User.objects.create_user(username=f'user{index}', password='pass123') for index in range(1, 4)]
+        client.force_authenticate(user=users[0])
+        group = Group.objects.create(name="Trip", created_by=users[0])
+        for user in users:
+            GroupMember.objects.create(group=group, user=user)
+        url = reverse('add-expense', args=[group.id])
+
+        response = client.post(url, {
+            'description': 'Dinner', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        amounts = sorted(Decimal(split['amount']) for split in response.data['expense']['splits'])
+        self.assertEqual(amounts, [Decimal('33.33'), Decimal('33.33'), Decimal('33.34')])
+
+        response = client.post(url, {
+            'description': 'Taxi', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'custom',
+            'custom_splits': {'user1': '33.33', 'user2': '33.33', 'user3': '33.33'}
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        summary = client.get(reverse('group-summary', args=[group.id])).data
+        self.assertEqual(summary['total_amount'], 100.0)
+        self.assertEqual(sum(row['net_balance'] for row in summary['member_balances']), 0)
+
+
+class SplitTypeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [User.objects.create_user(username=f'user{index}', password='pass123') for index in range(1, 4)]
+        self.client.force_authenticate(user=self.users[0])
+        self.group = Group.objects.create(name="Trip", created_by=self.users[0])
+        for user in self.users:
+            GroupMember.objects.create(group=self.group, user=user)
+
+    def add(self, split_type, amount, values):
+        return self.client.post(reverse('add-expense', args=[self.group.id]), {
+            'description': 'Hotel', 'amount': amount, 'paid_by_username': 'user1',
+            'split_type': split_type, 'custom_splits': values,
+        }, format='json')
+
+    def amounts(self, response):
+        self.assertEqual(response.status_code, 201, response.data)
+        return {split['username']: Decimal(split['amount']) for split in response.data['expense']['splits']}
+
+    def test_shares(self):
+        amounts = self.amounts(self.add('shares', '100.00', {'user1': '1', 'user2': '2', 'user3': '0'}))
+        self.assertEqual(amounts, {'user1': Decimal('33.33'), 'user2': Decimal('66.67')})
+
+    def test_percent(self):
+        amounts = self.amounts(self.add('percent', '99.99', {'user1': '50', 'user2': '30', 'user3': '20'}))
+        # Largest remainders first: 19.998 and 29.997 round up, 49.995 down
+        self.assertEqual(amounts, {'user1': Decimal('49.99'), 'user2': Decimal('30.00'), 'user3': Decimal('20.00')})
+        self.assertEqual(sum(amounts.values()), Decimal('99.99'))
+        self.assertEqual(self.add('percent', '10.00', {'user1': '50', 'user2': '40'}).status_code, 400)
+
+    def test_adjustment(self):
+        amounts = self.amounts(self.add('adjustment', '100.00', {'user1': '10.00', 'user3': '-5.00'}))
+        self.assertEqual(amounts, {'user1': Decimal('41.67'), 'user2': Decimal('31.67'), 'user3': Decimal('26.66')})
+        self.assertEqual(sum(amounts.values()), Decimal('100.00'))
+        self.assertEqual(self.add('adjustment', '10.00', {'user1': '20.00'}).status_code, 400)
+
+    def test_zero_shares_are_not_stored(self):
+        amounts = self.amounts(self.add('equal', '0.02', {}))
+        self.assertEqual(amounts, {'user1': Decimal('0.01'), 'user2': Decimal('0.01')})
+        amounts = self.amounts(self.add('adjustment', '20.00', {'user3': '-10.00'}))
+        self.assertEqual(amounts, {'user1': Decimal('10.00'), 'user2': Decimal('10.00')})
+        self.assertFalse(ExpenseSplit.objects.filter(amount=0).exists())
+
+    def test_weighted_types_reject_bad_values(self):
+        self.assertEqual(self.add('shares', '10.00', {'user1': '-1', 'user2': '2'}).status_code, 400)
+        self.assertEqual(self.add('shares', '10.00', {'user1': '0'}).status_code, 400)
+        self.assertEqual(self.add('shares', '10.00', {'nobody': '1'}).status_code, 400)
+        self.assertEqual(self.add('percent', '10.00', {}).status_code, 400)
+
+    def test_array_and_list_allocators_agree(self):
+        import random
+        from . import money
+        rng = random.Random(7)
+        for size in (64, 500, 5000):
+            weights = [rng.randint(0, 10000) for _ in range(size)]
+            total = rng.randint(1, 10 ** 9)
+            shares = money.allocate(total, weights)
+            self.assertEqual(sum(shares), total)
+            self.assertEqual(shares, money._allocate_python(total, weights, sum(weights)))
+
+
+class SettlementTests(TestCase):
+    def test_greedy_settles_every_balance(self):
+        from .settlements import settle
+        balances = {1: Decimal('40.00'), 2: Decimal('-25.50'), 3: Decimal('-14.50'), 4: Decimal('0.00')}
+        transfers, method = settle(balances, exact=False)
+        self.assertEqual(method, 'greedy')
+
+        remaining = dict(balances)
+        for debtor, creditor, amount in transfers:
+            remaining[debtor] += amount
+            remaining[creditor] -= amount
+        self.assertTrue(all(value == 0 for value in remaining.values()))
+        self.assertEqual(len(transfers), 2)
+
+    def test_exact_solver_beats_greedy(self):
+        from .settlements import settle
+        balances = {'a': Decimal('4'), 'b': Decimal('3'), 'c': Decimal('-2'), 'd': Decimal('-2'), 'e': Decimal('-3')}
+        greedy, _ = settle(balances, exact=False)
+        exact, method = settle(balances)
+        self.assertEqual(method, 'exact')
+        self.assertEqual(len(greedy), 4)
+        self.assertEqual(len(exact), 3)
+        self.assertIn(('e', 'b', Decimal('3.00')), exact)
+
+    def test_exact_solver_falls_back_when_out_of_time(self):
+        from .settlements import settle
+        balances = {key: Decimal(key) for key in range(1, 12)}
+        balances[12] = -sum(balances.values())
+        _, method = settle(balances, time_budget=0)
+        self.assertEqual(method, 'greedy')
+
+    def test_settlements_endpoint(self):
+        from .serializers import CreateExpenseSerializer
+        user1 = User.objects.create_user(username='user1', password='pass123')
+        user2 = User.objects.create_user(username='user2', password='pass123')
+        outsider = User.objects.create_user(username='outsider', password='pass123')
+        group = Group.objects.create(name="Flat", created_by=user1)
+        GroupMember.objects.create(group=group, user=user1)
+        GroupMember.objects.create(group=group, user=user2)
+
+        serializer = CreateExpenseSerializer(data={
+            'description': 'Rent', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'equal'
+        }, context={'group': group})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        client = APIClient()
+        url = reverse('group-settlements', args=[group.id])
+        client.force_authenticate(user=outsider)
+        self.assertEqual(client.get(url).status_code, 403)
+
+        client.force_authenticate(user=user2)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['transactions_count'], 1)
+        self.assertEqual(response.data['settlements'][0]['from_username'], 'user2')
+        self.assertEqual(response.data['settlements'][0]['to_username'], 'user1')
+        self.assertEqual(response.data['settlements'][0]['amount'], 50.0)
+
+
+class GroupListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='owner', password='pass123')
+        self.client.force_authenticate(user=self.user)
+
+    def make_groups(self, count, members_per_group):
+        from .serializers import CreateExpenseSerializer
+        for index in range(count):
+            group = Group.objects.create(name=f"Group {index}", created_by=self.user)
+            GroupMember.objects.create(group=group, user=self.user, is_admin=True)
+            for member in range(members_per_group):
+                user = User.objects.create(username=f"g{group.id}-m{member}")
+                GroupMember.objects.create(group=group, user=user)
+            serializer = CreateExpenseSerializer(data={
+                'description': 'Snacks', 'amount': '10.00', 'paid_by_username': 'owner', 'split_type': 'equal'
+            }, context={'group': group})
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            serializer.save()
+
+    def list_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('group-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def test_query_count_is_flat(self):
+        self.make_groups(1, 1)
+        small_count, _ = self.list_queries()
+
+        self.make_groups(6, 4)
+        large_count, data = self.list_queries()
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(data), 7)
+        biggest = next(group for group in data if group['member_count'] == 5)
+        self.assertEqual(len(biggest['members']), 5)
+        self.assertEqual(float(biggest['total_expenses']), 10.0)
+        self.assertEqual(biggest['created_by']['username'], 'owner')
+
+
+class BulkSplitTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(username='owner', password='pass123')
+        self.client.force_authenticate(user=self.owner)
+
+    def make_group(self, size):
+        group = Group.objects.create(name=f"Group of {size}", created_by=self.owner)
+        GroupMember.objects.create(group=group, user=self.owner, is_admin=True)
+        for index in range(size - 1):
+            user = User.objects.create(username=f"g{group.id}-m{index}")
+            GroupMember.objects.create(group=group, user=user)
+        return group
+
+    def add_expense_queries(self, group, **data):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        payload = {'description': 'Dinner', 'amount': '120.00', 'paid_by_username': 'owner', 'split_type': 'equal'}
+        payload.update(data)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('add-expense', args=[group.id]), payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return len(queries), response.data['expense']
+
+    def test_equal_split_query_count_is_flat(self):
+        small, _ = self.add_expense_queries(self.make_group(3))
+        large, expense = self.add_expense_queries(self.make_group(40))
+        self.assertEqual(small, large)
+        self.assertEqual(len(expense['splits']), 40)
+        self.assertEqual(expense['splits'][0]['amount'], '3.00')
+
+    def test_custom_split_query_count_is_flat(self):
+        small_group, large_group = self.make_group(3), self.make_group(40)
+        small_splits = {'owner': '100.00', f'g{small_group.id}-m0': '20.00'}
+        large_splits = {'owner': '81.00'}
+        large_splits.update({f'g{large_group.id}-m{index}': '1.00' for index in range(39)})
+
+        small, _ = self.add_expense_queries(small_group, split_type='custom', custom_splits=small_splits)
+        large, _ = self.add_expense_queries(large_group, split_type='custom', custom_splits=large_splits)
+        self.assertEqual(small, large)
+
+    def test_large_group_gets_its_expense_back(self):
+        from .models import GroupBalance
+        # 1000+ split users used to overflow SQLite's expression depth when re-read
+        group = self.make_group(1)
+        users = User.objects.bulk_create([User(username=f'big{index}') for index in range(1200)])
+        GroupMember.objects.bulk_create([GroupMember(group=group, user=user) for user in users])
+        GroupBalance.objects.bulk_create([GroupBalance(group=group, user=user) for user in users])
+
+        response = self.client.post(reverse('add-expense', args=[group.id]), {
+            'description': 'Festival', 'amount': '1201.00', 'paid_by_username': 'owner', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data['expense']['splits']), 1201)
+        self.assertEqual(GroupExpense.objects.filter(group=group).count(), 1)
+
+    def test_bulk_create_for_expense_rejects_non_members(self):
+        group = self.make_group(2)
+        outsider = User.objects.create(username='outsider')
+        expense = GroupExpense.objects.create(group=group, description='Cab', amount='10.00', paid_by=self.owner)
+        with self.assertRaises(ValueError):
+            ExpenseSplit.bulk_create_for_expense(expense, {outsider.id: Decimal('10.00')}, {self.owner.id})
+        self.assertFalse(ExpenseSplit.objects.filter(expense=expense).exists())
+
+
+class BulkExpenseTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        self.url = reverse('add-expenses-bulk', args=[self.group.id])
+
+    def test_json_array_reports_per_item_results(self):
+        from io import StringIO
+        from django.core.management import call_command
+        items = [
+            {'description': 'Dinner', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'equal'},
+            {'description': 'Taxi', 'amount': '30.00', 'paid_by_username': 'nobody', 'split_type': 'equal'},
+            {'description': 'Hotel', 'amount': '60.00', 'paid_by_username': 'user2',
+             'split_type': 'custom', 'custom_splits': {'user1': '40.00', 'user2': '20.00'}},
+        ]
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 1))
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'invalid', 'created'])
+        self.assertIn('paid_by_username', response.data['results'][1]['errors'])
+
+        self.assertEqual(GroupExpense.objects.filter(group=self.group).count(), 2)
+        self.assertEqual(ExpenseSplit.objects.filter(expense__group=self.group).count(), 4)
+        call_command('rebuild_ledger', self.group.id, '--check', stdout=StringIO())
+
+    def test_ndjson_stream(self):
+        body = '\n'.join([
+            '{"description": "Coffee", "amount": "8.00", "paid_by_username": "user2", "split_type": "equal"}',
+            '',
+            '{"description": "Bread", "amount": "4.00", "paid_by_username": "user1", "split_type": "equal"}',
+        ])
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+
+        response = self.client.post(self.url, '{"description": ', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+
+    def test_atomic_mode_writes_nothing_on_error(self):
+        items = [
+            {'description': 'Dinner', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'equal'},
+            {'description': '', 'amount': '30.00', 'paid_by_username': 'user1', 'split_type': 'equal'},
+        ]
+        response = self.client.post(self.url + '?atomic=true', {'expenses': items}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in response.data['results']], ['skipped', 'invalid'])
+        self.assertFalse(GroupExpense.objects.filter(group=self.group).exists())
+
+    def test_writes_in_chunks_with_constant_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .bulk import ExpenseImporter
+        items = [
+            {'description': f'Item {index}', 'amount': '9.99', 'paid_by_username': 'user1', 'split_type': 'equal'}
+            for index in range(120)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            importer = ExpenseImporter(self.group, chunk_size=50).run(items)
+        self.assertEqual(importer.created, 120)
+        # member map + 3 chunks x (expenses, splits, ledger), plus savepoints
+        self.assertLess(len(queries), 20)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        self.url = reverse('group-export', args=[self.group.id])
+        self.client.post(reverse('add-expenses-bulk', args=[self.group.id]), [
+            {'description': 'Dinner, late', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'equal'},
+            {'description': 'Hotel', 'amount': '60.00', 'paid_by_username': 'user2',
+             'split_type': 'custom', 'custom_splits': {'user1': '40.00', 'user2': '20.00'}},
+        ], format='json')
+
+    def test_csv_streams_one_row_per_split(self):
+        import csv
+        response = self.client.get(self.url + '?format=csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('.csv', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['description'], 'Dinner, late')
+        self.assertEqual([(row['participant'], row['share']) for row in rows[2:]], [('user1', '40.00'), ('user2', '20.00')])
+        self.assertEqual({row['paid_by'] for row in rows[2:]}, {'user2'})
+
+    def test_ndjson_has_one_object_per_expense(self):
+        import json
+        response = self.client.get(self.url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        expenses = [json.loads(line) for line in lines]
+        self.assertEqual([expense['description'] for expense in expenses], ['Dinner, late', 'Hotel'])
+        self.assertEqual(expenses[0]['splits'], {'user1': '50.00', 'user2': '50.00'})
+        self.assertEqual(expenses[1]['amount'], '60.00')
+
+    def test_rejects_unknown_formats_and_non_members(self):
+        self.assertEqual(self.client.get(self.url + '?format=xlsx').status_code, 404)
+        outsider = User.objects.create_user(username='outsider', password='pass123')
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url + '?format=csv').status_code, 403)
+
+    def test_split_query_walks_indexes_without_sorting(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .export import export_csv
+        with CaptureQueriesContext(connection) as queries:
+            list(export_csv(self.group))
+        self.assertEqual(len(queries), 1)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        self.url = reverse('group-import', args=[self.group.id])
+        self.csv = (
+            '\ufeffdescription,amount,paid_by,split_type,splits\r\n'
+            'Dinner,100.00,user1,equal,\r\n'
+            '"Hotel, 2 nights",60.00,user2,custom,user1=40.00;user2=20.00\r\n'
+            'Taxi,30.00,nobody,equal,\r\n'
+            'Snacks,12.00,user1,shares,user1=1;user2=2\r\n'
+        )
+
+    def test_dry_run_validates_without_writing(self):
+        response = self.client.post(self.url + '?dry_run=true', self.csv, content_type='text/csv')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['valid'], response.data['created'], response.data['failed']), (3, 0, 1))
+        self.assertEqual(response.data['errors'][0]['index'], 2)
+        self.assertIn('paid_by_username', response.data['errors'][0]['errors'])
+        self.assertFalse(GroupExpense.objects.filter(group=self.group).exists())
+
+    def test_csv_body_imports_valid_rows_and_reports_the_rest(self):
+        from io import StringIO
+        from django.core.management import call_command
+        response = self.client.post(self.url, self.csv, content_type='text/csv')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (3, 1))
+        self.assertEqual([error['index'] for error in response.data['errors']], [2])
+
+        hotel = GroupExpense.objects.get(group=self.group, description='Hotel, 2 nights')
+        self.assertEqual(
+            dict(hotel.splits.values_list('user__username', 'amount')),
+            {'user1': Decimal('40.00'), 'user2': Decimal('20.00')}
+        )
+        call_command('rebuild_ledger', self.group.id, '--check', stdout=StringIO())
+
+    def test_export_files_import_back(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        self.client.post(self.url, self.csv, content_type='text/csv')
+        export_url = reverse('group-export', args=[self.group.id])
+        other = Group.objects.create(name="Copy", created_by=self.user1)
+        GroupMember.objects.create(group=other, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=other, user=self.user2)
+
+        for file_format in ('csv', 'ndjson'):
+            body = b''.join(self.client.get(f'{export_url}?format={file_format}').streaming_content)
+            upload = SimpleUploadedFile(f'ledger.{file_format}', body)
+            response = self.client.post(reverse('group-import', args=[other.id]), {'file': upload})
+            self.assertEqual(response.status_code, 201, response.data)
+            self.assertEqual(response.data['created'], 3)
+
+        def ledger(group):
+            return sorted(ExpenseSplit.objects.filter(expense__group=group).values_list('user__username', 'amount'))
+        self.assertEqual(ledger(other), sorted(ledger(self.group) * 2))
+
+    def test_bad_lines_and_unknown_formats(self):
+        body = '{"description": "Tea", "amount": "5.00", "paid_by_username": "user1"}\n{"description": \n'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 207)
+        self.assertIn('Line 2', str(response.data['errors'][0]['errors']))
+
+        response = self.client.post(self.url, 'a,b', content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 415)
+
+    def test_management_command(self):
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as handle:
+            handle.write(self.csv.replace('Taxi,30.00,nobody', 'Taxi,30.00,user2'))
+        self.addCleanup(os.remove, handle.name)
+
+        out = StringIO()
+        call_command('import_expenses', self.group.id, handle.name, '--dry-run', stdout=out)
+        self.assertIn('4 valid', out.getvalue())
+        self.assertFalse(GroupExpense.objects.filter(group=self.group).exists())
+
+        call_command('import_expenses', self.group.id, handle.name, '--chunk-size', '2', stdout=out)
+        self.assertEqual(GroupExpense.objects.filter(group=self.group).count(), 4)
+
+        with self.assertRaises(CommandError):
+            call_command('import_expenses', self.group.id, handle.name, '--format', 'ndjson', stdout=StringIO())
+
+    def test_unknown_charset_is_refused_before_reading(self):
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        for charset in ('klingon', 'base64'):
+            response = self.client.post(self.url, self.csv, content_type=f'text/csv; charset={charset}')
+            self.assertEqual(response.status_code, 415)
+            self.assertIn(charset, response.data['error'])
+        self.assertFalse(GroupExpense.objects.filter(group=self.group).exists())
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as handle:
+            handle.write(self.csv)
+        self.addCleanup(os.remove, handle.name)
+        with self.assertRaisesMessage(CommandError, 'klingon'):
+            call_command('import_expenses', self.group.id, handle.name, '--encoding', 'klingon', stdout=StringIO())
+
+    def test_undecodable_bytes_are_reported_not_a_500(self):
+        body = (
+            b'description,amount,paid_by,split_type\n'
+            b'Dinner,100.00,user1,equal\n'
+            b'Caf\xe9,5.00,user1,equal\n'
+            b'Taxi,30.00,user2,equal\n'
+        )
+        response = self.client.post(self.url + '?atomic=true', body, content_type='text/csv')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (0, 1))
+        self.assertFalse(GroupExpense.objects.filter(group=self.group).exists())
+
+        response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 1))
+        [error] = response.data['errors']
+        self.assertEqual(error['index'], 1)
+        self.assertIn('Line 3: not valid utf-8', str(error['errors']))
+        self.assertEqual(list(GroupExpense.objects.values_list('description', flat=True)), ['Dinner'])
+
+        # The same bytes are fine once the right charset is declared
+        response = self.client.post(self.url, body, content_type='text/csv; charset=latin-1')
+        self.assertEqual((response.status_code, response.data['created']), (201, 3))
+        self.assertTrue(GroupExpense.objects.filter(description='Caf\xe9').exists())
+
+
+    def test_malformed_csv_after_a_committed_chunk_is_reported(self):
+        from .imports import import_stream
+        oversized = 'x' * 200000  # past the csv module's field size limit
+        body = (
+            'description,amount,paid_by,split_type\n'
+            'Dinner,100.00,user1,equal\n'
+            'Lunch,50.00,user1,equal\n'
+            'Taxi,30.00,user2,equal\n'
+            f'"{oversized}",5.00,user1,equal\n'
+            'Tea,5.00,user1,equal\n'
+        ).encode()
+        importer = import_stream(self.group, body.splitlines(keepends=True), 'csv', chunk_size=2)
+        self.assertEqual((importer.created, importer.failed), (3, 1))
+        [error] = importer.results
+        self.assertEqual(error['index'], 3)
+        self.assertIn('Line 5: invalid CSV', str(error['errors']))
+        self.assertEqual(GroupExpense.objects.filter(group=self.group).count(), 3)
+
+class GroupExpensesPaginationTests(TestCase):
+    def setUp(self):
+        from .bulk import ExpenseImporter
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        ExpenseImporter(self.group).run([
+            {'description': f'Item {index}', 'amount': '10.00', 'paid_by_username': 'user1', 'split_type': 'equal'}
+            for index in range(7)
+        ])
+        self.url = reverse('group-expenses', args=[self.group.id])
+
+    def fetch_all(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(expense['id'] for expense in response.data['results'])
+            url = response.data['next']
+        return seen
+
+    def test_cursor_pages_are_stable_with_tied_timestamps(self):
+        from django.utils import timezone
+        # With identical timestamps the ordering relies on the id tie-breaker
+        GroupExpense.objects.filter(group=self.group, id__lte=GroupExpense.objects.order_by('id')[3].id).update(
+            created_at=timezone.now()
+        )
+        expected = list(
+            GroupExpense.objects.filter(group=self.group).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(self.fetch_all(self.url + '?page_size=3'), expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_sparse_fieldsets(self):
+        response = self.client.get(self.url + '?fields=id,amount')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'amount'})
+
+        response = self.client.get(self.url + '?include_splits=false')
+        self.assertNotIn('splits', response.data['results'][0])
+        self.assertIn('paid_by_username', response.data['results'][0])
+
+    def test_sparse_fieldset_with_no_known_field_is_rejected(self):
+        for query in ('?fields=bogus', '?fields=splits&include_splits=false'):
+            response = self.client.get(self.url + query)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('paid_by_username', response.data['error'])
+        self.assertEqual(self.client.get(self.url + '?fields=id,bogus').status_code, 200)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        counts = []
+        for size in (1, 7):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url + f'?page_size={size}')
+            self.assertEqual(len(response.data['results'][0]['splits']), 2)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class GroupMembershipPermissionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.outsider = User.objects.create_user(username='outsider', password='pass123')
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+
+    def test_non_members_are_rejected_everywhere(self):
+        self.client.force_authenticate(user=self.outsider)
+        for name, method in [
+            ('group-members', 'get'), ('add-member', 'post'), ('group-expenses', 'get'),
+            ('add-expense', 'post'), ('add-expenses-bulk', 'post'), ('group-summary', 'get'),
+            ('group-settlements', 'get'),
+        ]:
+            response = getattr(self.client, method)(reverse(name, args=[self.group.id]), {}, format='json')
+            self.assertEqual(response.status_code, 403, name)
+            self.assertEqual(response.data, {'error': 'You are not a member of this group'}, name)
+
+        response = self.client.get(reverse('group-summary', args=[self.group.id + 100]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_membership_is_loaded_once_per_write(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.client.force_authenticate(user=self.user1)
+        payload = {
+            'description': 'Taxi', 'amount': '30.00', 'paid_by_username': 'user2',
+            'split_type': 'custom', 'custom_splits': {'user1': '10.00', 'user2': '20.00'},
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('add-expense', args=[self.group.id]), payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        membership_queries = [q for q in queries if 'groups_groupmember' in q['sql']]
+        self.assertEqual(len(membership_queries), 1)
+
+    def test_add_member_rejects_existing_member_without_writing(self):
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.post(reverse('add-member', args=[self.group.id]), {'username': 'user2'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(GroupMember.objects.filter(group=self.group).count(), 2)
+
+
+class MemberInviteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+
+    def test_unknown_username_becomes_a_placeholder(self):
+        response = self.client.post(reverse('add-member', args=[self.group.id]), {'username': 'newbie'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        newbie = User.objects.get(username='newbie')
+        self.assertFalse(newbie.is_active)
+        self.assertFalse(newbie.has_usable_password())
+
+    def test_bulk_add_is_a_handful_of_queries(self):
+        from .models import GroupBalance
+        usernames = ['user1', 'user2'] + [f'friend{index}' for index in range(100)] + ['friend0']
+        url = reverse('add-members', args=[self.group.id])
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        # membership, user lookup, placeholder inserts (batched by SQLite's
+        # variable limit) + re-select, members, balances, version bump, savepoints
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {'usernames': usernames}, format='json')
+        self.assertLessEqual(len(queries), 12)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['already_members'], ['user1'])
+        self.assertEqual(len(response.data['added']), 101)
+        self.assertEqual(sum(added['placeholder'] for added in response.data['added']), 100)
+
+        self.assertEqual(GroupMember.objects.filter(group=self.group).count(), 102)
+        self.assertEqual(GroupBalance.objects.filter(group=self.group).count(), 102)
+        self.assertEqual(self.client.post(url, {'usernames': ['friend5']}, format='json').status_code, 200)
+        self.assertEqual(self.client.post(url, {'usernames': ['bad name!']}, format='json').status_code, 400)
+
+        # Placeholders can be split with straight away
+        response = self.client.post(reverse('add-expense', args=[self.group.id]), {
+            'description': 'Dinner', 'amount': '102.00', 'paid_by_username': 'friend7', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        self.url = reverse('group-summary', args=[self.group.id])
+
+    def version(self):
+        return Group.objects.values_list('version', flat=True).get(pk=self.group.pk)
+
+    def add_expense(self, amount):
+        response = self.client.post(reverse('add-expense', args=[self.group.id]), {
+            'description': 'Dinner', 'amount': amount, 'paid_by_username': 'user1', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_writes_bump_the_group_version(self):
+        start = self.version()
+        self.add_expense('10.00')
+        after_expense = self.version()
+        self.assertGreater(after_expense, start)
+
+        self.client.post(reverse('add-member', args=[self.group.id]), {'username': 'user3'}, format='json')
+        after_member = self.version()
+        self.assertGreater(after_member, after_expense)
+
+        self.client.post(reverse('add-expenses-bulk', args=[self.group.id]), [
+            {'description': 'Cab', 'amount': '5.00', 'paid_by_username': 'user2', 'split_type': 'equal'}
+        ], format='json')
+        after_bulk = self.version()
+        self.assertGreater(after_bulk, after_member)
+
+        GroupExpense.objects.filter(group=self.group).first().delete()
+        self.assertGreater(self.version(), after_bulk)
+
+    def test_repeat_reads_hit_the_cache_and_revalidate(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.add_expense('10.00')
+
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+        self.assertFalse([q for q in queries if 'groups_groupbalance' in q['sql']])
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+
+        self.add_expense('20.00')
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(changed.data['total_amount'], 30.0)
+
+
+class QueryPlanTests(TestCase):
+    """Every read the group views make should be an index search, never a table scan."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        for amount in ('10.00', '20.00', '30.00'):
+            self.client.post(reverse('add-expense', args=[self.group.id]), {
+                'description': 'Dinner', 'amount': amount, 'paid_by_username': 'user2', 'split_type': 'equal'
+            }, format='json')
+
+    def capture(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response, [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+
+    def plan(self, sql):
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def test_hot_queries_use_indexes(self):
+        from django.core.cache import caches
+        caches['summary'].clear()
+
+        group_id = self.group.id
+        expenses_url = reverse('group-expenses', args=[group_id]) + '?page_size=1'
+        response, queries = self.capture(expenses_url)
+        # The second page exercises the keyset range condition too
+        queries += self.capture(response.data['next'])[1]
+        for url in [
+            reverse('group-list-create'),
+            reverse('group-detail', args=[group_id]),
+            reverse('group-members', args=[group_id]),
+            reverse('group-summary', args=[group_id]),
+            reverse('group-settlements', args=[group_id]),
+        ]:
+            queries += self.capture(url)[1]
+
+        for sql in queries:
+            plan = self.plan(sql)
+            scans = [step for step in plan if step.startswith('SCAN ') and 'INDEX' not in step]
+            self.assertEqual(scans, [], f'{sql}\n{plan}')
+            if 'FROM "groups_groupexpense"' in sql:
+                self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan, sql)
+
+    def test_expense_pages_use_the_recent_index(self):
+        response, queries = self.capture(reverse('group-expenses', args=[self.group.id]))
+        plans = [self.plan(sql) for sql in queries if 'FROM "groups_groupexpense"' in sql]
+        self.assertTrue(plans)
+        for plan in plans:
+            self.assertTrue(any('groupexpense_group_recent_idx' in step for step in plan), plan)
+
+
+class FastReadPathTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+        from .bulk import ExpenseImporter
+        ExpenseImporter(self.group).run([
+            {'description': 'Dinner', 'amount': '30.00', 'paid_by_username': 'user1', 'split_type': 'equal'},
+            {'description': 'Taxi "late" ₹', 'amount': '10.01', 'paid_by_username': 'user2', 'split_type': 'custom',
+             'custom_splits': {'user1': '2.50', 'user2': '7.51'}},
+        ])
+        GroupExpense.objects.create(group=self.group, description='Unsplit', amount='5.00', paid_by=self.user1)
+
+    def serializer_payload(self):
+        # What the ModelSerializer path rendered before the read path existed
+        import json
+        from rest_framework.renderers import JSONRenderer
+        from .serializers import GroupExpenseSerializer
+        expenses = (
+            GroupExpense.objects.filter(group=self.group).order_by('-created_at', '-id')
+            .select_related('paid_by').prefetch_related('splits__user')
+        )
+        return json.loads(JSONRenderer().render(GroupExpenseSerializer(expenses, many=True).data))
+
+    def test_expense_list_matches_serializer_output(self):
+        import json
+        response = self.client.get(reverse('group-expenses', args=[self.group.id]))
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.content)
+        self.assertEqual(body['results'], self.serializer_payload())
+        self.assertEqual(list(body['results'][0]), list(self.serializer_payload()[0]))
+        self.assertEqual(body['results'][1]['amount'], '10.01')
+        self.assertTrue(body['results'][0]['created_at'].endswith('Z'))
+
+    def test_summary_recent_expenses_match_serializer_output(self):
+        import json
+        response = self.client.get(reverse('group-summary', args=[self.group.id]))
+        self.assertEqual(json.loads(response.content)['recent_expenses'], self.serializer_payload())
+
+    def test_stdlib_and_orjson_encoders_agree(self):
+        import json
+        from . import renderers
+        from .rows import expense_rows, project_expenses
+        rows = expense_rows(list(project_expenses(GroupExpense.objects.filter(group=self.group).order_by('-created_at', '-id'))))
+        stdlib = renderers.dumps_stdlib({'results': rows})
+        self.assertEqual(json.loads(stdlib)['results'], self.serializer_payload())
+        if renderers.orjson is None:
+            self.skipTest("orjson is not installed")
+        self.assertEqual(json.loads(renderers.dumps_orjson({'results': rows})), json.loads(stdlib))
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+
+    def add_expense(self):
+        response = self.client.post(reverse('add-expense', args=[self.group.id]), {
+            'description': 'Dinner', 'amount': '30.00', 'paid_by_username': 'user1', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_group_list_revalidates_without_serializing(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url = reverse('group-list-create')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response['ETag']), (304, etag))
+        self.assertEqual(len(queries), 1)
+        # Compressed responses carry the weak form of the tag
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{etag}').status_code, 304)
+
+        other = Group.objects.create(name="Flat", created_by=self.user2)
+        GroupMember.objects.create(group=other, user=self.user2, is_admin=True)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.add_expense()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        GroupMember.objects.create(group=other, user=self.user1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_expense_pages_revalidate_on_group_version(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.add_expense()
+        url = reverse('group-expenses', args=[self.group.id])
+        response = self.client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(any('groups_groupexpense' in query['sql'] for query in queries))
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        self.add_expense()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        from .bulk import ExpenseImporter
+        ExpenseImporter(self.group).run([
+            {'description': f'Item {index}', 'amount': '10.00', 'paid_by_username': 'user1', 'split_type': 'equal'}
+            for index in range(40)
+        ])
+        self.url = reverse('group-expenses', args=[self.group.id])
+
+    def test_large_json_is_gzipped_with_a_weak_etag(self):
+        import gzip
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content) // 3)
+        self.assertEqual(response['ETag'], f"W/{plain['ETag']}")
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+        # Refused encodings and small bodies stay as they are
+        self.assertNotIn('Content-Encoding', self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=0'))
+        small = self.client.get(self.url + '?page_size=1&fields=id', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+
+        # The 304 carries the validator of the 200 it revalidates
+        revalidated = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated['ETag'], response['ETag'])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=plain['ETag'])['ETag'], plain['ETag'])
+
+    def test_streamed_export_is_compressed(self):
+        import gzip
+        url = reverse('group-export', args=[self.group.id]) + '?format=csv'
+        plain = b''.join(self.client.get(url).streaming_content)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_only_api_media_types_are_compressed(self):
+        from backend.compression import is_compressible
+        for content_type in ('application/json', 'application/x-ndjson', 'text/csv; charset=utf-8',
+                             'application/problem+json'):
+            self.assertTrue(is_compressible(content_type), content_type)
+        for content_type in ('text/html; charset=utf-8', 'text/plain', 'application/xml', ''):
+            self.assertFalse(is_compressible(content_type), content_type)
+
+    def test_negotiation_prefers_q_then_server_order(self):
+        from backend.compression import choose_encoding, parse_accept_encoding
+        encoders = {'br': 'br', 'zstd': 'zstd', 'gzip': 'gzip'}
+        self.assertEqual(parse_accept_encoding('gzip;q=0.5, br'), {'gzip': 0.5, 'br': 1.0})
+        self.assertEqual(choose_encoding('gzip, br, zstd', encoders), 'br')
+        self.assertEqual(choose_encoding('gzip, br;q=0.4', encoders), 'gzip')
+        self.assertEqual(choose_encoding('*;q=0.1, zstd;q=0', encoders), 'br')
+        self.assertEqual(choose_encoding('x-gzip', {'gzip': 'gzip'}), 'gzip')
+        self.assertIsNone(choose_encoding('identity', encoders))
+        self.assertIsNone(choose_encoding('', encoders))
+
+
+class MyBalancesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.trip = Group.objects.create(name="Trip", created_by=self.user1)
+        self.flat = Group.objects.create(name="Flat", created_by=self.user2)
+        for group in (self.trip, self.flat):
+            GroupMember.objects.create(group=group, user=self.user1)
+            GroupMember.objects.create(group=group, user=self.user2)
+        from .bulk import ExpenseImporter
+        ExpenseImporter(self.trip).run([
+            {'description': 'Hotel', 'amount': '100.00', 'paid_by_username': 'user1', 'split_type': 'equal'},
+            {'description': 'Taxi', 'amount': '30.00', 'paid_by_username': 'user2', 'split_type': 'custom',
+             'custom_splits': {'user1': '20.00', 'user2': '10.00'}},
+        ])
+        ExpenseImporter(self.flat).run([
+            {'description': 'Rent', 'amount': '80.01', 'paid_by_username': 'user2', 'split_type': 'equal'},
+        ])
+
+    def test_balances_across_groups_from_one_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('my-balances'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        plan = ' '.join(row[-1] for row in connection.cursor().execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}"))
+        self.assertIn('groupbalance_user_cover_idx', plan)
+
+        self.assertEqual(response.data['groups'], [
+            {'group_id': self.trip.id, 'group_name': 'Trip', 'paid': 100.0, 'owes': 70.0, 'net_balance': 30.0},
+            {'group_id': self.flat.id, 'group_name': 'Flat', 'paid': 0.0, 'owes': 40.01, 'net_balance': -40.01},
+        ])
+        self.assertEqual(
+            (response.data['paid'], response.data['owes'], response.data['net_balance']), (100.0, 110.01, -10.01)
+        )
+
+        # Each group's entry agrees with that group's own summary
+        summary = self.client.get(reverse('group-summary', args=[self.flat.id])).data
+        [mine] = [row for row in summary['member_balances'] if row['username'] == 'user1']
+        self.assertEqual(mine['net_balance'], response.data['groups'][1]['net_balance'])
+
+    def test_requires_auth_and_starts_empty(self):
+        self.assertEqual(APIClient().get(reverse('my-balances')).status_code, 401)
+        loner = User.objects.create_user(username='loner', password='pass123')
+        self.client.force_authenticate(user=loner)
+        response = self.client.get(reverse('my-balances'))
+        self.assertEqual(response.data, {'paid': 0.0, 'owes': 0.0, 'net_balance': 0.0, 'groups': []})
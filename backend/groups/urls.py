@@ -19,11 +19,16 @@ urlpatterns = [
     # Member management
     path('<int:group_id>/members/', views.GroupMembersView.as_view(), name='group-members'),
     path('<int:group_id>/add-member/', views.add_member, name='add-member'),
+    path('<int:group_id>/add-members/', views.add_members, name='add-members'),
     
     # Expense management
     path('<int:group_id>/expenses/', views.GroupExpensesView.as_view(), name='group-expenses'),
     path('<int:group_id>/add-expense/', views.add_expense, name='add-expense'),
+    path('<int:group_id>/expenses/bulk/', views.add_expenses_bulk, name='add-expenses-bulk'),
+    path('<int:group_id>/import/', views.import_expenses, name='group-import'),
+    path('<int:group_id>/export/', views.export_expenses, name='group-export'),
     
     # Summary
     path('<int:group_id>/summary/', views.group_summary, name='group-summary'),
+    path('<int:group_id>/settlements/', views.group_settlements, name='group-settlements'),
 ]
\ No newline at end of file
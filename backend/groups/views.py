@@ -10,18 +10,32 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
-from django.db.models import Sum, Q
-from collections import defaultdict
-from decimal import Decimal
+from django.http import StreamingHttpResponse
+from django.db.models import Prefetch, Q
 
 from .models import Group, GroupMember, GroupExpense, ExpenseSplit
 from .serializers import (
-    GroupSerializer, AddMemberSerializer, CreateExpenseSerializer,
+    GroupSerializer, AddMemberSerializer, AddMembersSerializer, CreateExpenseSerializer,
     GroupExpenseSerializer, GroupSummarySerializer
 )
+from .bulk import ExpenseImporter
+from .conditional import (
+    expenses_validators, group_list_validators, is_not_modified, not_modified, set_validators, validator_headers
+)
+from .pagination import ExpenseCursorPagination
+from .permissions import IsGroupMember, get_membership
+from .parsers import NDJSONParser
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from .rows import EXPENSE_FIELDS, expense_rows, project_expenses
+from .export import EXPORTERS
+from .imports import detect_format, import_stream, resolve_encoding
+from .summary import get_group_summary, summary_etag, user_balances
+from .tasks import schedule_recompute, settle_group
 
 
 class GroupListCreateView(generics.ListCreateAPIView):
@@ -30,8 +44,14 @@ class GroupListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         return Group.objects.filter(
-            members__user=self.request.user
-        ).distinct()
+            id__in=GroupMember.objects.filter(user=self.request.user).values('group_id')
+        ).with_listing_data()
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = group_list_validators(request.user)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        return set_validators(super().list(request, *args, **kwargs), etag, last_modified)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -43,22 +63,16 @@ class GroupDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         return Group.objects.filter(
-            Q(created_by=self.request.user) | Q(members__user=self.request.user)
-        ).distinct()
+            Q(created_by=self.request.user)
+            | Q(id__in=GroupMember.objects.filter(user=self.request.user).values('group_id'))
+        ).with_listing_data()
 
 
 class GroupMembersView(generics.ListAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsGroupMember]
     
     def get(self, request, group_id):
-        group = get_object_or_404(Group, id=group_id)
-        
-        # Check if user is member of the group
-        if not GroupMember.objects.filter(group=group, user=request.user).exists():
-            return Response(
-                {"error": "You are not a member of this group"}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
+        group = get_membership(request, group_id).group
         
         members = GroupMember.objects.filter(group=group).select_related('user')
         members_data = []
@@ -76,18 +90,12 @@ class GroupMembersView(generics.ListAPIView):
 
 
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsGroupMember])
 def add_member(request, group_id):
-    group = get_object_or_404(Group, id=group_id)
-    
-    # Check if user is member of the group
-    if not GroupMember.objects.filter(group=group, user=request.user).exists():
-        return Response(
-            {"error": "You are not a member of this group"}, 
-            status=status.HTTP_403_FORBIDDEN
-        )
+    membership = get_membership(request, group_id)
+    group = membership.group
     
-    serializer = AddMemberSerializer(data=request.data, context={'group': group})
+    serializer = AddMemberSerializer(data=request.data, context={'group': group, 'membership': membership})
     if serializer.is_valid():
         try:
             member = serializer.save()
@@ -109,116 +117,231 @@ def add_member(request, group_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsGroupMember])
+def add_members(request, group_id):
+    membership = get_membership(request, group_id)
+    
+    serializer = AddMembersSerializer(data=request.data, context={'group': membership.group, 'membership': membership})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        result = serializer.save()
+    except Exception as e:
+        return Response(
+            {"error": str(e)}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    response_status = status.HTTP_201_CREATED if result['added'] else status.HTTP_200_OK
+    return Response(result, status=response_status)
+
 class GroupExpensesView(generics.ListAPIView):
     serializer_class = GroupExpenseSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsGroupMember]
+    pagination_class = ExpenseCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    
+    def get_fields(self):
+        """Fields requested with ?fields=a,b and/or ?include_splits=false (None means all)."""
+        fields = list(GroupExpenseSerializer.Meta.fields)
+        requested = self.request.query_params.get('fields')
+        if requested:
+            fields = [name for name in fields if name in requested.split(',')]
+        if self.request.query_params.get('include_splits', 'true').lower() in ('0', 'false', 'no'):
+            fields = [name for name in fields if name != 'splits']
+        return None if fields == GroupExpenseSerializer.Meta.fields else fields
     
     def get_queryset(self):
-        group_id = self.kwargs['group_id']
-        group = get_object_or_404(Group, id=group_id)
+        group = get_membership(self.request, self.kwargs['group_id']).group
+        return GroupExpense.objects.filter(group=group)
+    
+    def list(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        if fields == []:
+            return Response(
+                {"error": f"No valid fields requested; choose from: {', '.join(EXPENSE_FIELDS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        fields = fields or EXPENSE_FIELDS
         
-        # Check if user is member of the group
-        if not GroupMember.objects.filter(group=group, user=self.request.user).exists():
-            return GroupExpense.objects.none()
+        group = get_membership(request, self.kwargs['group_id']).group
+        etag, last_modified = expenses_validators(group)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
         
-        return GroupExpense.objects.filter(group=group).select_related('paid_by')
+        # Rows are projected with values() and shaped like the serializer's output
+        page = self.paginate_queryset(project_expenses(self.get_queryset(), fields))
+        response = self.get_paginated_response(expense_rows(page, fields))
+        return set_validators(response, etag, last_modified)
 
 
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, IsGroupMember])
 def add_expense(request, group_id):
-    group = get_object_or_404(Group, id=group_id)
+    membership = get_membership(request, group_id)
+    group = membership.group
     
-    # Check if user is member of the group
-    if not GroupMember.objects.filter(group=group, user=request.user).exists():
+    serializer = CreateExpenseSerializer(
+        data=request.data, context={'group': group, 'members': membership.by_username}
+    )
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        expense = serializer.save()
+    except Exception as e:
         return Response(
-            {"error": "You are not a member of this group"}, 
-            status=status.HTTP_403_FORBIDDEN
+            {"error": str(e)}, 
+            status=status.HTTP_400_BAD_REQUEST
         )
     
-    serializer = CreateExpenseSerializer(data=request.data, context={'group': group})
-    if serializer.is_valid():
-        try:
-            expense = serializer.save()
-            return Response({
-                'message': 'Expense added successfully!',
-                'expense': GroupExpenseSerializer(expense).data
-            }, status=status.HTTP_201_CREATED)
-        except Exception as e:
-            return Response(
-                {"error": str(e)}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    # The expense is committed; nothing below may turn into a 400 the client would retry.
+    # Split users are joined, not prefetched: an IN list of 1000+ ids is too deep for SQLite.
+    schedule_recompute(group.id)
+    expense = GroupExpense.objects.select_related('paid_by').prefetch_related(
+        Prefetch('splits', queryset=ExpenseSplit.objects.select_related('user'))
+    ).get(pk=expense.pk)
+    return Response({
+        'message': 'Expense added successfully!',
+        'expense': GroupExpenseSerializer(expense).data
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsGroupMember])
+@parser_classes([JSONParser, NDJSONParser])
+def add_expenses_bulk(request, group_id):
+    membership = get_membership(request, group_id)
+    group = membership.group
     
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    # A JSON array, {"expenses": [...]}, or an NDJSON stream of expenses
+    items = request.data
+    if isinstance(items, dict):
+        items = items.get('expenses')
+    if not isinstance(items, list):
+        return Response(
+            {"error": "Expected a list of expenses"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    atomic = request.query_params.get('atomic', 'false').lower() in ('1', 'true', 'yes')
+    importer = ExpenseImporter(group, members=membership.by_username).run(items, atomic=atomic)
+    if importer.created:
+        schedule_recompute(group.id)
+    
+    if importer.failed and not importer.created:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif importer.failed:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_201_CREATED
+    
+    return Response({
+        'created': importer.created,
+        'failed': importer.failed,
+        'results': importer.results
+    }, status=response_status)
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def group_summary(request, group_id):
-    group = get_object_or_404(Group, id=group_id)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsGroupMember])
+@parser_classes([MultiPartParser])
+def import_expenses(request, group_id):
+    membership = get_membership(request, group_id)
+    group = membership.group
     
-    # Check if user is member of the group
-    if not GroupMember.objects.filter(group=group, user=request.user).exists():
+    # A multipart "file" upload, or the CSV/NDJSON file as the raw request body;
+    # either way the rows are read off the stream as they are imported
+    if request.content_type.startswith('multipart/'):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the file as 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+        stream, file_format = upload, detect_format(upload.content_type, upload.name)
+    else:
+        stream, file_format = request.stream, detect_format(request.content_type)
+    if file_format is None:
         return Response(
-            {"error": "You are not a member of this group"}, 
-            status=status.HTTP_403_FORBIDDEN
+            {"error": "Send text/csv or application/x-ndjson"}, 
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
         )
     
-    # Get all members
-    members = GroupMember.objects.filter(group=group).select_related('user')
-    
-    # Get all expenses
-    expenses = GroupExpense.objects.filter(group=group).select_related('paid_by').prefetch_related('splits__user')
-    
-    # Calculate balances
-    balances = defaultdict(lambda: {'paid': Decimal('0.00'), 'owes': Decimal('0.00')})
-    
-    for member in members:
-        balances[member.user.username] = {
-            'id': member.user.id,
-            'username': member.user.username,
-            'email': member.user.email,
-            'paid': Decimal('0.00'),
-            'owes': Decimal('0.00')
-        }
-    
-    # Calculate what each member paid
-    for expense in expenses:
-        balances[expense.paid_by.username]['paid'] += expense.amount
-    
-    # Calculate what each member owes
-    for expense in expenses:
-        for split in expense.splits.all():
-            balances[split.user.username]['owes'] += split.amount
-    
-    # Calculate net balance (positive means they should receive, negative means they owe)
-    member_balances = []
-    for username, balance in balances.items():
-        net_balance = balance['paid'] - balance['owes']
-        member_balances.append({
-            'id': balance['id'],
-            'username': balance['username'],
-            'email': balance['email'],
-            'paid': float(balance['paid']),
-            'owes': float(balance['owes']),
-            'net_balance': float(net_balance)
-        })
-    
-    # Recent expenses (last 10)
-    recent_expenses = expenses[:10]
-    
-    # Total amount
-    total_amount = expenses.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-    
-    summary_data = {
-        'member_balances': member_balances,
-        'total_amount': float(total_amount),
-        'total_expenses_count': expenses.count(),
-        'recent_expenses': GroupExpenseSerializer(recent_expenses, many=True).data
-    }
-    
-    return Response(summary_data)
+    encoding = request.content_params.get('charset', 'utf-8')
+    try:
+        resolve_encoding(encoding)
+    except LookupError as e:
+        return Response({"error": str(e)}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    
+    dry_run = request.query_params.get('dry_run', 'false').lower() in ('1', 'true', 'yes')
+    atomic = request.query_params.get('atomic', 'false').lower() in ('1', 'true', 'yes')
+    importer = import_stream(
+        group, stream or [], file_format, members=membership.by_username,
+        atomic=atomic, dry_run=dry_run, encoding=encoding
+    )
+    if importer.created:
+        schedule_recompute(group.id)
+    
+    if importer.failed and not importer.valid:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif importer.failed:
+        response_status = status.HTTP_207_MULTI_STATUS
+    elif dry_run:
+        response_status = status.HTTP_200_OK
+    else:
+        response_status = status.HTTP_201_CREATED
+    
+    return Response({
+        'dry_run': dry_run,
+        'valid': importer.valid,
+        'created': importer.created,
+        'failed': importer.failed,
+        'errors': importer.results
+    }, status=response_status)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsGroupMember])
+@renderer_classes([CSVRenderer, NDJSONRenderer])
+def export_expenses(request, group_id):
+    group = get_membership(request, group_id).group
+    
+    # ?format=csv|ndjson (or the Accept header) picks the renderer; the body
+    # is streamed straight from the split query rather than rendered
+    renderer = request.accepted_renderer
+    response = StreamingHttpResponse(
+        EXPORTERS[renderer.format](group),
+        content_type=f'{renderer.media_type}; charset={renderer.charset}'
+    )
+    response['Content-Disposition'] = f'attachment; filename="group-{group.id}-expenses.{renderer.format}"'
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsGroupMember])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+def group_summary(request, group_id):
+    group = get_membership(request, group_id).group
+    
+    # A client that already holds this version gets a 304 without any summary work
+    etag = summary_etag(group)
+    if is_not_modified(request, etag, group.updated_at):
+        return not_modified(etag, group.updated_at)
+    
+    return Response(get_group_summary(group), headers=validator_headers(etag, group.updated_at))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_balances(request):
+    return Response(user_balances(request.user))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsGroupMember])
+def group_settlements(request, group_id):
+    group = get_membership(request, group_id).group
+    
+    # ?exact=false skips the minimum-transaction solver for small groups
+    exact = request.query_params.get('exact', 'true').lower() not in ('0', 'false', 'no')
+    return Response(settle_group(group.id, exact=exact))
 
 
 @api_view(['DELETE'])
@@ -0,0 +1,19 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'key', 'status', 'coalesced', 'worker', 'created_at', 'run_ms')
+    list_filter = ('status', 'kind')
+    search_fields = ('kind', 'key')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'run_ms', 'coalesced', 'worker', 'result', 'error')
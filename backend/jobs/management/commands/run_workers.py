@@ -0,0 +1,83 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import multiprocessing
+import os
+from datetime import timedelta
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs.queue import purge_finished, requeue_stale, work
+
+
+def _worker_main(burst, poll_interval, max_jobs):
+    # Under the spawn start method the child starts with a bare interpreter
+    django.setup()
+    work(burst=burst, poll_interval=poll_interval, max_jobs=max_jobs)
+
+
+class Command(BaseCommand):
+    help = "Run background job workers: a pool of processes that claim and run queued jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help="Worker processes (default: one per CPU); 1 runs in this process",
+        )
+        parser.add_argument('--burst', action='store_true', help="Exit once the queue is empty")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between polls when idle")
+        parser.add_argument('--max-jobs', type=int, help="Jobs each worker runs before exiting")
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help="Requeue jobs left running for this many seconds by a dead worker",
+        )
+        parser.add_argument('--keep-days', type=int, default=7, help="Delete finished jobs older than this")
+
+    def handle(self, *args, **options):
+        if options['processes'] < 1:
+            raise CommandError("--processes must be at least 1")
+
+        requeued = requeue_stale(timedelta(seconds=options['stale_after']))
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s)")
+        purged = purge_finished(timedelta(days=options['keep_days']))
+        if purged:
+            self.stdout.write(f"Deleted {purged} finished job(s)")
+
+        if options['processes'] == 1:
+            done = work(burst=options['burst'], poll_interval=options['poll_interval'], max_jobs=options['max_jobs'])
+            self.stdout.write(self.style.SUCCESS(f"Ran {done} job(s)"))
+            return
+
+        # Children must not share the parent's SQLite connection across fork
+        connections.close_all()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        processes = [
+            context.Process(
+                target=_worker_main, name=f'worker-{index}', daemon=True,
+                args=(options['burst'], options['poll_interval'], options['max_jobs']),
+            )
+            for index in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} worker process(es)")
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+        failed = [process.name for process in processes if process.exitcode]
+        if failed:
+            raise CommandError(f"Worker(s) exited with an error: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS("Workers finished"))
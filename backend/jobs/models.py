@@ -0,0 +1,84 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    def claim(self, worker, attempts=5):
+        """Mark the oldest queued job as running by `worker` and return it, or None."""
+        for _ in range(attempts):
+            job_id = self.filter(status=Job.QUEUED).order_by('id').values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            # A conditional UPDATE is the claim: SQLite ignores select_for_update, but only
+            # one worker's UPDATE can still see the row queued. The loser tries the next job.
+            claimed = self.filter(pk=job_id, status=Job.QUEUED).update(
+                status=Job.RUNNING, worker=worker, started_at=timezone.now()
+            )
+            if claimed == 1:
+                return self.get(pk=job_id)
+        return None
+
+
+class Job(models.Model):
+    """
+    A unit of background work, run by `manage.py run_workers`.
+
+    Jobs enqueued with a key are coalesced: while a job with that key is still
+    queued, enqueueing it again only bumps `coalesced`, so a burst of writes
+    triggers one run. Once the job starts, the next enqueue queues a new one.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=64)
+    key = models.CharField(max_length=200, null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    coalesced = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    run_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='job_status_idx'),
+            models.Index(fields=['kind', 'status'], name='job_kind_status_idx'),
+        ]
+        constraints = [
+            # At most one queued job per key; this is what enqueue() coalesces on
+            models.UniqueConstraint(fields=['key'], condition=Q(status='queued'), name='job_unique_queued_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+    @property
+    def wait_ms(self):
+        if self.started_at is None:
+            return None
+        return int((self.started_at - self.created_at).total_seconds() * 1000)
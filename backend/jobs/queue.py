@@ -0,0 +1,129 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+A small job queue on top of the Job table; no broker needed.
+
+Handlers are plain functions registered with @task('app.name') in an app's
+tasks.py. They take the job payload as keyword arguments and may return a
+JSON-serializable result, which is stored on the job.
+
+    enqueue('groups.recompute', {'group_id': 3}, key='groups.recompute:3')
+
+Workers (`manage.py run_workers`) claim queued jobs oldest first.
+"""
+
+import os
+import socket
+import time
+import traceback
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+HANDLERS = {}
+
+
+def task(kind):
+    """Register the decorated function as the handler for jobs of `kind`."""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, payload=None, key=None):
+    """
+    Queue a job and return it, or return None when it was coalesced into an
+    already queued job with the same `key`.
+    """
+    payload = payload or {}
+    if key is None:
+        return Job.objects.create(kind=kind, payload=payload)
+
+    # The common case in a burst is one UPDATE; only the first write inserts
+    if Job.objects.filter(key=key, status=Job.QUEUED).update(coalesced=F('coalesced') + 1):
+        return None
+    try:
+        with transaction.atomic():
+            return Job.objects.create(kind=kind, payload=payload, key=key)
+    except IntegrityError:
+        # Another request queued it between our UPDATE and INSERT
+        Job.objects.filter(key=key, status=Job.QUEUED).update(coalesced=F('coalesced') + 1)
+        return None
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome and timing."""
+    started = time.perf_counter()
+    result, error, status = None, '', Job.DONE
+    try:
+        handler = HANDLERS.get(job.kind)
+        if handler is None:
+            raise LookupError(f"No handler registered for {job.kind!r}")
+        result = handler(**job.payload)
+    except Exception:
+        error, status = traceback.format_exc(), Job.FAILED
+
+    job.status, job.result, job.error = status, result, error
+    job.finished_at = timezone.now()
+    job.run_ms = int((time.perf_counter() - started) * 1000)
+    job.save(update_fields=['status', 'result', 'error', 'finished_at', 'run_ms'])
+    return job
+
+
+def requeue_stale(older_than):
+    """
+    Fail jobs left running for longer than `older_than` (a timedelta), e.g. by
+    a killed worker, and queue them again. Returns how many were requeued.
+    """
+    cutoff = timezone.now() - older_than
+    stale = list(Job.objects.filter(status=Job.RUNNING, started_at__lt=cutoff))
+    for job in stale:
+        Job.objects.filter(pk=job.pk, status=Job.RUNNING).update(
+            status=Job.FAILED, finished_at=timezone.now(), error="Worker stopped before the job finished"
+        )
+        enqueue(job.kind, job.payload, key=job.key)
+    return len(stale)
+
+
+def purge_finished(older_than):
+    """Delete done and failed jobs that finished more than `older_than` ago."""
+    cutoff = timezone.now() - older_than
+    deleted, _ = Job.objects.filter(status__in=[Job.DONE, Job.FAILED], finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def work(burst=False, poll_interval=1.0, max_jobs=None, name=None):
+    """
+    Claim and run jobs until stopped. With `burst`, return once the queue is
+    empty; `max_jobs` caps how many jobs this worker runs. Returns the count.
+    """
+    name = name or worker_name()
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        job = Job.objects.claim(name)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        done += 1
+        close_old_connections()
+    return done
+
+
@@ -0,0 +1,34 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from rest_framework import serializers
+
+from .models import Job
+from .queue import HANDLERS
+
+
+class JobSerializer(serializers.ModelSerializer):
+    wait_ms = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'key', 'payload', 'status', 'coalesced', 'result', 'error', 'worker',
+                  'created_at', 'started_at', 'finished_at', 'wait_ms', 'run_ms']
+        read_only_fields = fields
+
+
+class EnqueueJobSerializer(serializers.Serializer):
+    kind = serializers.CharField(max_length=64)
+    payload = serializers.DictField(required=False, default=dict)
+    key = serializers.CharField(max_length=200, required=False, allow_null=True, default=None)
+
+    def validate_kind(self, value):
+        if value not in HANDLERS:
+            raise serializers.ValidationError(f"Unknown job kind. Choose from: {', '.join(sorted(HANDLERS))}")
+        return value
@@ -0,0 +1,137 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from expenses.models import GroupSummary
+from groups.models import Group, GroupMember
+from groups.summary import version_tag
+from groups.tasks import recompute_group
+from .models import Job
+from .queue import enqueue, requeue_stale, task, work
+
+
+@task('tests.fail')
+def failing_task(message):
+    raise RuntimeError(message)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(username='user1', password='pass123')
+        self.user2 = User.objects.create_user(username='user2', password='pass123')
+        self.client.force_authenticate(user=self.user1)
+        self.group = Group.objects.create(name="Trip", created_by=self.user1)
+        GroupMember.objects.create(group=self.group, user=self.user1, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.user2)
+
+    def add_expense(self, amount='30.00'):
+        response = self.client.post(reverse('add-expense', args=[self.group.id]), {
+            'description': 'Dinner', 'amount': amount, 'paid_by_username': 'user1', 'split_type': 'equal'
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_burst_of_writes_queues_one_recompute(self):
+        for _ in range(3):
+            self.add_expense()
+        job = Job.objects.get(kind='groups.recompute')
+        self.assertEqual((job.status, job.coalesced, job.payload), ('queued', 2, {'group_id': self.group.id}))
+
+        self.assertEqual(work(burst=True), 1)
+        job.refresh_from_db()
+        self.group.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.result, {'version': self.group.version})
+        self.assertIsNotNone(job.run_ms)
+        self.assertEqual(GroupSummary.objects.get(group=self.group).version, self.group.version)
+        # A locmem summary cache would only be warm in this worker, so it is not filled
+        summary_key = f'group-summary:{version_tag(self.group)}'
+        self.assertIsNone(caches['summary'].get(summary_key))
+        self.addCleanup(caches['summary'].clear)
+        with override_settings(SUMMARY_CACHE_BACKEND='redis'):
+            recompute_group(self.group.id)
+        self.assertIsNotNone(caches['summary'].get(summary_key))
+
+        # Writes after the run has started queue a fresh job
+        self.add_expense()
+        self.assertEqual(Job.objects.filter(kind='groups.recompute', status='queued').count(), 1)
+
+    def test_failures_are_recorded(self):
+        job = enqueue('tests.fail', {'message': 'boom'})
+        unknown = enqueue('tests.missing')
+        work(burst=True)
+        job.refresh_from_db()
+        unknown.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('RuntimeError: boom', job.error)
+        self.assertIn('No handler registered', unknown.error)
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = enqueue('groups.rebuild_ledger', {'group_id': self.group.id}, key='ledger')
+        Job.objects.filter(pk=job.pk).update(status='running', started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(timedelta(minutes=10)), 1)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'failed')
+        self.assertEqual(Job.objects.filter(key='ledger', status='queued').count(), 1)
+
+    def test_claim_skips_a_job_another_worker_took(self):
+        first = enqueue('tests.fail', {'message': 'first'})
+        second = enqueue('tests.fail', {'message': 'second'})
+        now = timezone.now
+
+        def race():
+            # Another worker's UPDATE lands between our read and our UPDATE
+            Job.objects.filter(pk=first.pk, status='queued').update(status='running', worker='other')
+            return now()
+
+        with mock.patch('jobs.models.timezone.now', side_effect=race):
+            job = Job.objects.claim('me')
+        self.assertEqual((job.pk, job.status, job.worker), (second.pk, 'running', 'me'))
+        self.assertEqual(Job.objects.get(pk=first.pk).worker, 'other')
+        self.assertIsNone(Job.objects.claim('me'))
+
+    def test_run_workers_command(self):
+        enqueue('groups.settlements', {'group_id': self.group.id})
+        out = StringIO()
+        call_command('run_workers', '--processes', '1', '--burst', stdout=out)
+        self.assertIn('Ran 1 job(s)', out.getvalue())
+        self.assertEqual(Job.objects.get().result['transactions_count'], 0)
+
+    def test_endpoints_are_admin_only(self):
+        self.add_expense()
+        self.assertEqual(self.client.get(reverse('job-list')).status_code, 403)
+
+        self.user1.is_staff = True
+        self.user1.save()
+        response = self.client.post(reverse('job-list'), {
+            'kind': 'groups.rebuild_ledger', 'payload': {'group_id': self.group.id}
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.post(reverse('job-list'), {'kind': 'nope'}, format='json').status_code, 400)
+        work(burst=True)
+
+        listing = self.client.get(reverse('job-list') + '?status=done')
+        self.assertEqual({job['kind'] for job in listing.data}, {'groups.recompute', 'groups.rebuild_ledger'})
+        detail = self.client.get(reverse('job-detail', args=[response.data['id']]))
+        self.assertEqual(detail.data['result'], {'drifted_members': 0})
+        self.assertIsNotNone(detail.data['wait_ms'])
+
+        stats = self.client.get(reverse('job-stats')).data
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['kinds']['groups.recompute']['done']['count'], 1)
@@ -0,0 +1,17 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.job_list, name='job-list'),
+    path('stats/', views.job_stats, name='job-stats'),
+    path('<int:job_id>/', views.job_detail, name='job-detail'),
+]
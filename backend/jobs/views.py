@@ -0,0 +1,84 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from django.db.models import Avg, Count, Max, Min
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .models import Job
+from .queue import enqueue
+from .serializers import EnqueueJobSerializer, JobSerializer
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminUser])
+def job_list(request):
+    if request.method == 'POST':
+        serializer = EnqueueJobSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        job = enqueue(**serializer.validated_data)
+        if job is None:
+            # Coalesced into the job already queued (or by now claimed) under this key
+            job = Job.objects.filter(key=serializer.validated_data['key']).order_by('-id').first()
+            return Response(JobSerializer(job).data, status=status.HTTP_200_OK)
+        return Response(JobSerializer(job).data, status=status.HTTP_201_CREATED)
+
+    jobs = Job.objects.all()
+    for field in ('status', 'kind', 'key'):
+        value = request.query_params.get(field)
+        if value:
+            jobs = jobs.filter(**{field: value})
+    try:
+        limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        return Response({"error": "limit must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(JobSerializer(jobs[:max(limit, 0)], many=True).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def job_detail(request, job_id):
+    return Response(JobSerializer(get_object_or_404(Job, pk=job_id)).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def job_stats(request):
+    # Per kind and status: how many, plus run times for the finished ones
+    rows = (
+        Job.objects.order_by().values('kind', 'status')
+        .annotate(count=Count('id'), avg_run_ms=Avg('run_ms'), max_run_ms=Max('run_ms'))
+        .order_by('kind', 'status')
+    )
+    kinds = {}
+    for row in rows:
+        kinds.setdefault(row['kind'], {})[row['status']] = {
+            'count': row['count'],
+            'avg_run_ms': round(row['avg_run_ms'], 1) if row['avg_run_ms'] is not None else None,
+            'max_run_ms': row['max_run_ms'],
+        }
+
+    queued = Job.objects.filter(status=Job.QUEUED).aggregate(depth=Count('id'), oldest=Min('created_at'))
+    oldest_age = None
+    if queued['oldest'] is not None:
+        oldest_age = round((timezone.now() - queued['oldest']).total_seconds(), 3)
+    return Response({
+        'queue_depth': queued['depth'],
+        'oldest_queued_seconds': oldest_age,
+        'running': Job.objects.filter(status=Job.RUNNING).count(),
+        'kinds': kinds
+    })
@@ -0,0 +1,80 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from monitoring.metrics import HISTOGRAMS, Histogram, merge_snapshots, read_snapshots, render_prometheus
+
+
+def _series(snapshot):
+    # (endpoint, method) -> {metric name: Histogram}
+    series = {}
+    for entry in snapshot['histograms']:
+        histogram = Histogram(HISTOGRAMS[entry['name']][1])
+        histogram.merge(entry['counts'], entry['sum'], entry['count'])
+        series.setdefault((entry['endpoint'], entry['method']), {})[entry['name']] = histogram
+    return series
+
+
+def _ms(seconds):
+    return '-' if seconds is None else f'{seconds * 1000:.0f}'
+
+
+class Command(BaseCommand):
+    help = "Print the request metrics flushed by every server process to METRICS_SNAPSHOT_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=('table', 'prometheus', 'json'), default='table')
+        parser.add_argument('--dir', default=None, help="Snapshot directory (default: METRICS_SNAPSHOT_DIR)")
+        parser.add_argument('--clear', action='store_true', help="Delete the snapshots after printing them")
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or str(settings.METRICS_SNAPSHOT_DIR)
+        snapshot = merge_snapshots(read_snapshots(directory))
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(snapshot, indent=2))
+        elif options['format'] == 'prometheus':
+            self.stdout.write(render_prometheus(snapshot), ending='')
+        else:
+            self.write_table(snapshot)
+
+        if options['clear'] and os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if filename.startswith('metrics-') and filename.endswith('.json'):
+                    os.remove(os.path.join(directory, filename))
+
+    def write_table(self, snapshot):
+        series = _series(snapshot)
+        if not series:
+            self.stdout.write("No metrics recorded")
+            return
+        duplicates = {entry['endpoint']: entry for entry in snapshot['duplicates']}
+        self.stdout.write(
+            f"{'endpoint':<28} {'method':<6} {'count':>7} {'p50 ms':>7} {'p95 ms':>7} "
+            f"{'queries':>8} {'db ms':>7} {'bytes':>9} {'n+1':>5}"
+        )
+        for (endpoint, method), metrics in sorted(series.items()):
+            duration = metrics['http_request_duration_seconds']
+            queries = metrics['http_request_db_queries']
+            db_time = metrics['http_request_db_duration_seconds']
+            size = metrics.get('http_response_size_bytes')
+            flagged = duplicates.get(endpoint, {}).get('requests', 0)
+            self.stdout.write(
+                f"{endpoint:<28} {method:<6} {duration.count:>7} {_ms(duration.quantile(0.5)):>7} "
+                f"{_ms(duration.quantile(0.95)):>7} {queries.sum / queries.count:>8.1f} "
+                f"{db_time.sum / db_time.count * 1000:>7.1f} "
+                f"{(size.sum / size.count if size and size.count else 0):>9.0f} {flagged:>5}"
+            )
+        for endpoint, entry in sorted(duplicates.items()):
+            self.stdout.write(f"\n{endpoint}: one query ran {entry['repeats']} times in a request:\n  {entry['sql']}")
@@ -0,0 +1,103 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import io
+import os
+import pstats
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.profiling import delete_profile, list_profiles
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path) as handle:
+        for line in handle:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+class Command(BaseCommand):
+    help = "List captured request profiles, or summarize one by id."
+
+    def add_arguments(self, parser):
+        parser.add_argument('profile_id', nargs='?', help="Profile to summarize (a unique prefix will do)")
+        parser.add_argument('--limit', type=int, default=20, help="Rows to show")
+        parser.add_argument(
+            '--sort', default='cumulative', choices=('cumulative', 'tottime', 'calls'),
+            help="pstats sort order for the summary",
+        )
+        parser.add_argument('--endpoint', help="Only list profiles of this URL name")
+        parser.add_argument('--clear', action='store_true', help="Delete the listed profiles")
+
+    def handle(self, *args, **options):
+        directory = str(settings.PROFILING_DIR)
+        profiles = list_profiles(directory)
+        if options['endpoint']:
+            profiles = [profile for profile in profiles if profile['endpoint'] == options['endpoint']]
+
+        if options['profile_id']:
+            matches = [profile for profile in profiles if profile['id'].startswith(options['profile_id'])]
+            if len(matches) != 1:
+                raise CommandError(f"{len(matches)} profiles match {options['profile_id']!r}")
+            self.summarize(directory, matches[0], options['limit'], options['sort'])
+            return
+
+        if options['clear']:
+            for profile in profiles:
+                delete_profile(directory, profile['id'])
+            self.stdout.write(f"Deleted {len(profiles)} profile(s)")
+            return
+
+        if not profiles:
+            self.stdout.write(f"No profiles in {directory}")
+            return
+        self.stdout.write(f"{'id':<24} {'captured':<19} {'mode':<9} {'endpoint':<24} {'method':<6} {'status':>6} {'ms':>9}")
+        for profile in profiles[:options['limit']]:
+            captured = datetime.fromtimestamp(profile['created_at']).strftime('%Y-%m-%d %H:%M:%S')
+            self.stdout.write(
+                f"{profile['id']:<24} {captured:<19} {profile['mode']:<9} {profile['endpoint']:<24} "
+                f"{profile['method']:<6} {profile['status']:>6} {profile['duration_ms']:>9.1f}"
+            )
+
+    def summarize(self, directory, profile, limit, sort):
+        base = os.path.join(directory, profile['id'])
+        self.stdout.write(
+            f"{profile['method']} {profile['path']} ({profile['endpoint']}) -> {profile['status']} "
+            f"in {profile['duration_ms']} ms, {profile['mode']}, {profile['samples']} stack samples"
+        )
+
+        if profile['pstats']:
+            output = io.StringIO()
+            stats = pstats.Stats(f'{base}.prof', stream=output)
+            stats.strip_dirs().sort_stats(sort).print_stats(limit)
+            self.stdout.write(output.getvalue())
+
+        stacks = read_collapsed(f'{base}.collapsed')
+        total = sum(stacks.values())
+        if not total:
+            return
+        # Self time is the leaf frame of each sample; inclusive time counts a frame once per sample
+        own, inclusive = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+        for title, counter in (("self", own), ("inclusive", inclusive)):
+            self.stdout.write(f"\nTop frames by {title} samples ({total} total):")
+            for frame, count in counter.most_common(limit):
+                self.stdout.write(f"{count / total:>7.1%}  {frame}")
+        self.stdout.write(f"\nFlame graph input: {base}.collapsed")
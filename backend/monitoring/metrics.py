@@ -0,0 +1,242 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+In-process request metrics.
+
+Histograms use fixed buckets, so snapshots written by several worker
+processes can be merged bucket by bucket (merge_snapshots) and rendered in
+the Prometheus text format like a single registry.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name -> (help text, buckets)
+HISTOGRAMS = {
+    'http_request_duration_seconds': ("Wall time per request", DURATION_BUCKETS),
+    'http_request_db_queries': ("Database queries per request", QUERY_BUCKETS),
+    'http_request_db_duration_seconds': ("Time spent in database queries per request", DURATION_BUCKETS),
+    'http_request_render_duration_seconds': ("Time spent rendering the response body", DURATION_BUCKETS),
+    'http_response_size_bytes': ("Response body size", SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf overflow, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts, total, count):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile; None if empty or past the last bucket."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return None
+
+
+class Registry:
+    """Histograms per (metric, endpoint, method), request and duplicate-query counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}  # (name, endpoint, method) -> Histogram
+            self.requests = Counter()  # (endpoint, method, status) -> count
+            self.duplicates = {}  # endpoint -> {'requests', 'sql', 'repeats'}
+
+    def _histogram(self, name, endpoint, method):
+        key = (name, endpoint, method)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+        return histogram
+
+    def _duplicate(self, endpoint, requests, sql, repeats):
+        entry = self.duplicates.setdefault(endpoint, {'requests': 0, 'sql': '', 'repeats': 0})
+        entry['requests'] += requests
+        if repeats > entry['repeats']:
+            entry['sql'], entry['repeats'] = sql, repeats
+
+    def observe(self, endpoint, method, status, values, duplicates=()):
+        """
+        Record one request. `values` maps HISTOGRAMS names to measurements and
+        `duplicates` lists (sql, repeats) for queries run too many times.
+        """
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            for name, value in values.items():
+                self._histogram(name, endpoint, method).observe(value)
+            if duplicates:
+                sql, repeats = max(duplicates, key=lambda duplicate: duplicate[1])
+                self._duplicate(endpoint, 1, sql, repeats)
+
+    def load(self, snapshot):
+        """Add a snapshot's counts to this registry."""
+        with self._lock:
+            for entry in snapshot['histograms']:
+                self._histogram(entry['name'], entry['endpoint'], entry['method']).merge(
+                    entry['counts'], entry['sum'], entry['count'])
+            for entry in snapshot['requests']:
+                self.requests[(entry['endpoint'], entry['method'], entry['status'])] += entry['count']
+            for entry in snapshot['duplicates']:
+                self._duplicate(entry['endpoint'], entry['requests'], entry['sql'], entry['repeats'])
+
+    def snapshot(self):
+        """A JSON-serializable copy of everything recorded so far."""
+        with self._lock:
+            return {
+                'histograms': [
+                    {'name': name, 'endpoint': endpoint, 'method': method,
+                     'counts': list(histogram.counts), 'sum': histogram.sum, 'count': histogram.count}
+                    for (name, endpoint, method), histogram in sorted(self.histograms.items())
+                ],
+                'requests': [
+                    {'endpoint': endpoint, 'method': method, 'status': status, 'count': count}
+                    for (endpoint, method, status), count in sorted(self.requests.items())
+                ],
+                'duplicates': [
+                    {'endpoint': endpoint, **entry} for endpoint, entry in sorted(self.duplicates.items())
+                ],
+            }
+
+    def flush(self, directory, interval=0):
+        """Write this process's snapshot into `directory`, at most once per `interval` seconds."""
+        now = time.monotonic()
+        if interval and now - self.last_flush < interval:
+            return None
+        self.last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+        # Write then rename, so readers never see half a file
+        with open(f'{path}.tmp', 'w') as handle:
+            json.dump({'pid': os.getpid(), 'written_at': time.time(), **self.snapshot()}, handle)
+        os.replace(f'{path}.tmp', path)
+        return path
+
+
+registry = Registry()
+
+
+def read_snapshots(directory):
+    """Snapshots flushed by every process into `directory`."""
+    if not os.path.isdir(directory):
+        return []
+    snapshots = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.startswith('metrics-') and filename.endswith('.json'):
+            with open(os.path.join(directory, filename)) as handle:
+                snapshots.append(json.load(handle))
+    return snapshots
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # alive, owned by another user
+        return True
+    return True
+
+
+def remove_dead_snapshots(directory):
+    """Delete the snapshots of processes that have exited, like prometheus_client's mark_process_dead."""
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for filename in os.listdir(directory):
+        if not (filename.startswith('metrics-') and filename.endswith('.json')):
+            continue
+        try:
+            pid = int(filename[len('metrics-'):-len('.json')])
+        except ValueError:
+            continue
+        if not pid_alive(pid):
+            try:
+                os.remove(os.path.join(directory, filename))
+            except FileNotFoundError:  # another process got there first
+                continue
+            removed += 1
+    return removed
+
+
+def merge_snapshots(snapshots):
+    """Combine snapshots from several processes into one."""
+    merged = Registry()
+    for snapshot in snapshots:
+        merged.load(snapshot)
+    return merged.snapshot()
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def render_prometheus(snapshot):
+    """Render a snapshot in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    by_name = {}
+    for entry in snapshot['histograms']:
+        by_name.setdefault(entry['name'], []).append(entry)
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        if name not in by_name:
+            continue
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for entry in by_name[name]:
+            labels = {'endpoint': entry['endpoint'], 'method': entry['method']}
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), entry['counts']):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(**labels, le=bound)} {cumulative}')
+            lines.append(f'{name}_sum{_labels(**labels)} {entry["sum"]:.6f}')
+            lines.append(f'{name}_count{_labels(**labels)} {entry["count"]}')
+
+    lines += ['# HELP http_requests_total Requests by endpoint, method and status',
+              '# TYPE http_requests_total counter']
+    for entry in snapshot['requests']:
+        labels = _labels(endpoint=entry['endpoint'], method=entry['method'], status=entry['status'])
+        lines.append(f'http_requests_total{labels} {entry["count"]}')
+
+    lines += ['# HELP http_duplicate_query_requests_total Requests that repeated one query (likely N+1)',
+              '# TYPE http_duplicate_query_requests_total counter']
+    for entry in snapshot['duplicates']:
+        lines.append(f'http_duplicate_query_requests_total{_labels(endpoint=entry["endpoint"])} {entry["requests"]}')
+    return '\n'.join(lines) + '\n'
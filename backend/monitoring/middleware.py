@@ -0,0 +1,112 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import logging
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+from .metrics import registry
+
+logger = logging.getLogger('monitoring')
+
+
+class QueryTracker:
+    """
+    connection.execute_wrapper() hook counting the queries of one request.
+
+    Django hands wrappers the SQL with %s placeholders, so the same statement
+    with different parameters counts as one template; a template run many
+    times in one request is the usual sign of an N+1 loop.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.templates[sql] += 1
+
+    def duplicates(self, threshold):
+        """(sql, repeats) for every template run at least `threshold` times, most repeated first."""
+        return [(sql, repeats) for sql, repeats in self.templates.most_common() if repeats >= threshold]
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unmatched'
+
+
+class MetricsMiddleware:
+    """
+    Time every request and record it in the metrics registry under its URL name.
+
+    Keep it first in MIDDLEWARE so the wall time covers the other middleware.
+    Rendering of DRF responses happens after the view returns; it is timed
+    from process_template_response to the post-render callback.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.METRICS_ENABLED
+        self.threshold = settings.METRICS_DUPLICATE_THRESHOLD
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        tracker = QueryTracker()
+        start = time.perf_counter()
+        with connection.execute_wrapper(tracker):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        values = {
+            'http_request_duration_seconds': elapsed,
+            'http_request_db_queries': tracker.count,
+            'http_request_db_duration_seconds': tracker.duration,
+        }
+        render_time = getattr(request, '_metrics_render_time', None)
+        if render_time is not None:
+            values['http_request_render_duration_seconds'] = render_time
+        if not response.streaming:
+            values['http_response_size_bytes'] = len(response.content)
+
+        endpoint = endpoint_name(request)
+        duplicates = tracker.duplicates(self.threshold)
+        if duplicates:
+            sql, repeats = duplicates[0]
+            logger.warning("%s %s ran the same query %d times (likely N+1): %s",
+                           request.method, endpoint, repeats, sql)
+        registry.observe(endpoint, request.method, response.status_code, values, duplicates)
+
+        if settings.METRICS_SNAPSHOT_INTERVAL:
+            registry.flush(settings.METRICS_SNAPSHOT_DIR, settings.METRICS_SNAPSHOT_INTERVAL)
+        return response
+
+    def process_template_response(self, request, response):
+        if self.enabled:
+            start = time.perf_counter()
+
+            def rendered(response):
+                request._metrics_render_time = time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,212 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Per-request profiling.
+
+Two ways to capture a profile, both off unless asked for:
+
+    on demand  a staff request sending "X-Profile: 1" or ?profile=1 runs under
+               cProfile and a stack sampler; both results are saved and the
+               response names the profile in X-Profile-Id
+    slow       with PROFILING_SLOW_MS set, a PROFILING_SAMPLE_RATE share of
+               requests run under the stack sampler only (cheap enough to
+               leave on) and the stacks are kept when the request took at
+               least PROFILING_SLOW_MS
+
+Each profile is a set of files in PROFILING_DIR sharing one id: <id>.json
+(what was profiled), <id>.collapsed (one "frame;frame;frame count" line per
+stack, the input of flamegraph.pl and speedscope) and, on demand, <id>.prof
+(pstats, for `python -m pstats` or snakeviz).
+"""
+
+import cProfile
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .middleware import endpoint_name
+
+HEADER = 'HTTP_X_PROFILE'
+QUERY_FLAG = 'profile'
+
+
+class StackSampler:
+    """
+    Record the call stack of one thread every `interval` seconds from a helper thread.
+
+    The profiled thread runs at full speed; the cost is one frame walk per
+    sample, so durations are close to unprofiled ones.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+def is_staff(request):
+    """Authenticate the request the way the API views will and say whether it is staff."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(drf_request)
+        except exceptions.APIException:
+            return False
+        if result is not None:
+            return result[0].is_staff
+    return False
+
+
+def requested(request):
+    if request.META.get(HEADER) == '1':
+        return True
+    # Only parse the query string when the flag could be in it
+    return QUERY_FLAG in request.META.get('QUERY_STRING', '') and request.GET.get(QUERY_FLAG) == '1'
+
+
+def save(request, response, mode, duration, sampler, profiler=None):
+    """Write one profile's files and return its id."""
+    directory = settings.PROFILING_DIR
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(directory, profile_id)
+
+    if profiler is not None:
+        profiler.dump_stats(f'{base}.prof')
+    with open(f'{base}.collapsed', 'w') as handle:
+        handle.write(sampler.collapsed())
+    with open(f'{base}.json', 'w') as handle:
+        json.dump({
+            'id': profile_id,
+            'mode': mode,
+            'endpoint': endpoint_name(request),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'samples': sampler.samples,
+            'pstats': profiler is not None,
+            'created_at': time.time(),
+        }, handle)
+    prune(directory, settings.PROFILING_KEEP)
+    return profile_id
+
+
+def list_profiles(directory):
+    """Metadata of every saved profile, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            with open(os.path.join(directory, filename)) as handle:
+                profiles.append(json.load(handle))
+    return sorted(profiles, key=lambda profile: profile['created_at'], reverse=True)
+
+
+def delete_profile(directory, profile_id):
+    for extension in ('.json', '.collapsed', '.prof'):
+        path = os.path.join(directory, profile_id + extension)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def prune(directory, keep):
+    for profile in list_profiles(directory)[keep:]:
+        delete_profile(directory, profile['id'])
+
+
+class ProfilingMiddleware:
+    """
+    Profile flagged staff requests and, when configured, slow ones.
+
+    Sits after AuthenticationMiddleware. Unflagged requests cost a header
+    lookup, plus a random() call when slow-request sampling is on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow = settings.PROFILING_SLOW_MS / 1000
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+
+    def __call__(self, request):
+        if requested(request) and is_staff(request):
+            return self.profile(request)
+        if self.slow and random.random() < self.sample_rate:
+            return self.sample(request)
+        return self.get_response(request)
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        sampler = StackSampler(self.interval).start()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            sampler.stop()
+        duration = time.perf_counter() - start
+        response['X-Profile-Id'] = save(request, response, 'on-demand', duration, sampler, profiler)
+        return response
+
+    def sample(self, request):
+        sampler = StackSampler(self.interval).start()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        duration = time.perf_counter() - start
+        if duration >= self.slow:
+            save(request, response, 'slow', duration, sampler)
+        return response
@@ -0,0 +1,180 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from groups.models import Group, GroupMember
+from users.tokens import UserRefreshToken
+from .metrics import Registry, merge_snapshots, registry, render_prometheus
+from .middleware import QueryTracker
+from .profiling import list_profiles
+
+
+@override_settings(METRICS_SNAPSHOT_INTERVAL=0)
+class MetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user1', password='pass123')
+        self.admin = User.objects.create_user(username='admin', password='pass123', is_staff=True)
+        self.group = Group.objects.create(name="Trip", created_by=self.user)
+        GroupMember.objects.create(group=self.group, user=self.user, is_admin=True)
+
+    def test_endpoint_series_and_admin_only_exposition(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(reverse('group-summary', args=[self.group.id])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{endpoint="group-summary",method="GET"} 1', body)
+        self.assertIn('http_request_render_duration_seconds_count{endpoint="group-summary",method="GET"} 1', body)
+        self.assertIn('http_requests_total{endpoint="group-summary",method="GET",status="200"} 1', body)
+        self.assertIn('http_requests_total{endpoint="metrics",method="GET",status="403"} 1', body)
+        self.assertIn('http_response_size_bytes_bucket{endpoint="group-summary",method="GET",le="+Inf"} 1', body)
+
+        series = {(e['name'], e['endpoint']): e for e in registry.snapshot()['histograms']}
+        queries = series[('http_request_db_queries', 'group-summary')]
+        self.assertEqual(queries['count'], 1)
+        self.assertGreater(queries['sum'], 0)
+
+    def test_tracker_flags_repeated_queries(self):
+        tracker = QueryTracker()
+        with connection.execute_wrapper(tracker):
+            for user_id in (self.user.id, self.admin.id, self.user.id):
+                User.objects.filter(pk=user_id).first()
+            Group.objects.count()
+        self.assertEqual(tracker.count, 4)
+        [(sql, repeats)] = tracker.duplicates(3)
+        self.assertEqual(repeats, 3)
+        self.assertIn('auth_user', sql)
+
+        local = Registry()
+        local.observe('group-list', 'GET', 200, {'http_request_db_queries': 4}, tracker.duplicates(3))
+        text = render_prometheus(local.snapshot())
+        self.assertIn('http_duplicate_query_requests_total{endpoint="group-list"} 1', text)
+
+    def test_dump_merges_process_snapshots(self):
+        first, second = Registry(), Registry()
+        first.observe('group-summary', 'GET', 200, {'http_request_duration_seconds': 0.02})
+        second.observe('group-summary', 'GET', 200, {'http_request_duration_seconds': 0.2})
+        merged = merge_snapshots([first.snapshot(), second.snapshot()])
+        self.assertEqual(merged['requests'][0]['count'], 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = first.flush(directory)
+            with open(path) as handle:
+                data = json.load(handle)
+            data['pid'] += 1
+            with open(path.replace('.json', '-other.json'), 'w') as handle:
+                json.dump({**second.snapshot(), 'pid': data['pid']}, handle)
+
+            out = StringIO()
+            call_command('dump_metrics', '--dir', directory, '--format', 'json', '--clear', stdout=out)
+            histogram = json.loads(out.getvalue())['histograms'][0]
+            self.assertEqual((histogram['count'], round(histogram['sum'], 2)), (2, 0.22))
+
+            out = StringIO()
+            call_command('dump_metrics', '--dir', directory, stdout=out)
+            self.assertIn("No metrics recorded", out.getvalue())
+
+
+    def test_scrape_drops_snapshots_of_exited_processes(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        live, dead = Registry(), Registry()
+        live.observe('group-list', 'GET', 200, {'http_request_duration_seconds': 0.01})
+        dead.observe('group-summary', 'GET', 200, {'http_request_duration_seconds': 0.01})
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {}
+            for pid, source in ((os.getppid(), live), (exited.pid, dead)):
+                paths[pid] = os.path.join(directory, f'metrics-{pid}.json')
+                with open(paths[pid], 'w') as handle:
+                    json.dump({**source.snapshot(), 'pid': pid}, handle)
+
+            self.client.force_authenticate(user=self.admin)
+            with override_settings(METRICS_SNAPSHOT_DIR=directory):
+                body = self.client.get(reverse('metrics')).content.decode()
+            self.assertIn('http_requests_total{endpoint="group-list",method="GET",status="200"} 1', body)
+            self.assertNotIn('endpoint="group-summary"', body)
+            self.assertTrue(os.path.exists(paths[os.getppid()]))
+            self.assertFalse(os.path.exists(paths[exited.pid]))
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.user = User.objects.create_user(username='user1', password='pass123', is_staff=True)
+        self.other = User.objects.create_user(username='user2', password='pass123')
+        self.group = Group.objects.create(name="Trip", created_by=self.user)
+        GroupMember.objects.create(group=self.group, user=self.user, is_admin=True)
+        GroupMember.objects.create(group=self.group, user=self.other)
+        self.url = reverse('group-summary', args=[self.group.id])
+
+    def client_for(self, user):
+        client = APIClient()
+        token = UserRefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_staff_flag_saves_pstats_and_stacks(self):
+        with override_settings(PROFILING_DIR=self.directory.name):
+            response = self.client_for(self.user).get(self.url, HTTP_X_PROFILE='1')
+            self.assertEqual(response.status_code, 200)
+            profile_id = response['X-Profile-Id']
+            [profile] = list_profiles(self.directory.name)
+            self.assertEqual((profile['id'], profile['mode'], profile['endpoint']),
+                             (profile_id, 'on-demand', 'group-summary'))
+            stats = pstats.Stats(f'{self.directory.name}/{profile_id}.prof')
+            self.assertTrue(any(name == 'group_summary' for _, _, name in stats.stats))
+
+            out = StringIO()
+            call_command('profiles', profile_id[:12], '--limit', '5', stdout=out)
+            self.assertIn('GET /api/groups/', out.getvalue())
+            self.assertIn('cumulative', out.getvalue())
+
+            # Members who are not staff get the normal response, unprofiled
+            response = self.client_for(self.other).get(self.url + '?profile=1')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('X-Profile-Id', response)
+            self.assertEqual(len(list_profiles(self.directory.name)), 1)
+
+    def test_slow_requests_are_sampled(self):
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_SLOW_MS=60000):
+            self.assertEqual(self.client_for(self.other).get(self.url).status_code, 200)
+            self.assertEqual(list_profiles(self.directory.name), [])
+
+        with override_settings(PROFILING_DIR=self.directory.name, PROFILING_SLOW_MS=1, PROFILING_INTERVAL_MS=0.1):
+            self.assertEqual(self.client_for(self.other).get(self.url).status_code, 200)
+            [profile] = list_profiles(self.directory.name)
+            self.assertEqual((profile['mode'], profile['endpoint'], profile['pstats']), ('slow', 'group-summary', False))
+            self.assertGreaterEqual(profile['duration_ms'], 1)
+
+            out = StringIO()
+            call_command('profiles', stdout=out)
+            self.assertIn('slow', out.getvalue())
+            call_command('profiles', '--clear', stdout=out)
+            self.assertEqual(list_profiles(self.directory.name), [])
@@ -0,0 +1,37 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from .metrics import merge_snapshots, read_snapshots, registry, remove_dead_snapshots, render_prometheus
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def collect():
+    """This process's live metrics merged with the snapshots other live processes flushed."""
+    # Exited workers' numbers would otherwise be summed forever
+    remove_dead_snapshots(settings.METRICS_SNAPSHOT_DIR)
+    own = f'metrics-{os.getpid()}.json'
+    others = [
+        snapshot for snapshot in read_snapshots(settings.METRICS_SNAPSHOT_DIR)
+        if f"metrics-{snapshot['pid']}.json" != own
+    ]
+    return merge_snapshots([registry.snapshot(), *others])
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return HttpResponse(render_prometheus(collect()), content_type=CONTENT_TYPE)
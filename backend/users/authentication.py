@@ -0,0 +1,119 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+JWT authentication without a database hit per request.
+
+simplejwt's JWTAuthentication loads the User row on every call. Here the
+resolved user is kept in a small per-process LRU cache with a TTL, keyed by
+user id. Saving or deleting a user drops its entry (users/signals.py); the
+TTL bounds how long other worker processes can serve a stale copy.
+
+With settings.JWT_TRUST_CLAIMS the user is built from the signed claims in
+the token (users.tokens.USER_CLAIMS) and the database is not touched at all.
+The trade-off: profile changes and deactivation only take effect once the
+user's tokens are reissued.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .tokens import USER_CLAIMS
+
+
+class UserCache:
+    """A thread-safe LRU mapping whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache(settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if getattr(settings, 'JWT_TRUST_CLAIMS', False) and all(claim in validated_token for claim in USER_CLAIMS):
+            return self.user_from_claims(user_id, validated_token)
+
+        key = str(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            # The full lookup, including the is_active and revocation checks
+            user = super().get_user(validated_token)
+            user_cache.set(key, user)
+        else:
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        # Each request gets its own instance, so nothing it sets leaks into the cache
+        return copy.copy(user)
+
+    def user_from_claims(self, user_id, validated_token):
+        """A User built from the token's claims. It lacks every other field, so it must never be saved."""
+        user = self.user_model(
+            **{api_settings.USER_ID_FIELD: self.user_model._meta.pk.to_python(user_id)},
+            **{claim: validated_token[claim] for claim in USER_CLAIMS},
+            is_active=True,
+        )
+        user._state.adding = False
+        user._state.db = 'default'
+        return user
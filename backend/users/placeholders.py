@@ -0,0 +1,57 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+"""
+Placeholder accounts for people who are added to a group before they sign up.
+
+A placeholder is an inactive User with an unusable password: creating one
+costs an INSERT, not a password hash. When someone registers with that
+username, the placeholder is activated in place, so the memberships and
+expenses recorded against it become theirs.
+"""
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+
+def is_placeholder(user):
+    return not user.is_active and not user.has_usable_password()
+
+
+def ensure_users(usernames):
+    """
+    Map each username to a user id, creating placeholders for unknown ones.
+
+    Returns (ids, created) where created is the set of new placeholder usernames.
+    Three queries at most, however many usernames there are.
+    """
+    usernames = list(dict.fromkeys(usernames))
+    ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+    missing = [username for username in usernames if username not in ids]
+    if not missing:
+        return ids, set()
+
+    # make_password(None) is a random unusable marker, no hashing involved
+    User.objects.bulk_create(
+        [User(username=username, password=make_password(None), is_active=False) for username in missing],
+        ignore_conflicts=True,
+    )
+    created = dict(User.objects.filter(username__in=missing).values_list('username', 'id'))
+    ids.update(created)
+    return ids, set(created)
+
+
+def activate(user, password, email='', first_name=''):
+    """Turn a placeholder into a real account."""
+    user.set_password(password)
+    user.email = email or ''
+    user.first_name = first_name or ''
+    user.is_active = True
+    user.save()
+    return user
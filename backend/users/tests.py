@@ -63,3 +63,74 @@ class UsersAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['username'], self.user_data['username'])
         self.assertEqual(response.data['email'], self.user_data['email'])
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        from .authentication import user_cache
+        user_cache.clear()
+        self.profile_url = reverse('get_profile')
+        self.user = User.objects.create_user(
+            username="cached", password="TestPass123", email="cached@example.com", first_name="Cache"
+        )
+        response = self.client.post(reverse('token_obtain_pair'), {
+            "username": "cached", "password": "TestPass123"
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def test_warm_requests_make_no_queries(self):
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['first_name'], "Cache")
+
+    def test_saving_the_user_evicts_it(self):
+        self.client.get(self.profile_url)
+        self.user.first_name = "Renamed"
+        self.user.save()
+        self.assertEqual(self.client.get(self.profile_url).data['first_name'], "Renamed")
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_trusted_claims_skip_the_database(self):
+        from django.test import override_settings
+        with override_settings(JWT_TRUST_CLAIMS=True), self.assertNumQueries(0):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"username": "cached", "first_name": "Cache", "email": "cached@example.com"})
+
+    def test_user_cache_is_bounded_and_expires(self):
+        from unittest import mock
+        from .authentication import UserCache
+        cache = UserCache(maxsize=2, ttl=60)
+        cache.set('1', 'a')
+        cache.set('2', 'b')
+        cache.get('1')
+        cache.set('3', 'c')
+        self.assertEqual((cache.get('1'), cache.get('2'), len(cache)), ('a', None, 2))
+
+        with mock.patch('users.authentication.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get('3'))
+
+
+class PlaceholderActivationTests(APITestCase):
+    def test_registering_claims_a_placeholder(self):
+        from .placeholders import ensure_users
+        ids, created = ensure_users(['invited', 'invited'])
+        self.assertEqual(created, {'invited'})
+
+        response = self.client.post(reverse('register'), {
+            "username": "invited", "password": "TestPass123", "email": "invited@example.com", "first_name": "In"
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['user']['id'], ids['invited'])
+        user = User.objects.get(username='invited')
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.check_password("TestPass123"))
+
+        response = self.client.post(reverse('register'), {
+            "username": "invited", "password": "Other12345", "email": "other@example.com", "first_name": "X"
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
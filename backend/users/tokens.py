@@ -0,0 +1,25 @@
+# ----------------------------------------------------------------------------
+#   ( The Authentic JS/JAVA/PYTHON CodeBuff )
+#  ___ _                      _              _
+#  | _ ) |_  __ _ _ _ __ _ __| |_ __ ____ _ (_)
+#  | _ \ ' \/ _` | '_/ _` / _` \ V  V / _` || |
+#  |___/_||_\__,_|_| \__,_\__,_|\_/\_/\__,_|/ |
+#                                         |__/
+# ----------------------------------------------------------------------------
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Profile fields signed into every token, so the API can optionally serve a
+# request from the token alone (see JWT_TRUST_CLAIMS)
+USER_CLAIMS = ('username', 'first_name', 'email', 'is_staff')
+
+
+class UserRefreshToken(RefreshToken):
+    """RefreshToken carrying USER_CLAIMS; access tokens made from it copy them."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
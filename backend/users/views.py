@@ -12,7 +12,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from .placeholders import activate, is_placeholder
+from .tokens import UserRefreshToken
 
 
 @api_view(['POST'])
@@ -23,22 +25,32 @@ def register_user(request):
     """
     data = request.data
     try:
-        # Check if username or email already exists
-        if User.objects.filter(username=data.get('username')).exists():
+        # Check if username or email already exists; a username that was only
+        # added to a group so far is a placeholder, and registering claims it
+        existing = User.objects.filter(username=data.get('username')).first()
+        if existing is not None and not is_placeholder(existing):
             return Response({"error": "Username already taken"}, status=status.HTTP_400_BAD_REQUEST)
-        if User.objects.filter(email=data.get('email')).exists():
+        if data.get('email') and User.objects.filter(email=data.get('email')).exists():
             return Response({"error": "Email already registered"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Create the user
-        user = User.objects.create_user(
-            username=data.get('username'),
-            first_name=data.get('first_name'),
-            email=data.get('email'),
-            password=data.get('password')
-        )
+        if existing is not None:
+            user = activate(
+                existing,
+                password=data.get('password'),
+                email=data.get('email'),
+                first_name=data.get('first_name')
+            )
+        else:
+            # Create the user
+            user = User.objects.create_user(
+                username=data.get('username'),
+                first_name=data.get('first_name'),
+                email=data.get('email'),
+                password=data.get('password')
+            )
 
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         access_token = refresh.access_token
 
         return Response({